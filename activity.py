@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+COUNT_MAX = np.iinfo(np.uint16).max
+
+
+class ActivityHistory:
+    """Похвилинні лічильники повідомлень груп у кільцевих буферах фіксованого розміру
+
+    Кожна група займає рядок двовимірного масиву uint16 довжиною window
+    хвилин, тож пам'ять - 2 байти на хвилину на групу (7 днів ~ 20 КБ)
+    незалежно від кількості повідомлень. Хвилина m лежить у комірці
+    m % window; комірки, пропущені без повідомлень, обнуляються при записі.
+    """
+
+    def __init__(self, window_minutes: int = 7 * 1440, capacity: int = 16):
+        self.window = window_minutes
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self.counts = np.zeros((capacity, window_minutes), dtype=np.uint16)
+        # Остання хвилина (від епохи), яку записано в рядок
+        self.last_minute = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._rows
+
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.last_minute.nbytes
+
+    def _grow(self):
+        """Подвоює кількість рядків"""
+        capacity = len(self.counts) * 2
+        counts = np.zeros((capacity, self.window), dtype=np.uint16)
+        counts[: len(self.counts)] = self.counts
+        last_minute = np.zeros(capacity, dtype=np.int64)
+        last_minute[: len(self.last_minute)] = self.last_minute
+        self.counts, self.last_minute = counts, last_minute
+
+    def add(self, chat_id: int):
+        """Виділяє групі рядок історії (повторний виклик нічого не змінює)"""
+        if chat_id in self._rows:
+            return
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size == len(self.counts):
+                self._grow()
+            row = self._size
+            self._size += 1
+        self.counts[row] = 0
+        self.last_minute[row] = 0
+        self._rows[chat_id] = row
+
+    def remove(self, chat_id: int):
+        row = self._rows.pop(chat_id, None)
+        if row is not None:
+            self._free.append(row)
+
+    def _advance(self, row: int, minute: int):
+        """Обнуляє комірки хвилин між останнім записом і minute"""
+        last = int(self.last_minute[row])
+        if minute - last >= self.window or last == 0:
+            self.counts[row] = 0
+        else:
+            start = (last + 1) % self.window
+            end = (minute + 1) % self.window
+            if start < end:
+                self.counts[row, start:end] = 0
+            else:
+                self.counts[row, start:] = 0
+                self.counts[row, :end] = 0
+        self.last_minute[row] = minute
+
+    def record(self, chat_id: int, timestamp: float):
+        """Додає повідомлення до лічильника хвилини (Unix timestamp)"""
+        row = self._rows.get(chat_id)
+        if row is None:
+            return
+        minute = int(timestamp // 60)
+        if minute > self.last_minute[row]:
+            self._advance(row, minute)
+        elif minute <= self.last_minute[row] - self.window:
+            # Повідомлення старше за вікно історії
+            return
+        index = minute % self.window
+        if self.counts[row, index] < COUNT_MAX:
+            self.counts[row, index] += 1
+
+    def series(
+        self, chat_id: int, now: float, minutes: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """Повертає лічильники останніх minutes хвилин до now, від старих до нових"""
+        row = self._rows.get(chat_id)
+        if row is None:
+            return None
+        minutes = min(minutes or self.window, self.window)
+        current = int(now // 60)
+        wanted = np.arange(current - minutes + 1, current + 1)
+        result = self.counts[row, wanted % self.window].astype(np.uint32)
+        # Хвилини після останнього запису ще містять дані попереднього кола
+        last = int(self.last_minute[row])
+        result[(wanted > last) | (wanted <= last - self.window)] = 0
+        return result
+
+
+def resample(series: np.ndarray, bucket: int) -> np.ndarray:
+    """Сумує ряд блоками по bucket значень (неповний перший блок відкидається)"""
+    if bucket <= 1:
+        return series
+    usable = len(series) - len(series) % bucket
+    return series[len(series) - usable :].reshape(-1, bucket).sum(axis=1)
+
+
+def sparkline(values: np.ndarray) -> str:
+    """Малює ряд значень символами ▁..█"""
+    peak = int(values.max()) if len(values) else 0
+    if peak == 0:
+        return SPARK_CHARS[0] * len(values)
+    levels = (values * (len(SPARK_CHARS) - 1) + peak - 1) // peak
+    return "".join(SPARK_CHARS[int(level)] for level in levels)
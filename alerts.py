@@ -0,0 +1,458 @@
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from elastic import logger
+
+# Ескалація адресована окремому отримувачу: приймачі без явного kinds її не отримують
+ESCALATION = "escalation"
+ESCALATION_SINK = "escalate_to"
+
+
+@dataclass
+class Alert:
+    """Подія для розсилки по приймачах: текст для людей і поля для машин"""
+
+    kind: str  # "inactivity", "reminder", "escalation" або "reboot"
+    text: str
+    chat_id: int
+    group_name: str
+    data: Dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "chat_id": self.chat_id,
+            "group": self.group_name,
+            "at": datetime.fromtimestamp(self.created_at).isoformat(timespec="seconds"),
+            "text": self.text,
+            **self.data,
+        }
+
+
+class AlertSink(ABC):
+    """Приймач сповіщень з власною обмеженою чергою, таймаутом і повторами
+
+    offer() ніколи не чекає: при переповненій черзі сповіщення відкидається
+    і рахується в dropped, тож повільний приймач не гальмує ні інші
+    приймачі, ні цикл перевірки. Фоновий обробник бере з черги пакет до
+    max_batch сповіщень і відправляє його через send() з таймаутом; при
+    помилці пакет повторюється до retries разів з експоненційною паузою.
+    """
+
+    type_name = "base"
+    max_batch = 100
+    spec_fields: Tuple[str, ...] = ()  # Власні поля опису приймача в alert_sinks
+
+    def __init__(
+        self,
+        name: str,
+        queue_size: int = 1000,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 1.0,
+        kinds: Optional[Iterable[str]] = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.kinds = set(kinds) if kinds else None
+        self.queue: "asyncio.Queue[Tuple[Alert, asyncio.Future]]" = asyncio.Queue(
+            maxsize=queue_size
+        )
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retried = 0
+
+    def accepts(self, alert: Alert) -> bool:
+        if self.kinds is None:
+            return alert.kind != ESCALATION
+        return alert.kind in self.kinds
+
+    def offer(self, alert: Alert) -> asyncio.Future:
+        """Ставить сповіщення в чергу приймача, повертає Future[bool] доставки"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((alert, future))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            future.set_result(False)
+            logger.warning(f"Приймач '{self.name}' переповнений, сповіщення відкинуто")
+        return future
+
+    @abstractmethod
+    async def send(self, alerts: List[Alert]):
+        """Відправляє пакет сповіщень; будь-який виняток означає невдачу всього пакета"""
+
+    async def close(self):
+        pass
+
+    async def _deliver(self, batch: List[Tuple[Alert, asyncio.Future]]):
+        alerts = [alert for alert, _ in batch]
+        ok = False
+        for attempt in range(self.retries + 1):
+            try:
+                await asyncio.wait_for(self.send(alerts), timeout=self.timeout)
+                ok = True
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                if attempt == self.retries:
+                    logger.error(
+                        f"Приймач '{self.name}': не вдалося доставити "
+                        f"{len(alerts)} сповіщень: {error}"
+                    )
+                    break
+                self.retried += 1
+                logger.warning(
+                    f"Приймач '{self.name}': помилка доставки ({error}), повтор {attempt + 1}"
+                )
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+        if ok:
+            self.delivered += len(alerts)
+        else:
+            self.failed += len(alerts)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(ok)
+
+    async def run(self):
+        """Фоновий обробник черги приймача"""
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "type": self.type_name,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retried": self.retried,
+        }
+
+
+class TelegramSink(AlertSink):
+    """Чат Telegram: сповіщення йдуть через чергу дайджестів (NotificationOutbox)
+
+    Повтори доставки в Telegram уже виконують черга дайджестів і планувальник
+    відправок, тому типово retries=0. Якщо повтори задано, заново в чергу
+    ставляться лише сповіщення, яких Telegram не прийняв: покладене в чергу
+    дайджестів звідти не прибрати, і повторний put дав би дублікати.
+    """
+
+    type_name = "telegram"
+    spec_fields = ("chat_id",)
+
+    def __init__(
+        self,
+        name: str,
+        put: Callable[[Hashable, str], Awaitable[bool]],
+        destination: Callable[[], Hashable],
+        **options,
+    ):
+        options.setdefault("timeout", 120.0)
+        options.setdefault("retries", 0)
+        super().__init__(name, **options)
+        self.put = put
+        self.destination = destination
+        self._queued: Dict[int, asyncio.Future] = {}  # id(alert) -> доставка з черги
+
+    async def send(self, alerts: List[Alert]):
+        destination = self.destination()
+        futures = []
+        for alert in alerts:
+            future = self._queued.get(id(alert))
+            if future is None or (future.done() and not future.result()):
+                future = self._queued[id(alert)] = asyncio.ensure_future(
+                    self.put(destination, alert.text)
+                )
+            futures.append(future)
+        # shield: таймаут спроби не скасовує вже покладене в чергу дайджестів
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures))
+        if not all(results):
+            raise RuntimeError(f"Telegram не прийняв повідомлення для {destination}")
+
+    async def _deliver(self, batch: List[Tuple[Alert, asyncio.Future]]):
+        try:
+            await super()._deliver(batch)
+        finally:
+            for alert, _ in batch:
+                self._queued.pop(id(alert), None)
+
+
+class WebhookSink(AlertSink):
+    """HTTP webhook: JSON кожного сповіщення окремим запитом"""
+
+    type_name = "webhook"
+    max_batch = 1
+    spec_fields = ("url", "method", "headers")
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        method: str = "POST",
+        headers: Optional[Dict] = None,
+        **options,
+    ):
+        super().__init__(name, **options)
+        self.url = url
+        self.method = method.upper()
+        self.headers = headers or {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def send(self, alerts: List[Alert]):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        for alert in alerts:
+            async with self._session.request(
+                self.method, self.url, json=alert.to_dict(), headers=self.headers
+            ) as response:
+                if response.status >= 400:
+                    raise RuntimeError(f"HTTP {response.status}")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class FileSink(AlertSink):
+    """Локальний файл JSONL: пакет дописується одним записом у потоці"""
+
+    type_name = "file"
+    spec_fields = ("path",)
+
+    def __init__(self, name: str, path: str, **options):
+        super().__init__(name, **options)
+        self.path = path
+
+    def _append(self, lines: str):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    async def send(self, alerts: List[Alert]):
+        lines = "".join(
+            json.dumps(alert.to_dict(), ensure_ascii=False) + "\n" for alert in alerts
+        )
+        await asyncio.to_thread(self._append, lines)
+
+
+class UnixSocketSink(AlertSink):
+    """Unix-сокет: JSON-рядок на сповіщення через постійне з'єднання"""
+
+    type_name = "unix"
+    spec_fields = ("path",)
+
+    def __init__(self, name: str, path: str, **options):
+        super().__init__(name, **options)
+        self.path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def send(self, alerts: List[Alert]):
+        if self._writer is None or self._writer.is_closing():
+            _, self._writer = await asyncio.open_unix_connection(self.path)
+        try:
+            for alert in alerts:
+                self._writer.write(
+                    (json.dumps(alert.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+                )
+            await self._writer.drain()
+        except Exception:
+            # Наступна спроба відкриє з'єднання заново
+            await self.close()
+            raise
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINK_TYPES = {
+    sink_type.type_name: sink_type
+    for sink_type in (TelegramSink, WebhookSink, FileSink, UnixSocketSink)
+}
+SINK_OPTIONS = ("queue_size", "timeout", "retries", "backoff", "kinds")
+
+
+def _check_spec(spec: Dict, index: int, sink_type: type):
+    """Перевіряє типи та значення полів опису приймача, кидає ValueError"""
+    where = f"alert_sinks[{index}]"
+    unknown = set(spec) - {"type", "name", *SINK_OPTIONS, *sink_type.spec_fields}
+    if unknown:
+        raise ValueError(f"{where}: невідомі поля {sorted(unknown)}")
+
+    def is_number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def is_int(value) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    checks = {
+        "queue_size": (lambda v: is_int(v) and v > 0, "ціле число > 0"),
+        "timeout": (lambda v: is_number(v) and v > 0, "число > 0"),
+        "retries": (lambda v: is_int(v) and v >= 0, "ціле число >= 0"),
+        "backoff": (lambda v: is_number(v) and v >= 0, "число >= 0"),
+        "kinds": (
+            lambda v: isinstance(v, list) and all(isinstance(k, str) and k for k in v),
+            "список назв подій",
+        ),
+        "name": (lambda v: isinstance(v, str) and v, "непорожній рядок"),
+        "url": (lambda v: isinstance(v, str), "рядок"),
+        "method": (lambda v: isinstance(v, str) and v, "непорожній рядок"),
+        "headers": (lambda v: isinstance(v, dict), "об'єкт"),
+        "path": (lambda v: isinstance(v, str), "рядок"),
+        "chat_id": (lambda v: is_int(v) or isinstance(v, str), "chat_id або @username"),
+    }
+    for key, (valid, expected) in checks.items():
+        if key in spec and not valid(spec[key]):
+            raise ValueError(f"{where}.{key}: очікується {expected}")
+
+
+def build_sink(
+    spec: Dict,
+    index: int,
+    telegram_put: Callable[[Hashable, str], Awaitable[bool]],
+    default_destination: Callable[[], Hashable],
+) -> AlertSink:
+    """Створює приймач з опису в global_settings.alert_sinks, кидає ValueError"""
+    if not isinstance(spec, dict):
+        raise ValueError(f"alert_sinks[{index}]: очікується об'єкт")
+    sink_type = spec.get("type")
+    if sink_type not in SINK_TYPES:
+        raise ValueError(f"alert_sinks[{index}]: невідомий тип '{sink_type}'")
+    _check_spec(spec, index, SINK_TYPES[sink_type])
+    name = spec.get("name") or f"{sink_type}-{index}"
+    options = {key: spec[key] for key in SINK_OPTIONS if key in spec}
+
+    if sink_type == "telegram":
+        chat_id = spec.get("chat_id")
+        destination = default_destination if chat_id is None else (lambda: chat_id)
+        return TelegramSink(name, telegram_put, destination, **options)
+    if sink_type == "webhook":
+        if not spec.get("url"):
+            raise ValueError(f"alert_sinks[{index}]: для webhook потрібен url")
+        return WebhookSink(
+            name, spec["url"], spec.get("method", "POST"), spec.get("headers"), **options
+        )
+    if not spec.get("path"):
+        raise ValueError(f"alert_sinks[{index}]: для {sink_type} потрібен path")
+    return SINK_TYPES[sink_type](name, spec["path"], **options)
+
+
+class AlertDispatcher:
+    """Розсилає кожне сповіщення паралельно в усі приймачі, що його приймають
+
+    dispatch() не чекає на доставку: сповіщення лише кладеться в черги
+    приймачів. Повернений Future отримує True, якщо хоча б один приймач
+    доставив сповіщення (не чекаючи решти), False - якщо не доставив жоден.
+
+    Ескалації ("escalation") йдуть у власний приймач Telegram з чатом
+    escalate_to та в приймачі, що явно перелічують "escalation" у kinds.
+    """
+
+    def __init__(self, sinks: List[AlertSink]):
+        self.sinks = sinks
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_settings(
+        cls,
+        specs: Optional[List[Dict]],
+        telegram_put: Callable[[Hashable, str], Awaitable[bool]],
+        default_destination: Callable[[], Hashable],
+        escalate_to: Optional[Hashable] = None,
+    ) -> "AlertDispatcher":
+        """Без alert_sinks - один приймач Telegram у канал notification_user_id"""
+        if not specs:
+            specs = [{"type": "telegram", "name": "telegram"}]
+        if not isinstance(specs, list):
+            raise ValueError("alert_sinks: очікується список приймачів")
+        names = {ESCALATION_SINK}
+        sinks = []
+        for index, spec in enumerate(specs):
+            sink = build_sink(spec, index, telegram_put, default_destination)
+            if sink.name in names:
+                raise ValueError(
+                    f"alert_sinks: назва '{sink.name}' повторюється або зарезервована"
+                )
+            names.add(sink.name)
+            sinks.append(sink)
+        if escalate_to is not None:
+            sinks.append(
+                TelegramSink(
+                    ESCALATION_SINK, telegram_put, lambda: escalate_to, kinds=[ESCALATION]
+                )
+            )
+        return cls(sinks)
+
+    def start(self):
+        self._tasks = [asyncio.create_task(sink.run()) for sink in self.sinks]
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def dispatch(self, alert: Alert) -> asyncio.Future:
+        futures = [sink.offer(alert) for sink in self.sinks if sink.accepts(alert)]
+        return asyncio.ensure_future(self._any_delivered(futures))
+
+    @staticmethod
+    async def _any_delivered(futures: List[asyncio.Future]) -> bool:
+        # Не чекаємо найповільніший приймач, якщо інший уже доставив
+        for future in asyncio.as_completed(futures):
+            if await future:
+                return True
+        return False
+
+    async def drain(self):
+        """Чекає, поки черги всіх приймачів спорожніють"""
+        await asyncio.gather(*(sink.queue.join() for sink in self.sinks))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for sink in self.sinks:
+            while not sink.queue.empty():
+                _, future = sink.queue.get_nowait()
+                sink.queue.task_done()
+                if not future.done():
+                    future.set_result(False)
+            try:
+                await sink.close()
+            except Exception as e:
+                logger.error(f"Помилка закриття приймача '{sink.name}': {e}")
+
+    def stats(self) -> List[Dict]:
+        return [sink.stats() for sink in self.sinks]
@@ -0,0 +1,59 @@
+"""Порівняння тіку перевірки неактивності: цикл по словниках vs NumPy
+
+Запуск: python benchmarks/bench_inactivity_tick.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state import GroupStateStore  # noqa: E402
+
+
+def bench_dicts(count: int) -> float:
+    now = datetime.now(timezone.utc)
+    last_message_time = {
+        chat_id: now - timedelta(minutes=random.randint(0, 120))
+        for chat_id in range(count)
+    }
+    notification_sent = {chat_id: False for chat_id in range(count)}
+    thresholds = {chat_id: 60 for chat_id in range(count)}
+
+    started = time.perf_counter()
+    current_time = datetime.now(timezone.utc)
+    overdue = 0
+    for chat_id in range(count):
+        time_diff = current_time - last_message_time[chat_id]
+        if time_diff > timedelta(minutes=thresholds[chat_id]):
+            if not notification_sent.get(chat_id, False):
+                overdue += 1
+    return time.perf_counter() - started
+
+
+def bench_vectorized(count: int) -> float:
+    store = GroupStateStore()
+    now = time.time()
+    for chat_id in range(count):
+        store.add(chat_id, 3600, 5400)
+        store.touch(chat_id, now - random.randint(0, 120) * 60)
+    store.apply_period(False)
+
+    started = time.perf_counter()
+    store.evaluate(time.time())
+    store.deadlines()
+    return time.perf_counter() - started
+
+
+def main():
+    print(f"{'Груп':>10} {'dict, мс':>12} {'NumPy, мс':>12}")
+    for count in (1_000, 10_000, 100_000):
+        dict_ms = bench_dicts(count) * 1000
+        numpy_ms = bench_vectorized(count) * 1000
+        print(f"{count:>10} {dict_ms:>12.2f} {numpy_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Вартість обробки одного вхідного повідомлення в handle_monitored_message
+
+Запуск: python benchmarks/bench_message_handler.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elastic import es_handler, logger  # noqa: E402
+from main import TelegramMultiMonitor  # noqa: E402
+
+# Не відправляємо логи бенчмарку в Elasticsearch
+logger.removeHandler(es_handler)
+
+MESSAGES = 200_000
+
+
+def make_config(path: str, groups: int):
+    config = {
+        "telegram": {"api_id": 0, "api_hash": "", "session_string": "benchmark"},
+        "global_settings": {
+            "check_interval_seconds": 60,
+            "notification_user_id": "me",
+            "timezone": "Europe/Kiev",
+            "night_hours": {"start": "22:00", "end": "08:00"},
+        },
+        "groups": [
+            {
+                "chat_id": -1000 - i,
+                "name": f"Group {i}",
+                "description": "",
+                "monitoring": {
+                    "enabled": True,
+                    "day_inactive_minutes": 60,
+                    "night_inactive_minutes": 90,
+                },
+                "api_reboot": {"enabled": False},
+            }
+            for i in range(groups)
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+
+def bench(groups: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+        make_config(path, groups)
+        monitor = TelegramMultiMonitor(path)
+
+    for group in monitor.get_enabled_groups():
+        monitor.register_group_state(group)
+        monitor.state.set_last_seen(group.chat_id, monitor.clock())
+
+    chat_ids = [group.chat_id for group in monitor.get_enabled_groups()]
+    started = time.perf_counter()
+    for i in range(MESSAGES):
+        group = monitor.record_message(chat_ids[i % groups])
+        monitor.should_log_message(group.chat_id)
+    return MESSAGES / (time.perf_counter() - started)
+
+
+def main():
+    print(f"{'Груп':>8} {'повідомлень/сек':>18} {'мкс/повідомлення':>18}")
+    for groups in (10, 1_000, 10_000):
+        rate = bench(groups)
+        print(f"{groups:>8} {rate:>18,.0f} {1_000_000 / rate:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
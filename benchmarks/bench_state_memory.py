@@ -0,0 +1,71 @@
+"""Пам'ять на одну відстежувану групу: чотири словники vs GroupStateStore
+
+Запуск: python benchmarks/bench_state_memory.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state import GroupStateStore  # noqa: E402
+
+BASE_CHAT_ID = -1_000_000_000_000
+
+
+def measure(build) -> int:
+    """Повертає кількість байт, що залишились виділеними після build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def build_dicts(count: int):
+    tz = pytz.timezone("Europe/Kiev")
+    last_message_time = {}
+    notification_sent = {}
+    chat_accessible = {}
+    api_reboot_sent = {}
+    for i in range(count):
+        chat_id = BASE_CHAT_ID - i
+        last_message_time[chat_id] = datetime.now(tz)
+        notification_sent[chat_id] = False
+        chat_accessible[chat_id] = True
+        api_reboot_sent[chat_id] = False
+    return last_message_time, notification_sent, chat_accessible, api_reboot_sent
+
+
+def build_store(count: int):
+    store = GroupStateStore()
+    now = time.time()
+    for i in range(count):
+        chat_id = BASE_CHAT_ID - i
+        store.add(chat_id, 3600, 5400)
+        store.touch(chat_id, now)
+        store.set_accessible(chat_id)
+    return store
+
+
+def main():
+    print(f"{'Груп':>10} {'dict, Б/групу':>15} {'store, Б/групу':>16} {'масиви, Б/групу':>17}")
+    for count in (1_000, 100_000, 1_000_000):
+        dict_bytes = measure(lambda: build_dicts(count))
+        store_bytes = measure(lambda: build_store(count))
+        arrays_bytes = build_store(count).nbytes()
+        print(
+            f"{count:>10} {dict_bytes / count:>15.1f} "
+            f"{store_bytes / count:>16.1f} {arrays_bytes / count:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
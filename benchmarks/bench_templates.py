@@ -0,0 +1,83 @@
+"""Вартість рендерингу сповіщення про неактивність: str.format_map vs скомпільований шаблон
+
+Порівнює розбір шаблону на кожну відправку (format_map), скомпільований
+шаблон з усіма полями та render_group з кешованим статичним фрагментом.
+
+Запуск: python benchmarks/bench_templates.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import LOCALES, TemplateRenderer  # noqa: E402
+
+RENDERS = 200_000
+GROUPS = 1_000
+
+
+def static_fields(i: int) -> dict:
+    return {
+        "name": f"Group {i}",
+        "description": f"Сервер {i} у продакшені",
+        "chat_id": -1_000_000_000_000 - i,
+        "day_minutes": 60,
+        "night_minutes": 90,
+        "api_status": "Увімкнено",
+    }
+
+
+DYNAMIC = {
+    "last_seen": "12:34:56",
+    "minutes_inactive": 75,
+    "period_icon": "☀️",
+    "period_name": "Денний",
+    "period_name_lower": "денний",
+    "timeout": 60,
+    "now": "17.10.2026 13:49:56",
+}
+
+
+def bench_format_map() -> float:
+    text = LOCALES["uk"]["templates"]["inactivity_alert"]
+    groups = [static_fields(i) for i in range(GROUPS)]
+    started = time.perf_counter()
+    for i in range(RENDERS):
+        text.format_map({**groups[i % GROUPS], **DYNAMIC})
+    return RENDERS / (time.perf_counter() - started)
+
+
+def bench_compiled() -> float:
+    template = TemplateRenderer("uk").templates["inactivity_alert"]
+    groups = [static_fields(i) for i in range(GROUPS)]
+    started = time.perf_counter()
+    for i in range(RENDERS):
+        template.render({**groups[i % GROUPS], **DYNAMIC})
+    return RENDERS / (time.perf_counter() - started)
+
+
+def bench_group_cache() -> float:
+    renderer = TemplateRenderer("uk")
+    started = time.perf_counter()
+    for i in range(RENDERS):
+        group = i % GROUPS
+        renderer.render_group(
+            "inactivity_alert", group, lambda group=group: static_fields(group), DYNAMIC
+        )
+    return RENDERS / (time.perf_counter() - started)
+
+
+def main():
+    print(f"{'Спосіб':<28} {'рендерів/сек':>14} {'мкс/рендер':>12}")
+    for name, bench in (
+        ("str.format_map", bench_format_map),
+        ("скомпільований шаблон", bench_compiled),
+        ("кеш фрагментів групи", bench_group_cache),
+    ):
+        rate = bench()
+        print(f"{name:<28} {rate:>14,.0f} {1_000_000 / rate:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Час перевірки доступу до груп при старті: послідовно vs паралельно
+
+Telegram імітується фейковим клієнтом із затримкою LATENCY на get_entity.
+Запуск: python benchmarks/bench_validate_access.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elastic import es_handler, logger  # noqa: E402
+from main import TelegramMultiMonitor  # noqa: E402
+
+# Не відправляємо логи бенчмарку в Elasticsearch і не засмічуємо консоль
+logger.removeHandler(es_handler)
+logger.disabled = True
+
+LATENCY = 0.01
+
+
+class FakeClient:
+    async def get_entity(self, chat_id):
+        await asyncio.sleep(LATENCY)
+        return SimpleNamespace(id=chat_id, title=f"Chat {chat_id}")
+
+
+def make_monitor(groups: int, concurrency: int) -> TelegramMultiMonitor:
+    config = {
+        "telegram": {"api_id": 0, "api_hash": "", "session_string": "benchmark"},
+        "global_settings": {
+            "check_interval_seconds": 60,
+            "notification_user_id": "me",
+            "timezone": "Europe/Kiev",
+            "night_hours": {"start": "22:00", "end": "08:00"},
+            "validation_concurrency": concurrency,
+        },
+        "groups": [
+            {
+                "chat_id": -1000 - i,
+                "name": f"Group {i}",
+                "description": "",
+                "monitoring": {
+                    "enabled": True,
+                    "day_inactive_minutes": 60,
+                    "night_inactive_minutes": 90,
+                },
+                "api_reboot": {"enabled": False},
+            }
+            for i in range(groups)
+        ],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        monitor = TelegramMultiMonitor(path)
+    monitor.client = FakeClient()
+    return monitor
+
+
+async def bench(groups: int, concurrency: int) -> float:
+    monitor = make_monitor(groups, concurrency)
+    started = time.perf_counter()
+    await monitor.validate_groups_access(monitor.get_enabled_groups())
+    return time.perf_counter() - started
+
+
+async def main():
+    print(f"get_entity: {LATENCY * 1000:.0f} мс на запит")
+    print(f"{'Груп':>6} {'послідовно, с':>15} {'10 паралельно, с':>18} {'50 паралельно, с':>18}")
+    for groups in (10, 100, 1000):
+        results = [await bench(groups, concurrency) for concurrency in (1, 10, 50)]
+        print(f"{groups:>6} {results[0]:>15.2f} {results[1]:>18.2f} {results[2]:>18.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+import time
+from datetime import datetime
+
+
+class MonotonicClock:
+    """Монотонний годинник для відміток активності
+
+    Тривалості рахуються в time.monotonic() і не залежать від стрибків
+    системного часу (NTP, ручна зміна, DST). Перетворення в настінний час
+    робиться лише для відображення: відмітка переводиться як "зараз мінус
+    скільки минуло", тож відображений час теж коректний після стрибка.
+    """
+
+    def __call__(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def to_wall(self, mono: float) -> float:
+        """Монотонна відмітка -> Unix timestamp"""
+        return time.time() - (time.monotonic() - mono)
+
+    def from_wall(self, wall: float) -> float:
+        """Unix timestamp -> монотонна відмітка"""
+        return time.monotonic() - (time.time() - wall)
+
+    def to_local(self, mono: float, tz) -> datetime:
+        """Монотонна відмітка -> datetime у часовій зоні tz"""
+        return datetime.fromtimestamp(self.to_wall(mono), tz)
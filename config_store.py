@@ -0,0 +1,168 @@
+import difflib
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def canonical_hash(config: Dict) -> str:
+    """SHA-256 канонічного JSON (відсортовані ключі), не залежить від форматування"""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def check_keep_versions(value) -> int:
+    """Кількість версій в історії: ціле число не менше 1, інакше ValueError"""
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"config_history_keep має бути цілим числом >= 1, отримано {value!r}")
+    return value
+
+
+def write_atomic(path: str, text: str):
+    """Записує файл через тимчасовий файл і os.replace"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class ConfigStore:
+    """Версіоноване сховище конфігурації з адресацією за вмістом
+
+    Кожен знімок зберігається один раз як objects/<sha256>.json, тож повторне
+    збереження того ж вмісту не займає місця. index.json містить список
+    версій (номер, хеш, час), HEAD - номер активної версії. Відкат - це
+    перестановка вказівника HEAD та атомарна заміна config.json. Старі
+    версії понад keep_versions видаляються разом з об'єктами, на які більше
+    ніщо не посилається.
+    """
+
+    def __init__(self, root: str, config_path: str = "config.json", keep_versions: int = 50):
+        self.root = root
+        self.config_path = config_path
+        self.keep_versions = check_keep_versions(keep_versions)
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self.head_path = os.path.join(root, "HEAD")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.versions: List[Dict] = self._load_index()
+        self._by_version = {entry["version"]: entry for entry in self.versions}
+
+    def _load_index(self) -> List[Dict]:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self):
+        write_atomic(self.index_path, json.dumps(self.versions, ensure_ascii=False, indent=2))
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.json")
+
+    @property
+    def head(self) -> Optional[int]:
+        """Номер активної версії"""
+        if not os.path.exists(self.head_path):
+            return self.versions[-1]["version"] if self.versions else None
+        with open(self.head_path, "r", encoding="utf-8") as f:
+            value = f.read().strip()
+        return int(value) if value else None
+
+    def _set_head(self, version: int):
+        write_atomic(self.head_path, str(version))
+
+    def get(self, version: int) -> Optional[Dict]:
+        return self._by_version.get(version)
+
+    def read_text(self, version: int) -> str:
+        entry = self._by_version.get(version)
+        if entry is None:
+            raise KeyError(version)
+        with open(self._object_path(entry["hash"]), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def commit(self, config: Dict, source: str = "api") -> Dict:
+        """Зберігає конфігурацію як нову версію (якщо вміст змінився) і робить її активною"""
+        digest = canonical_hash(config)
+        text = json.dumps(config, ensure_ascii=False, indent=2)
+
+        head = self.get(self.head)
+        if head is not None and head["hash"] == digest:
+            # Той самий вміст - нова версія не потрібна
+            write_atomic(self.config_path, text)
+            return head
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            write_atomic(object_path, text)
+
+        entry = {
+            "version": self.versions[-1]["version"] + 1 if self.versions else 1,
+            "hash": digest,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "groups": len(config.get("groups", [])),
+        }
+        self.versions.append(entry)
+        self._by_version[entry["version"]] = entry
+        self._apply_retention(entry["version"])
+        self._save_index()
+        self._set_head(entry["version"])
+        write_atomic(self.config_path, text)
+        return entry
+
+    def import_current(self):
+        """Створює першу версію з наявного config.json, якщо історія порожня"""
+        if self.versions or not os.path.exists(self.config_path):
+            return None
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return self.commit(config, source="import")
+
+    def rollback(self, version: int) -> Dict:
+        """Робить активною існуючу версію: перестановка HEAD без копіювання історії"""
+        entry = self._by_version.get(version)
+        if entry is None:
+            raise KeyError(version)
+        self._set_head(version)
+        write_atomic(self.config_path, self.read_text(version))
+        return entry
+
+    def history(self) -> List[Dict]:
+        head = self.head
+        return [
+            {**entry, "head": entry["version"] == head} for entry in reversed(self.versions)
+        ]
+
+    def diff(self, from_version: int, to_version: int) -> str:
+        """Unified diff між двома версіями (у форматі JSON з відступами)"""
+        old = self.read_text(from_version).splitlines(keepends=True)
+        new = self.read_text(to_version).splitlines(keepends=True)
+        return "".join(
+            difflib.unified_diff(
+                old, new, fromfile=f"v{from_version}", tofile=f"v{to_version}"
+            )
+        )
+
+    def _apply_retention(self, new_head: int):
+        """Залишає останні keep_versions версій (та нову активну) і видаляє зайві об'єкти"""
+        if len(self.versions) <= self.keep_versions:
+            return
+        cutoff = len(self.versions) - self.keep_versions
+        kept = [
+            entry
+            for i, entry in enumerate(self.versions)
+            if i >= cutoff or entry["version"] == new_head
+        ]
+        referenced = {entry["hash"] for entry in kept}
+        orphaned = {entry["hash"] for entry in self.versions} - referenced
+
+        self.versions = kept
+        self._by_version = {entry["version"]: entry for entry in kept}
+        for digest in orphaned:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,137 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Awaitable, Callable, Optional
+
+from elastic import logger
+
+# Маски подій inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class ConfigWatcher:
+    """Стежить за файлом конфігурації та викликає on_change після паузи в записах
+
+    На Linux використовується inotify на каталозі файлу (через ctypes, тож
+    ловиться і атомарна заміна файлу редактором), інакше - опитування
+    mtime/розміру/inode. Серія записів зводиться до одного виклику: колбек
+    спрацьовує, коли протягом debounce секунд не було нових подій.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], Awaitable[None]],
+        debounce: float = 1.0,
+        poll_interval: float = 2.0,
+    ):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._changed = asyncio.Event()
+        self._fd: Optional[int] = None
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _start_inotify(self) -> bool:
+        """Підключає inotify до каталогу файлу; False, якщо недоступний"""
+        if not hasattr(os, "O_NONBLOCK"):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            init = libc.inotify_init1
+            add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return False
+
+        fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return False
+        directory = os.path.dirname(self.path).encode()
+        if add_watch(fd, directory, WATCH_MASK) < 0:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        asyncio.get_running_loop().add_reader(fd, self._on_inotify)
+        return True
+
+    def _on_inotify(self):
+        """Розбирає події inotify і позначає зміну, якщо вона стосується файлу"""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        name = os.path.basename(self.path).encode()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            event_name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if event_name == name or mask & IN_Q_OVERFLOW:
+                self._changed.set()
+
+    async def _poll(self):
+        """Запасний режим: опитування mtime/розміру/inode файлу"""
+        signature = self._signature()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = self._signature()
+            if current != signature:
+                signature = current
+                self._changed.set()
+
+    async def run(self):
+        poller = None
+        if self._start_inotify():
+            self.mode = "inotify"
+        else:
+            self.mode = "poll"
+            poller = asyncio.create_task(self._poll())
+        logger.info(f"Стежу за змінами {self.path} ({self.mode})")
+
+        try:
+            while True:
+                await self._changed.wait()
+                self._changed.clear()
+                # Чекаємо, поки записи затихнуть на debounce секунд
+                while True:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=self.debounce)
+                    except asyncio.TimeoutError:
+                        break
+                    self._changed.clear()
+                try:
+                    await self.on_change()
+                except Exception as e:
+                    logger.error(f"Помилка застосування змін {self.path}: {e}")
+        finally:
+            if poller is not None:
+                poller.cancel()
+            self.close()
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._fd)
+            except RuntimeError:
+                pass
+            os.close(self._fd)
+            self._fd = None
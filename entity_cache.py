@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from telethon import types, utils
+
+from elastic import logger
+
+
+@dataclass
+class CachedEntity:
+    peer_type: str  # "channel", "chat" або "user"
+    peer_id: int  # Немаркований ID сутності
+    access_hash: int
+    title: str
+
+    def input_peer(self):
+        """Будує InputPeer для запитів без звернення до мережі"""
+        if self.peer_type == "channel":
+            return types.InputPeerChannel(self.peer_id, self.access_hash)
+        if self.peer_type == "user":
+            return types.InputPeerUser(self.peer_id, self.access_hash)
+        return types.InputPeerChat(self.peer_id)
+
+
+class EntityCache:
+    """Дисковий кеш розпізнаних чатів (chat_id -> тип, access_hash, назва)
+
+    StringSession не зберігає сутності між перезапусками, тож без кешу кожен
+    старт заново викликає get_entity для кожної групи. Записи читаються в
+    пам'ять при відкритті, а нові накопичуються і пишуться одним пакетом.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._entries: Dict[int, CachedEntity] = {}
+        self._pending: Dict[int, Optional[CachedEntity]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entities (
+                chat_id INTEGER PRIMARY KEY,
+                peer_type TEXT NOT NULL,
+                peer_id INTEGER NOT NULL,
+                access_hash INTEGER NOT NULL DEFAULT 0,
+                title TEXT,
+                updated_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT chat_id, peer_type, peer_id, access_hash, title FROM entities"
+        ).fetchall()
+        self._entries = {
+            chat_id: CachedEntity(peer_type, peer_id, access_hash, title or "")
+            for chat_id, peer_type, peer_id, access_hash, title in rows
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def get(self, chat_id: int) -> Optional[CachedEntity]:
+        return self._entries.get(chat_id)
+
+    def input_peer(self, chat_id: int):
+        """Повертає InputPeer з кешу або None"""
+        entry = self._entries.get(chat_id)
+        return None if entry is None else entry.input_peer()
+
+    def input_peers(self) -> List:
+        return [entry.input_peer() for entry in self._entries.values()]
+
+    def put(self, chat_id: int, entity) -> Optional[CachedEntity]:
+        """Запам'ятовує розпізнану сутність Telegram"""
+        try:
+            peer = utils.get_input_peer(entity, allow_self=False)
+        except TypeError:
+            return None
+
+        if isinstance(peer, types.InputPeerChannel):
+            entry = CachedEntity("channel", peer.channel_id, peer.access_hash, "")
+        elif isinstance(peer, types.InputPeerUser):
+            entry = CachedEntity("user", peer.user_id, peer.access_hash, "")
+        elif isinstance(peer, types.InputPeerChat):
+            entry = CachedEntity("chat", peer.chat_id, 0, "")
+        else:
+            return None
+        entry.title = utils.get_display_name(entity) or ""
+
+        if self._entries.get(chat_id) != entry:
+            self._entries[chat_id] = entry
+            self._pending[chat_id] = entry
+        return entry
+
+    def invalidate(self, chat_id: int):
+        """Видаляє запис, наприклад після PeerIdInvalidError"""
+        if self._entries.pop(chat_id, None) is not None:
+            self._pending[chat_id] = None
+
+    def flush(self) -> int:
+        """Записує накопичені зміни на диск"""
+        if self._conn is None or not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        now = time.time()
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO entities
+                        (chat_id, peer_type, peer_id, access_hash, title, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(chat_id) DO UPDATE SET
+                        peer_type = excluded.peer_type,
+                        peer_id = excluded.peer_id,
+                        access_hash = excluded.access_hash,
+                        title = excluded.title,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (chat_id, e.peer_type, e.peer_id, e.access_hash, e.title, now)
+                        for chat_id, e in pending.items()
+                        if e is not None
+                    ],
+                )
+                self._conn.executemany(
+                    "DELETE FROM entities WHERE chat_id = ?",
+                    [(chat_id,) for chat_id, e in pending.items() if e is None],
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Помилка запису кешу сутностей: {e}")
+            self._pending = {**pending, **self._pending}
+            return 0
+        return len(pending)
+
+
+def evict_from_client(client, chat_ids: Iterable[int]):
+    """Прибирає access_hash чатів з пам'яті клієнта Telethon та його сесії
+
+    EntityCache.invalidate() видаляє лише власний запис, а хеш, переданий у
+    сесію через process_entities, і кеш сутностей клієнта лишаються, тож
+    повторне розпізнавання взяло б той самий застарілий хеш. StringSession
+    тримає сутності в пам'яті (множина рядків з маркованим ID першим).
+    """
+    marked = set(chat_ids)
+    rows = getattr(client.session, "_entities", None)
+    if isinstance(rows, set):
+        client.session._entities = {row for row in rows if row[0] not in marked}
+    memory = getattr(client, "_mb_entity_cache", None)
+    if memory is not None:
+        for chat_id in marked:
+            memory.hash_map.pop(utils.resolve_id(chat_id)[0], None)
@@ -0,0 +1,187 @@
+import math
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Tuple, Union
+
+from timer_wheel import TimerWheel
+
+REMINDER = "reminder"
+ESCALATE = "escalate"
+
+
+@dataclass
+class EscalationPolicy:
+    enabled: bool = True
+    reminder_minutes: float = 30  # Перше нагадування після сповіщення
+    backoff: float = 2.0  # Множник інтервалу для кожного наступного нагадування
+    max_reminder_minutes: float = 240
+    max_reminders: Optional[int] = None  # None - нагадувати до підтвердження
+    escalate_after_minutes: Optional[float] = None
+    escalate_to: Optional[Union[int, str]] = None  # Другий отримувач (chat_id)
+    tick_seconds: float = 5.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "EscalationPolicy":
+        """Будує політику з global_settings.escalation, кидає ValueError"""
+        data = dict(data or {})
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"escalation: невідомі поля {sorted(unknown)}")
+
+        if not isinstance(data.get("enabled", True), bool):
+            raise ValueError("escalation.enabled має бути true або false")
+        for name in ("reminder_minutes", "backoff", "max_reminder_minutes", "tick_seconds"):
+            if name in data:
+                data[name] = _number(name, data[name])
+        if data.get("escalate_after_minutes") is not None:
+            data["escalate_after_minutes"] = _number(
+                "escalate_after_minutes", data["escalate_after_minutes"]
+            )
+        if data.get("max_reminders") is not None:
+            value = _number("max_reminders", data["max_reminders"])
+            if value != int(value) or value < 0:
+                raise ValueError("escalation.max_reminders має бути цілим числом >= 0")
+            data["max_reminders"] = int(value)
+        escalate_to = data.get("escalate_to")
+        if escalate_to is not None and (
+            isinstance(escalate_to, bool)
+            or not isinstance(escalate_to, (int, str))
+            or escalate_to == ""
+        ):
+            raise ValueError("escalation.escalate_to має бути chat_id або @username")
+
+        policy = cls(**data)
+        if (
+            policy.reminder_minutes <= 0
+            or policy.max_reminder_minutes <= 0
+            or policy.tick_seconds <= 0
+            or policy.backoff < 1
+        ):
+            raise ValueError(
+                "escalation: reminder_minutes, max_reminder_minutes і tick_seconds "
+                "мають бути додатніми, backoff >= 1"
+            )
+        if policy.escalate_after_minutes is not None and policy.escalate_after_minutes <= 0:
+            raise ValueError("escalation.escalate_after_minutes має бути додатнім")
+        return policy
+
+
+def _number(name: str, value) -> float:
+    """Приводить значення поля до числа (зокрема з рядка "30"), кидає ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(f"escalation.{name} має бути числом")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"escalation.{name} має бути числом") from None
+    if math.isnan(number) or math.isinf(number):
+        raise ValueError(f"escalation.{name} має бути скінченним числом")
+    return number
+
+
+@dataclass
+class Escalation:
+    chat_id: int
+    incident_id: Optional[int]
+    opened_at: float  # Монотонний час першого сповіщення
+    reminders: int = 0
+    escalated: bool = False
+
+
+class EscalationEngine:
+    """Стан ескалації відкритих інцидентів на колесі таймерів
+
+    Кожен інцидент має не більше двох таймерів: наступне нагадування (з
+    інтервалом, що зростає в backoff разів до max_reminder_minutes) та
+    ескалацію на другого отримувача. Спрацювання обробляє лише ті
+    інциденти, чий час настав, без перегляду всіх груп. Підтвердження або
+    відновлення активності знімає таймери інциденту.
+    """
+
+    def __init__(self, policy: EscalationPolicy, now: float = 0.0):
+        self.policy = policy
+        self.wheel = TimerWheel(policy.tick_seconds, now=now)
+        self.open: Dict[int, Escalation] = {}
+
+    def __len__(self) -> int:
+        return len(self.open)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self.open
+
+    def reminder_interval(self, reminders_sent: int) -> float:
+        """Інтервал у секундах до нагадування номер reminders_sent + 1"""
+        policy = self.policy
+        minutes = min(
+            policy.reminder_minutes * policy.backoff**reminders_sent,
+            policy.max_reminder_minutes,
+        )
+        return minutes * 60
+
+    def start(self, chat_id: int, incident_id: Optional[int], now: float) -> Escalation:
+        """Запускає ескалацію інциденту (повторний виклик не скидає відлік)"""
+        escalation = self.open.get(chat_id)
+        if escalation is not None:
+            return escalation
+        escalation = self.open[chat_id] = Escalation(chat_id, incident_id, now)
+        self._schedule(escalation, now)
+        return escalation
+
+    def _schedule(self, escalation: Escalation, now: float):
+        policy = self.policy
+        chat_id = escalation.chat_id
+        if policy.max_reminders is None or escalation.reminders < policy.max_reminders:
+            self.wheel.schedule(
+                (chat_id, REMINDER), now + self.reminder_interval(escalation.reminders)
+            )
+        if (
+            policy.escalate_after_minutes is not None
+            and policy.escalate_to
+            and not escalation.escalated
+        ):
+            self.wheel.schedule(
+                (chat_id, ESCALATE),
+                max(now, escalation.opened_at + policy.escalate_after_minutes * 60),
+            )
+
+    def stop(self, chat_id: int) -> Optional[Escalation]:
+        """Знімає таймери інциденту (підтвердження або відновлення активності)"""
+        self.wheel.cancel((chat_id, REMINDER))
+        self.wheel.cancel((chat_id, ESCALATE))
+        return self.open.pop(chat_id, None)
+
+    def advance(self, now: float) -> List[Tuple[str, Escalation]]:
+        """Повертає кроки, що настали: (REMINDER | ESCALATE, ескалація)"""
+        steps = []
+        for (chat_id, kind), deadline in self.wheel.advance(now):
+            escalation = self.open.get(chat_id)
+            if escalation is None:
+                continue
+            if kind == REMINDER:
+                escalation.reminders += 1
+                limit = self.policy.max_reminders
+                if limit is None or escalation.reminders < limit:
+                    self.wheel.schedule(
+                        (chat_id, REMINDER),
+                        deadline + self.reminder_interval(escalation.reminders),
+                    )
+            else:
+                escalation.escalated = True
+            steps.append((kind, escalation))
+        return steps
+
+    def next_step(self, chat_id: int) -> Optional[float]:
+        """Монотонний час наступного нагадування інциденту"""
+        return self.wheel.deadline((chat_id, REMINDER))
+
+    def replace_policy(self, policy: EscalationPolicy, now: float):
+        """Нова політика: відкриті інциденти отримують таймери за новими правилами"""
+        escalations = list(self.open.values())
+        self.policy = policy
+        self.wheel = TimerWheel(policy.tick_seconds, now=now)
+        self.open = {}
+        if not policy.enabled:
+            return
+        for escalation in escalations:
+            self.open[escalation.chat_id] = escalation
+            self._schedule(escalation, now)
@@ -0,0 +1,430 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from elastic import logger
+
+INCIDENT_COLUMNS = (
+    "id",
+    "chat_id",
+    "group_name",
+    "started_at",
+    "detected_at",
+    "resolved_at",
+    "threshold_minutes",
+    "notified",
+    "acknowledged_at",
+)
+
+EVENT_INSERT = (
+    "INSERT INTO incident_events (incident_id, chat_id, at, kind, success, detail) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class IncidentStore:
+    """Журнал інцидентів неактивності та викликів reboot на SQLite
+
+    Інцидент - це епізод тиші групи: відкривається при сповіщенні про
+    неактивність і закривається, коли в групі знову з'являються
+    повідомлення. Результати сповіщень і reboot пишуться подіями інциденту.
+    Вибірки індексовані за chat_id та часом, агрегати рахує SQLite.
+
+    Записи не блокують цикл подій: методи лише ставлять SQL у чергу, а run()
+    пакетно виконує її однією транзакцією в окремому потоці запису. id та
+    стан відкритих інцидентів ведуться в пам'яті, тож відповідь не чекає
+    на диск.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()  # З'єднання спільне для потоку запису і читань
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[str, tuple]] = []
+        # chat_id -> [id відкритого інциденту, acknowledged_at]
+        self._open: Dict[int, list] = {}
+        self._next_id = 1
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # У режимі WAL NORMAL не робить fsync на кожен commit, цілісність зберігається
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS incidents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                group_name TEXT,
+                started_at REAL NOT NULL,
+                detected_at REAL NOT NULL,
+                resolved_at REAL,
+                threshold_minutes INTEGER,
+                notified INTEGER NOT NULL DEFAULT 0,
+                acknowledged_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS incidents_chat_time
+                ON incidents (chat_id, detected_at);
+            CREATE INDEX IF NOT EXISTS incidents_time ON incidents (detected_at);
+            CREATE INDEX IF NOT EXISTS incidents_open
+                ON incidents (chat_id) WHERE resolved_at IS NULL;
+
+            CREATE TABLE IF NOT EXISTS incident_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                incident_id INTEGER,
+                chat_id INTEGER NOT NULL,
+                at REAL NOT NULL,
+                kind TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                detail TEXT
+            );
+            CREATE INDEX IF NOT EXISTS incident_events_incident
+                ON incident_events (incident_id);
+            CREATE INDEX IF NOT EXISTS incident_events_chat_time
+                ON incident_events (chat_id, at);
+            """
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(incidents)")}
+        if "acknowledged_at" not in columns:
+            # Журнали, створені до підтвердження інцидентів
+            self._conn.execute("ALTER TABLE incidents ADD COLUMN acknowledged_at REAL")
+        self._conn.commit()
+
+        self._next_id = (
+            self._conn.execute(
+                "SELECT MAX(seq) FROM (SELECT MAX(id) AS seq FROM incidents "
+                "UNION ALL SELECT seq FROM sqlite_sequence WHERE name = 'incidents')"
+            ).fetchone()[0]
+            or 0
+        ) + 1
+        self._open = {
+            row["chat_id"]: [row["id"], row["acknowledged_at"]]
+            for row in self._conn.execute(
+                "SELECT chat_id, id, acknowledged_at FROM incidents "
+                "WHERE resolved_at IS NULL ORDER BY id"
+            )
+        }
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="incidents")
+
+    def close(self):
+        if self._conn is None:
+            return
+        # Черга виконується по порядку: спершу пакет, що вже пишеться, потім залишок
+        try:
+            self._executor.submit(self.write, self.take_pending()).result()
+        except Exception as e:
+            logger.error(f"Помилка запису журналу інцидентів при закритті: {e}")
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._conn.close()
+        self._conn = None
+
+    def _queue(self, sql: str, params: tuple):
+        self._pending.append((sql, params))
+
+    def take_pending(self) -> List[Tuple[str, tuple]]:
+        """Забирає накопичені записи (з циклу подій)"""
+        batch, self._pending = self._pending, []
+        return batch
+
+    def write(self, batch: List[Tuple[str, tuple]]):
+        """Виконує пакет записів однією транзакцією (у потоці запису)"""
+        if not batch:
+            return
+        with self._lock, self._conn:
+            for sql, params in batch:
+                self._conn.execute(sql, params)
+
+    async def run(self, interval: float = 1.0):
+        """Фоновий запис черги: одна транзакція на interval секунд"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            batch = self.take_pending()
+            if not batch:
+                continue
+            try:
+                await loop.run_in_executor(self._executor, self.write, batch)
+            except Exception as e:
+                logger.error(f"Помилка запису журналу інцидентів ({len(batch)} записів): {e}")
+
+    def _open_incident_id(self, chat_id: int) -> Optional[int]:
+        incident = self._open.get(chat_id)
+        return None if incident is None else incident[0]
+
+    def open_incident(
+        self,
+        chat_id: int,
+        group_name: str,
+        started_at: float,
+        threshold_minutes: int,
+        notified: Optional[bool] = None,
+    ) -> int:
+        """Відкриває інцидент (або повертає вже відкритий)
+
+        Якщо результат сповіщення вже відомий (notified не None), одразу
+        пише подію сповіщення; інакше її додає record_alert після доставки.
+        """
+        incident_id = self._open_incident_id(chat_id)
+        if incident_id is None:
+            incident_id = self._next_id
+            self._next_id += 1
+            self._open[chat_id] = [incident_id, None]
+            self._queue(
+                """
+                INSERT INTO incidents
+                    (id, chat_id, group_name, started_at, detected_at,
+                     threshold_minutes, notified)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    incident_id,
+                    chat_id,
+                    group_name,
+                    started_at,
+                    time.time(),
+                    threshold_minutes,
+                    int(bool(notified)),
+                ),
+            )
+        if notified is not None:
+            self.record_alert(incident_id, chat_id, notified)
+        return incident_id
+
+    def record_alert(self, incident_id: Optional[int], chat_id: int, success: bool):
+        """Пише результат доставки сповіщення про неактивність"""
+        self._queue(EVENT_INSERT, (incident_id, chat_id, time.time(), "alert", int(success), None))
+        if success and incident_id is not None:
+            self._queue("UPDATE incidents SET notified = 1 WHERE id = ?", (incident_id,))
+
+    def has_open(self, chat_id: int) -> bool:
+        return chat_id in self._open
+
+    def find_open(self, chat_id: int) -> Optional[Dict]:
+        """Відкритий інцидент групи: id та acknowledged_at (None - не підтверджено)"""
+        incident = self._open.get(chat_id)
+        if incident is None:
+            return None
+        return {"id": incident[0], "acknowledged_at": incident[1]}
+
+    def acknowledge(self, chat_id: int, by: str, incident_id: Optional[int] = None):
+        """Позначає відкритий інцидент підтвердженим і пише подію 'ack'"""
+        now = time.time()
+        incident = self._open.get(chat_id)
+        if incident_id is None and incident is not None:
+            incident_id = incident[0]
+        if incident is not None and incident[0] == incident_id and incident[1] is None:
+            incident[1] = now
+        if incident_id is not None:
+            self._queue(
+                "UPDATE incidents SET acknowledged_at = ? "
+                "WHERE id = ? AND acknowledged_at IS NULL",
+                (now, incident_id),
+            )
+        self._queue(EVENT_INSERT, (incident_id, chat_id, now, "ack", 1, by))
+
+    def record_event(
+        self,
+        chat_id: int,
+        kind: str,
+        success: bool = True,
+        detail: str = None,
+        incident_id: Optional[int] = None,
+    ):
+        """Пише подію ескалації ('reminder', 'escalation', 'ack') до інциденту групи"""
+        if incident_id is None:
+            incident_id = self._open_incident_id(chat_id)
+        self._queue(EVENT_INSERT, (incident_id, chat_id, time.time(), kind, int(success), detail))
+
+    def record_reboot(
+        self, chat_id: int, success: bool, manual: bool = False, detail: str = None
+    ):
+        """Пише результат виклику API reboot (до відкритого інциденту, якщо є)"""
+        self._queue(
+            EVENT_INSERT,
+            (
+                self._open_incident_id(chat_id),
+                chat_id,
+                time.time(),
+                "manual_reboot" if manual else "reboot",
+                int(success),
+                detail,
+            ),
+        )
+
+    def resolve(self, chat_id: int, resolved_at: float = None) -> int:
+        """Закриває відкритий інцидент групи, повертає кількість закритих"""
+        if self._open.pop(chat_id, None) is None:
+            return 0
+        self._queue(
+            "UPDATE incidents SET resolved_at = ? WHERE chat_id = ? AND resolved_at IS NULL",
+            (resolved_at or time.time(), chat_id),
+        )
+        return 1
+
+    async def query(
+        self,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        chat_id: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        status: Optional[str] = None,
+    ) -> Dict:
+        """Сторінка інцидентів від нових до старих з keyset-пагінацією за id
+
+        status: "open" або "resolved". Наступну сторінку повертає
+        next_cursor, який передається як before_id. Вибірка виконується в
+        окремому потоці, щоб очікування на потік запису не зупиняло цикл подій.
+        """
+        return await asyncio.to_thread(
+            self._query, limit, before_id, chat_id, since, until, status
+        )
+
+    def _query(
+        self,
+        limit: int,
+        before_id: Optional[int],
+        chat_id: Optional[int],
+        since: Optional[float],
+        until: Optional[float],
+        status: Optional[str],
+    ) -> Dict:
+        conditions, params = [], []
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+        if chat_id is not None:
+            conditions.append("chat_id = ?")
+            params.append(chat_id)
+        if since is not None:
+            conditions.append("detected_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("detected_at < ?")
+            params.append(until)
+        if status == "open":
+            conditions.append("resolved_at IS NULL")
+        elif status == "resolved":
+            conditions.append("resolved_at IS NOT NULL")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(INCIDENT_COLUMNS)} FROM incidents {where} "
+                "ORDER BY id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+
+            has_more = len(rows) > limit
+            incidents = [dict(row) for row in rows[:limit]]
+            self._attach_events(incidents)
+        return {
+            "incidents": incidents,
+            "next_cursor": incidents[-1]["id"] if has_more else None,
+        }
+
+    def _attach_events(self, incidents: List[Dict]):
+        if not incidents:
+            return
+        by_id = {incident["id"]: incident for incident in incidents}
+        for incident in incidents:
+            incident["events"] = []
+        placeholders = ", ".join("?" * len(by_id))
+        rows = self._conn.execute(
+            "SELECT incident_id, at, kind, success, detail FROM incident_events "
+            f"WHERE incident_id IN ({placeholders}) ORDER BY id",
+            tuple(by_id),
+        ).fetchall()
+        for row in rows:
+            event = dict(row)
+            by_id[event.pop("incident_id")]["events"].append(event)
+
+    async def stats(
+        self,
+        since: float,
+        until: float,
+        chat_id: Optional[int] = None,
+    ) -> Dict:
+        """MTTR та доступність груп за період [since, until), порахована в SQL
+
+        Простій - час від останнього повідомлення до відновлення активності
+        (для відкритих інцидентів - до until), обрізаний межами періоду.
+        Агрегати рахуються в окремому потоці, як і вибірка в query().
+        """
+        return await asyncio.to_thread(self._stats, since, until, chat_id)
+
+    def _stats(self, since: float, until: float, chat_id: Optional[int]) -> Dict:
+        window = max(until - since, 1e-9)
+        chat_filter = "AND chat_id = :chat_id" if chat_id is not None else ""
+        params = {"since": since, "until": until, "window": window, "chat_id": chat_id}
+
+        with self._lock:
+            groups = self._conn.execute(
+                f"""
+                SELECT
+                    chat_id,
+                    MAX(group_name) AS group_name,
+                    COUNT(*) AS incidents,
+                    SUM(resolved_at IS NOT NULL) AS resolved,
+                    AVG(resolved_at - detected_at) AS mttr_seconds,
+                    AVG(resolved_at - started_at) AS mean_downtime_seconds,
+                    SUM(MAX(0, MIN(COALESCE(resolved_at, :until), :until)
+                               - MAX(started_at, :since))) AS downtime_seconds,
+                    1.0 - MIN(1.0, SUM(MAX(0, MIN(COALESCE(resolved_at, :until), :until)
+                                             - MAX(started_at, :since))) / :window) AS uptime
+                FROM incidents
+                WHERE started_at < :until
+                  AND COALESCE(resolved_at, :until) > :since
+                  {chat_filter}
+                GROUP BY chat_id
+                ORDER BY downtime_seconds DESC
+                """,
+                params,
+            ).fetchall()
+
+            totals = self._conn.execute(
+                f"""
+                SELECT
+                    (SELECT COUNT(*) FROM incidents
+                     WHERE detected_at >= :since AND detected_at < :until {chat_filter})
+                        AS incidents,
+                    (SELECT AVG(resolved_at - detected_at) FROM incidents
+                     WHERE resolved_at IS NOT NULL
+                       AND detected_at >= :since AND detected_at < :until {chat_filter})
+                        AS mttr_seconds,
+                    (SELECT SUM(success) FROM incident_events
+                     WHERE kind IN ('reboot', 'manual_reboot')
+                       AND at >= :since AND at < :until {chat_filter})
+                        AS reboots_ok,
+                    (SELECT SUM(1 - success) FROM incident_events
+                     WHERE kind IN ('reboot', 'manual_reboot')
+                       AND at >= :since AND at < :until {chat_filter})
+                        AS reboots_failed
+                """,
+                params,
+            ).fetchone()
+
+        return {
+            "since": since,
+            "until": until,
+            "incidents": totals["incidents"],
+            "mttr_seconds": totals["mttr_seconds"],
+            "reboots_ok": totals["reboots_ok"] or 0,
+            "reboots_failed": totals["reboots_failed"] or 0,
+            "groups": [dict(row) for row in groups],
+        }
+
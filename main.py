@@ -1,7 +1,9 @@
 from telethon import TelegramClient, events
 from telethon.sessions import StringSession
+from telethon import functions, types, utils
 from telethon.errors import (
     PeerIdInvalidError,
+    FloodWaitError,
     ChatWriteForbiddenError,
     UserBannedInChannelError,
     SessionPasswordNeededError,
@@ -9,21 +11,77 @@ from telethon.errors import (
 import asyncio
 import aiohttp
 import json
+import math
+import re
+import logging
+import time as time_module
 from datetime import datetime, timedelta, time,timezone
 from elastic import logger
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from scheduler import DeadlineScheduler
+from sender_cache import SenderCache
+from clock import MonotonicClock
+from state_journal import StateJournal
+from entity_cache import EntityCache, evict_from_client
+from incidents import IncidentStore
+from config_watcher import ConfigWatcher
+from config_store import check_keep_versions
+from outbox import NotificationOutbox
+from alerts import Alert, AlertDispatcher
+from escalation import REMINDER, Escalation, EscalationEngine, EscalationPolicy
+from send_scheduler import PRIORITY_ALERT, PRIORITY_NORMAL, PRIORITY_STATUS, SendScheduler
+from text_utils import split_message
+from templates import TemplateRenderer
+from activity import ActivityHistory, resample, sparkline
+from quantiles import HOURS_PER_WEEK, GapQuantiles, hour_of_week
+from state import FLAG_ALERTED, FLAG_REBOOTED, GroupStateStore
+from schedule import DayNightSchedule, GroupSchedule
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field, fields
 import sys
 import pytz
 
 #------------------------------------------------------------------------------
 
 
+@dataclass
+class AdaptiveConfig:
+    quantile: float = 0.99  # Квантиль інтервалів між повідомленнями
+    min_samples: int = 30  # Мінімум спостережень у годині тижня
+    multiplier: float = 1.0
+    min_minutes: int = 5
+    max_minutes: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional["AdaptiveConfig"]:
+        """None, якщо адаптивний поріг вимкнено; кидає ValueError на некоректних полях"""
+        data = dict(data or {})
+        if not data.pop("enabled", False):
+            return None
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"adaptive: невідомі поля {sorted(unknown)}")
+        for name, value in data.items():
+            if name == "max_minutes" and value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"adaptive.{name} має бути числом")
+        config = cls(**data)
+        if not 0 < config.quantile < 1:
+            raise ValueError("adaptive.quantile має бути між 0 і 1")
+        if config.min_samples < 1 or config.multiplier <= 0 or config.min_minutes < 0:
+            raise ValueError(
+                "adaptive: min_samples і multiplier мають бути додатніми, min_minutes >= 0"
+            )
+        return config
+
+
 @dataclass
 class MonitoringConfig:
     enabled: bool
     day_inactive_minutes: int
     night_inactive_minutes: int
+    schedule: Optional[GroupSchedule] = None  # Календарні вікна з власними порогами
+    adaptive: Optional[AdaptiveConfig] = None  # Поріг з квантилів інтервалів
 
 
 @dataclass
@@ -48,23 +106,126 @@ class GroupConfig:
     description: str
     monitoring: MonitoringConfig
     api_reboot: ApiRebootConfig
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ListingQuery:
+    """Фільтр і сторінка для /status та /groups"""
+
+    overdue: bool = False
+    tag: Optional[str] = None
+    page: int = 1
+
+
+class GroupRegistry:
+    """Індекс груп, побудований один раз на версію конфігурації"""
+
+    def __init__(self, groups: List[GroupConfig], version: int):
+        self.version = version
+        self.groups = groups
+        self.enabled = [group for group in groups if group.monitoring.enabled]
+        self.by_chat_id = {group.chat_id: group for group in groups}
+        self.enabled_by_chat_id = {group.chat_id: group for group in self.enabled}
+        self.by_name = {group.name.lower(): group for group in groups}
+        self.by_tag: Dict[str, List[GroupConfig]] = {}
+        for group in groups:
+            for tag in group.tags:
+                self.by_tag.setdefault(tag.lower(), []).append(group)
+
+    def get(self, chat_id: int) -> Optional[GroupConfig]:
+        return self.by_chat_id.get(chat_id)
+
+    def find_by_name(self, name: str) -> Optional[GroupConfig]:
+        return self.by_name.get(name.lower())
+
+    def with_tag(self, tag: str) -> List[GroupConfig]:
+        return self.by_tag.get(tag.lower(), [])
 
 
 class TelegramMultiMonitor:
     def __init__(self, config_file: str = "config.json"):
+        self.config_file = config_file
         self.config = self.load_config(config_file)
+        # Версія конфігурації та закешований реєстр груп для неї
+        self.config_version = 0
+        self._registry: Optional[GroupRegistry] = None
         self.client = None
         self.notification_chat_id = None
         self.timezone = None
 
-        # Словники для зберігання стану по кожній групі
-        self.last_message_time: Dict[int, datetime] = {}
-        self.notification_sent: Dict[int, bool] = {}
-        self.chat_accessible: Dict[int, bool] = {}
-        self.api_reboot_sent: Dict[int, bool] = {}
+        # Стан груп у масивах NumPy: час останнього повідомлення, пороги та
+        # упаковані флаги (доступ, сповіщення, reboot)
+        self.state = GroupStateStore()
+
+        # Дедлайни неактивності груп (chat_id -> монотонна відмітка)
+        self.scheduler = DeadlineScheduler()
+        self.clock = MonotonicClock()
+        self.messages_total = 0
+
+        # Кеш імен відправників для логування повідомлень
+        global_settings = self.config["global_settings"]
+        self.sender_cache = SenderCache(
+            max_size=global_settings.get("sender_cache_size", 10000),
+            ttl_seconds=global_settings.get("sender_cache_ttl_seconds", 3600),
+        )
+
+        # Журнал стану, щоб перезапуск не скидав відлік неактивності
+        state_file = global_settings.get("state_file", "data/monitor_state.db")
+        self.journal = StateJournal(state_file)
+        # Кеш розпізнаних чатів: StringSession не зберігає їх між запусками
+        self.entity_cache = EntityCache(
+            global_settings.get("entity_cache_file", state_file)
+        )
+        # Інциденти неактивності та результати reboot
+        self.incidents = IncidentStore(
+            global_settings.get("incidents_file", state_file)
+        )
+        # Похвилинна історія повідомлень груп у кільцевих буферах
+        self.activity = ActivityHistory(
+            global_settings.get("activity_history_days", 7) * 1440
+        )
+        # Квантилі інтервалів між повідомленнями для адаптивних порогів
+        self.gap_quantiles: Dict[int, GapQuantiles] = {}
+        self._utc_offset = 0.0
+        self._utc_offset_hour = None
+        self.background_tasks: List[asyncio.Task] = []
+        self._flood_wait_until = 0.0
+        # Черга сповіщень: алерти зводяться в дайджести і доставляються у фоні
+        self.outbox = NotificationOutbox(
+            self.send_notification_to,
+            window=global_settings.get("notification_digest_seconds", 2.0),
+        )
+        # Усі відправки та редагування в Telegram проходять через відра токенів
+        self.sender = SendScheduler(
+            global_rate=global_settings.get("send_global_rate", 25),
+            global_burst=global_settings.get("send_global_burst", 25),
+            chat_rate=global_settings.get("send_chat_rate", 1),
+            chat_burst=global_settings.get("send_chat_burst", 3),
+            max_queue=global_settings.get("send_max_queue", 500),
+        )
+        self._sender_task: Optional[asyncio.Task] = None
+        # Розсилка сповіщень по приймачах (Telegram, webhook, файл, сокет)
+        self.alerts = self.build_alert_dispatcher(global_settings)
+        self._retiring_alerts: Set[asyncio.Task] = set()  # Старі приймачі дорозсилають чергу
+        # Нагадування та ескалація відкритих інцидентів на колесі таймерів
+        self.escalations = EscalationEngine(
+            EscalationPolicy.from_dict(global_settings.get("escalation")), self.clock()
+        )
+        self._reboot_tasks: Dict[int, asyncio.Task] = {}
+        # Шаблони повідомлень, скомпільовані для локалі з конфігурації
+        self.templates = TemplateRenderer.from_settings(global_settings)
+        # Фільтр NewMessage відстежуваних чатів (оновлюється при apply_config)
+        self.message_builder: Optional[events.NewMessage] = None
+
+        # Скомпільований розклад день/ніч та кеш поточного періоду
+        self.day_night: Optional[DayNightSchedule] = None
+        self._is_night = False
+        self._next_transition_ts = 0.0
 
         # Ініціалізуємо часову зону
         self.setup_timezone()
+        self.compile_schedule()
 
     def setup_timezone(self):
         """Налаштовує часову зону"""
@@ -85,39 +246,84 @@ class TelegramMultiMonitor:
         night_config = self.config["global_settings"]["night_hours"]
         return NightHoursConfig(start=night_config["start"], end=night_config["end"])
 
-    def is_night_time(self, dt: datetime = None) -> bool:
-        """Перевіряє чи зараз нічний час"""
-        if dt is None:
-            dt = datetime.now(self.timezone)
-
+    def compile_schedule(self):
+        """Компілює night_hours у таблицю переходів день/ніч"""
         night_hours = self.get_night_hours()
-
         try:
-            # Парсимо час початку і кінця ночі
-            start_time = datetime.strptime(night_hours.start, "%H:%M").time()
-            end_time = datetime.strptime(night_hours.end, "%H:%M").time()
-            current_time = dt.time()
-
-            # Якщо нічний період не переходить через північ (наприклад, 23:00-06:00)
-            if start_time > end_time:
-                return current_time >= start_time or current_time <= end_time
-            # Якщо нічний період в межах одного дня (наприклад, 01:00-05:00)
-            else:
-                return start_time <= current_time <= end_time
-
+            self.day_night = DayNightSchedule(night_hours.start, night_hours.end)
         except Exception as e:
             logger.error(f"Помилка визначення нічного часу: {e}")
-            return False
+            # Нічний режим вимкнено - весь час вважається денним
+            self.day_night = DayNightSchedule("00:00", "00:00")
+        self.refresh_period()
+
+    def refresh_period(self):
+        """Оновлює кешований період та момент наступного перемикання"""
+        now = datetime.now(self.timezone)
+        self._is_night = self.day_night.is_night(now)
+        self._next_transition_ts = self.day_night.next_transition(now).timestamp()
 
-    def get_current_timeout_for_group(self, group: GroupConfig) -> int:
+    def is_night_time(self, dt: datetime = None) -> bool:
+        """Перевіряє чи зараз нічний час"""
+        if dt is not None:
+            return self.day_night.is_night(dt)
+
+        # Поточний період кешується до наступного перемикання
+        if time_module.time() >= self._next_transition_ts:
+            self.refresh_period()
+        return self._is_night
+
+    def get_current_timeout_for_group(
+        self, group: GroupConfig, dt: datetime = None
+    ) -> int:
         """Повертає поточний таймаут для групи в залежності від часу доби"""
-        is_night = self.is_night_time()
+        if group.monitoring.adaptive is not None:
+            minutes = self.adaptive_timeout_minutes(group)
+            if minutes is not None:
+                return minutes
+
+        schedule = group.monitoring.schedule
+        if schedule is not None:
+            minutes = schedule.threshold_at(dt or datetime.now(self.timezone))
+            if minutes is not None:
+                return minutes
+
+        is_night = self.is_night_time(dt)
 
         if is_night:
             return group.monitoring.night_inactive_minutes
         else:
             return group.monitoring.day_inactive_minutes
 
+    def local_hour_of_week(self, wall_ts: float) -> int:
+        """Година тижня в локальній часовій зоні (зсув кешується на годину)"""
+        hour = int(wall_ts // 3600)
+        if hour != self._utc_offset_hour:
+            local = datetime.fromtimestamp(wall_ts, self.timezone)
+            self._utc_offset = local.utcoffset().total_seconds()
+            self._utc_offset_hour = hour
+        return hour_of_week(wall_ts + self._utc_offset)
+
+    def adaptive_timeout_minutes(self, group: GroupConfig) -> Optional[int]:
+        """Адаптивний поріг: квантиль інтервалів для години тижня, в яку почалась тиша
+
+        Повертає None, поки для цієї години не набрано достатньо спостережень.
+        """
+        adaptive = group.monitoring.adaptive
+        quantiles = self.gap_quantiles.get(group.chat_id)
+        last_seen = self.state.last_seen_of(group.chat_id)
+        if adaptive is None or quantiles is None or last_seen is None:
+            return None
+
+        hour = self.local_hour_of_week(self.clock.to_wall(last_seen))
+        gap = quantiles.quantile(hour, adaptive.min_samples)
+        if gap is None:
+            return None
+        minutes = max(adaptive.min_minutes, math.ceil(gap * adaptive.multiplier / 60))
+        if adaptive.max_minutes is not None:
+            minutes = min(minutes, adaptive.max_minutes)
+        return minutes
+
     def get_time_period_name(self) -> str:
         """Повертає назву поточного періоду часу"""
         return "🌙 Ніч" if self.is_night_time() else "☀️ День"
@@ -136,6 +342,13 @@ class TelegramMultiMonitor:
                 )
                 raise ValueError("session_string порожній")
 
+            # Групи розбираються тут, щоб помилка в них зупинила запуск,
+            # а не кожне звернення до реєстру
+            try:
+                self.parse_groups(config)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Некоректна конфігурація груп у {config_file}: {e}")
+                raise
             return config
         except FileNotFoundError:
             logger.error(f"Файл конфігурації {config_file} не знайдено")
@@ -144,17 +357,211 @@ class TelegramMultiMonitor:
             logger.error(f"Помилка парсингу JSON: {e}")
             raise
 
-    def get_groups(self) -> List[GroupConfig]:
-        """Повертає список груп з конфігурації"""
+    def validate_config(self, config: dict) -> List[GroupConfig]:
+        """Перевіряє нову конфігурацію до застосування, кидає ValueError з причиною"""
+        try:
+            if not config["telegram"].get("session_string"):
+                raise ValueError("session_string порожній")
+            global_settings = config["global_settings"]
+            if int(global_settings["check_interval_seconds"]) <= 0:
+                raise ValueError("check_interval_seconds має бути додатнім")
+            global_settings["notification_user_id"]
+            night_hours = global_settings["night_hours"]
+            DayNightSchedule(night_hours["start"], night_hours["end"])
+            pytz.timezone(global_settings.get("timezone", "Europe/Kiev"))
+            TemplateRenderer.from_settings(global_settings)
+            self.build_alert_dispatcher(global_settings)
+            EscalationPolicy.from_dict(global_settings.get("escalation"))
+            check_keep_versions(global_settings.get("config_history_keep", 50))
+            groups = self.parse_groups(config)
+        except KeyError as e:
+            raise ValueError(f"відсутнє поле {e}")
+        except (TypeError, pytz.UnknownTimeZoneError) as e:
+            raise ValueError(str(e))
+
+        chat_ids = [group.chat_id for group in groups]
+        if len(chat_ids) != len(set(chat_ids)):
+            raise ValueError("chat_id груп повторюються")
+        return groups
+
+    async def reload_config_from_file(self):
+        """Перечитує файл конфігурації після зміни та застосовує його, якщо він коректний"""
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Не вдалося прочитати {self.config_file}: {e}")
+            return
+        if config == self.config:
+            return
+
+        try:
+            self.validate_config(config)
+        except ValueError as e:
+            logger.error(
+                f"Зміни {self.config_file} не застосовано, конфігурація некоректна: {e}"
+            )
+            return
+
+        await self.apply_config(config)
+
+    def set_config(self, config: dict):
+        """Замінює конфігурацію та інвалідує реєстр груп"""
+        self.config = config
+        self.config_version += 1
+        self._registry = None
+
+    async def apply_config(self, config: dict) -> Dict:
+        """Застосовує нову конфігурацію без перепідключення клієнта
+
+        Порівнює групи старої та нової конфігурації: нові реєструються та
+        перевіряються, видалені (або вимкнені) знімаються з фільтра чатів,
+        планувальника та сховища стану, змінені отримують нові пороги.
+        Стан незмінених груп зберігається. Реєстр груп, шаблони, приймачі та
+        політика ескалації будуються до заміни конфігурації, тож помилка в
+        них не лишає конфігурацію застосованою частково.
+        """
+        started = time_module.perf_counter()
+        old_raw = {group["chat_id"]: group for group in self.config.get("groups", [])}
+        old_enabled = set(self.get_registry().enabled_by_chat_id)
+        old_notification_user = self.config["global_settings"].get("notification_user_id")
+        old_templates = (
+            self.config["global_settings"].get("locale"),
+            self.config["global_settings"].get("templates"),
+        )
+        old_alert_sinks = self.config["global_settings"].get("alert_sinks")
+        old_escalation = self.config["global_settings"].get("escalation")
+
+        global_settings = config["global_settings"]
+        registry = GroupRegistry(self.parse_groups(config), self.config_version + 1)
+        templates = None
+        if (global_settings.get("locale"), global_settings.get("templates")) != old_templates:
+            templates = TemplateRenderer.from_settings(global_settings)
+        escalation_changed = global_settings.get("escalation") != old_escalation
+        policy = (
+            EscalationPolicy.from_dict(global_settings.get("escalation"))
+            if escalation_changed
+            else None
+        )
+        alerts = None
+        if global_settings.get("alert_sinks") != old_alert_sinks or escalation_changed:
+            alerts = self.build_alert_dispatcher(global_settings)
+
+        self.set_config(config)
+        self._registry = registry
+        self.setup_timezone()
+        self.compile_schedule()
+
+        new_raw = {group["chat_id"]: group for group in self.config.get("groups", [])}
+        if templates is not None:
+            self.templates = templates
+        else:
+            # Статичні фрагменти лише тих груп, чий опис змінився
+            self.templates.invalidate(
+                chat_id
+                for chat_id in old_raw.keys() | new_raw.keys()
+                if old_raw.get(chat_id) != new_raw.get(chat_id)
+            )
+        new_enabled = set(registry.enabled_by_chat_id)
+        added = new_enabled - old_enabled
+        removed = old_enabled - new_enabled
+        changed = {
+            chat_id
+            for chat_id in old_enabled & new_enabled
+            if old_raw.get(chat_id) != new_raw.get(chat_id)
+        }
+
+        for chat_id in removed:
+            self.forget_group(chat_id)
+
+        for chat_id in changed:
+            self.register_group_state(registry.enabled_by_chat_id[chat_id])
+
+        if added:
+            added_groups = [registry.enabled_by_chat_id[chat_id] for chat_id in added]
+            await self.validate_groups_access(added_groups)
+            for group in added_groups:
+                if self.state.last_seen_of(group.chat_id) is None:
+                    self.state.set_last_seen(group.chat_id, self.clock())
+
+        self.update_chat_filter(added, removed)
+
+        if alerts is not None:
+            self.replace_alert_dispatcher(alerts)
+        if policy is not None:
+            self.escalations.replace_policy(policy, self.clock())
+
+        if self.client is not None and (
+            self.config["global_settings"].get("notification_user_id")
+            != old_notification_user
+        ):
+            await self.setup_notification_channel()
+
+        # Пороги всіх груп могли змінитися (нічні години, часова зона) -
+        # векторно переозброюємо дедлайни
+        self.rearm_all_groups(
+            registry.enabled_by_chat_id,
+            datetime.now(self.timezone),
+            self.get_time_period_name(),
+        )
+        self._last_period_night = self.is_night_time()
+
+        summary = {
+            "added": sorted(added),
+            "removed": sorted(removed),
+            "changed": sorted(changed),
+            "elapsed_ms": round((time_module.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(
+            f"Конфігурацію застосовано: +{len(added)} -{len(removed)} ~{len(changed)} груп "
+            f"за {summary['elapsed_ms']} мс"
+        )
+        return summary
+
+    def forget_group(self, chat_id: int):
+        """Прибирає групу з планувальника та сховищ стану"""
+        self.scheduler.cancel(chat_id)
+        self.state.remove(chat_id)
+        self.activity.remove(chat_id)
+        self.gap_quantiles.pop(chat_id, None)
+        self.escalations.stop(chat_id)
+
+    def update_chat_filter(self, added, removed):
+        """Оновлює множину чатів фільтра NewMessage на місці"""
+        builder = self.message_builder
+        if builder is None:
+            return
+        if builder.resolved:
+            builder.chats.update(added)
+            builder.chats.difference_update(removed)
+        else:
+            # Фільтр ще не розібраний Telethon - замінюємо список на маркіровані ID
+            builder.chats = set(self.get_registry().enabled_by_chat_id)
+
+    @property
+    def message_log_sample_every(self) -> int:
+        """Логувати кожне N-те повідомлення групи (0 - не логувати)"""
+        settings = self.config["global_settings"]
+        if not settings.get("log_messages", False):
+            return 0
+        return max(1, int(settings.get("message_log_sample_every", 1)))
+
+    def parse_groups(self, config: dict = None) -> List[GroupConfig]:
+        """Будує конфігурації груп з сирого JSON"""
         groups = []
-        for group_data in self.config["groups"]:
+        for group_data in (config or self.config)["groups"]:
             # Моніторинг конфігурація
+            schedule_data = group_data["monitoring"].get("schedule")
             monitoring_config = MonitoringConfig(
                 enabled=group_data["monitoring"]["enabled"],
                 day_inactive_minutes=group_data["monitoring"]["day_inactive_minutes"],
                 night_inactive_minutes=group_data["monitoring"][
                     "night_inactive_minutes"
                 ],
+                schedule=GroupSchedule.from_dict(schedule_data)
+                if schedule_data
+                else None,
+                adaptive=AdaptiveConfig.from_dict(group_data["monitoring"].get("adaptive")),
             )
 
             # API конфігурація
@@ -172,13 +579,36 @@ class TelegramMultiMonitor:
                 description=group_data["description"],
                 monitoring=monitoring_config,
                 api_reboot=api_config,
+                tags=self.parse_tags(group_data),
             )
             groups.append(group)
         return groups
 
+    @staticmethod
+    def parse_tags(group_data: dict) -> List[str]:
+        """Теги групи: список рядків, один рядок вважається одним тегом"""
+        tags = group_data.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tags]
+        if not isinstance(tags, list):
+            raise ValueError(f"теги групи '{group_data.get('name')}' мають бути списком рядків")
+        if not all(isinstance(tag, str) and tag for tag in tags):
+            raise ValueError(f"теги групи '{group_data.get('name')}' мають бути непорожніми рядками")
+        return list(tags)
+
+    def get_registry(self) -> GroupRegistry:
+        """Повертає реєстр груп для поточної версії конфігурації"""
+        if self._registry is None or self._registry.version != self.config_version:
+            self._registry = GroupRegistry(self.parse_groups(), self.config_version)
+        return self._registry
+
+    def get_groups(self) -> List[GroupConfig]:
+        """Повертає список груп з конфігурації"""
+        return self.get_registry().groups
+
     def get_enabled_groups(self) -> List[GroupConfig]:
         """Повертає тільки групи з увімкненим моніторингом"""
-        return [group for group in self.get_groups() if group.monitoring.enabled]
+        return self.get_registry().enabled
 
     async def initialize_client(self):
         """Ініціалізує Telegram клієнта"""
@@ -196,6 +626,10 @@ class TelegramMultiMonitor:
             )
 
             await self.client.start()
+            # FloodWait не "просипляється" всередині Telethon, а повертається
+            # планувальнику відправок, який паркує лише потрібного отримувача.
+            # Решта запитів клієнта йде через call_respecting_flood
+            self.client.flood_sleep_threshold = 0
 
             # Перевіряємо чи клієнт авторизований
             if not await self.client.is_user_authorized():
@@ -203,7 +637,7 @@ class TelegramMultiMonitor:
                 raise Exception("Клієнт не авторизований")
 
             # Отримуємо інформацію про користувача
-            me = await self.client.get_me()
+            me = await self.call_respecting_flood(self.client.get_me, "отриманні профілю")
             logger.info(
                 f"Telegram клієнт запущено. Авторизовано як: {me.first_name} (@{me.username})"
             )
@@ -220,30 +654,155 @@ class TelegramMultiMonitor:
                 )
             raise
 
-    async def validate_chat_access(self, group: GroupConfig) -> bool:
-        """Перевіряє доступ до чату"""
+    def open_entity_cache(self):
+        """Завантажує кеш сутностей і передає їх у сесію Telethon"""
+        try:
+            self.entity_cache.open()
+        except Exception as e:
+            logger.error(f"Помилка читання кешу сутностей: {e}")
+            return
+        # Telethon знаходитиме access_hash у пам'яті сесії без get_entity
+        self.client.session.process_entities(self.entity_cache.input_peers())
+        logger.info(f"Кеш сутностей: завантажено {len(self.entity_cache)} чатів")
+
+    async def validate_chat_access(
+        self, group: GroupConfig, refresh: bool = False
+    ) -> bool:
+        """Перевіряє доступ до чату
+
+        Якщо чат є в кеші сутностей, мережевий запит не робиться;
+        refresh=True примусово перевіряє доступ через Telegram.
+        """
+        self.register_group_state(group)
+        cached = None if refresh else self.entity_cache.get(group.chat_id)
+        if cached is not None:
+            logger.info(
+                f"Доступ до чату '{group.name}' ({cached.title}) підтверджено з кешу"
+            )
+            self.set_group_access(group, True)
+            return True
+
         try:
-            chat = await self.client.get_entity(group.chat_id)
+            chat = await self.get_entity_respecting_flood(group.chat_id)
+            self.entity_cache.put(group.chat_id, chat)
             chat_title = getattr(chat, "title", f"Chat {group.chat_id}")
             logger.info(f"Доступ до чату '{group.name}' ({chat_title}) підтверджено")
-            self.chat_accessible[group.chat_id] = True
+            self.set_group_access(group, True)
             return True
         except PeerIdInvalidError:
+            self.forget_entities([group.chat_id])
             logger.error(f"Невірний ID чату для групи '{group.name}': {group.chat_id}")
-            self.chat_accessible[group.chat_id] = False
+            self.set_group_access(group, False)
             return False
         except Exception as e:
             logger.error(f"Помилка при перевірці доступу до групи '{group.name}': {e}")
-            self.chat_accessible[group.chat_id] = False
+            self.set_group_access(group, False)
             return False
 
+    def set_group_access(self, group: GroupConfig, accessible: bool):
+        """Позначає доступ до чату; група, що знову доступна, повертається в планувальник
+
+        Недоступні групи випадають з планувальника в check_inactivity, тож
+        без переозброєння вони лишались би без моніторингу до перезапуску.
+        """
+        was_accessible = self.state.is_accessible(group.chat_id)
+        self.state.set_accessible(group.chat_id, accessible)
+        if accessible and not was_accessible and group.monitoring.enabled:
+            self.arm_group_deadline(group)
+
+    def forget_entities(self, chat_ids: Iterable[int]):
+        """Забуває access_hash чатів у кеші сутностей, сесії та пам'яті клієнта"""
+        chat_ids = list(chat_ids)
+        for chat_id in chat_ids:
+            self.entity_cache.invalidate(chat_id)
+        if self.client is not None:
+            evict_from_client(self.client, chat_ids)
+
+    async def reload_entities(self, chat_ids: Iterable[int]) -> int:
+        """Заново отримує access_hash чатів зі списку діалогів, повертає кількість знайдених
+
+        За голим ID Telegram не поверне канал без access_hash, тому свіжі
+        хеші беремо зі списку діалогів акаунта.
+        """
+        wanted = set(chat_ids)
+        self.forget_entities(wanted)
+        dialogs = await self.call_respecting_flood(
+            lambda: self.client.get_dialogs(limit=None), "оновленні списку діалогів"
+        )
+        found = [dialog.entity for dialog in dialogs if dialog.id in wanted]
+        for entity in found:
+            self.entity_cache.put(utils.get_peer_id(entity), entity)
+        self.client.session.process_entities(found)
+        return len(found)
+
+    async def get_entity_respecting_flood(self, chat_id: int, attempts: int = 3):
+        """get_entity, що при FloodWait чекає вказаний час і повторює запит"""
+        return await self.call_respecting_flood(
+            lambda: self.client.get_entity(chat_id), f"перевірці чату {chat_id}", attempts
+        )
+
+    async def call_respecting_flood(self, make_call, description: str, attempts: int = 3):
+        """Виконує запит make_call(), при FloodWait чекає вказаний час і повторює
+
+        Пауза спільна для всіх паралельних запитів: поки вона діє, нові
+        запити не відправляються.
+        """
+        for attempt in range(attempts):
+            delay = self._flood_wait_until - time_module.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await make_call()
+            except FloodWaitError as e:
+                if attempt == attempts - 1:
+                    raise
+                logger.warning(f"FloodWait {e.seconds} сек при {description}")
+                self._flood_wait_until = max(
+                    self._flood_wait_until, time_module.monotonic() + e.seconds
+                )
+
+    async def validate_groups_access(
+        self, groups: List[GroupConfig], progress=None, refresh: bool = False
+    ) -> List[bool]:
+        """Паралельно перевіряє доступ до груп з обмеженням конкурентності
+
+        progress - необов'язкова корутина progress(done, total), яку
+        викликають після кожної перевіреної групи.
+        """
+        limit = self.config["global_settings"].get("validation_concurrency", 10)
+        semaphore = asyncio.Semaphore(max(1, limit))
+        done = 0
+
+        async def check(group: GroupConfig) -> bool:
+            nonlocal done
+            async with semaphore:
+                result = await self.validate_chat_access(group, refresh)
+            done += 1
+            if progress is not None:
+                await progress(done, len(groups))
+            return result
+
+        results = await asyncio.gather(*(check(group) for group in groups))
+        self.entity_cache.flush()
+        return results
+
+    async def resolve_input_peer(self, chat_id: int, refresh: bool = False):
+        """Повертає InputPeer чату з кешу сутностей або через мережу"""
+        if not refresh:
+            peer = self.entity_cache.input_peer(chat_id)
+            if peer is not None:
+                return peer
+        entity = await self.get_entity_respecting_flood(chat_id)
+        self.entity_cache.put(chat_id, entity)
+        return utils.get_input_peer(entity)
+
     async def setup_notification_channel(self):
         """Налаштовує канал для сповіщень"""
         notification_user = self.config["global_settings"]["notification_user_id"]
 
         if notification_user == "me":
             try:
-                me = await self.client.get_me()
+                me = await self.call_respecting_flood(self.client.get_me, "отриманні профілю")
                 self.notification_chat_id = me.id
                 logger.info(
                     "Повідомлення будуть відправлятися у 'Збережені повідомлення'"
@@ -256,24 +815,111 @@ class TelegramMultiMonitor:
             self.notification_chat_id = notification_user
             return True
 
-    async def send_notification(self, message: str) -> bool:
-        """Безпечно відправляє повідомлення"""
-        if not self.notification_chat_id:
+    async def send_notification(self, message: str, priority: int = PRIORITY_ALERT) -> bool:
+        """Безпечно відправляє повідомлення в канал сповіщень"""
+        return await self.send_notification_to(self.notification_chat_id, message, priority)
+
+    async def send_notification_to(
+        self, chat_id, message: str, priority: int = PRIORITY_ALERT
+    ) -> bool:
+        """Відправляє повідомлення, за потреби розбиваючи його на частини до 4096 символів"""
+        if not chat_id:
             logger.error("Не встановлено канал для повідомлень")
             return False
 
         try:
-            chat_id = self.notification_chat_id
             if isinstance(chat_id, str):
                 chat_id = chat_id.strip().strip('"').strip("'")
                 if chat_id.lstrip('-').isdigit():
                     chat_id = int(chat_id)
-            await self.client.send_message(chat_id, message)
+            for chunk in split_message(message):
+                sent = await self.sender.submit(
+                    chat_id,
+                    lambda chunk=chunk: self.client.send_message(chat_id, chunk),
+                    priority,
+                )
+                # None - завдання відкинуто при переповненні черги або замінено
+                if sent is None:
+                    logger.error(
+                        f"Повідомлення для {chat_id} не відправлено: черга відкинула його"
+                    )
+                    return False
             return True
         except Exception as e:
             logger.error(f"Помилка при відправці повідомлення: {e}")
             return False
 
+    def reply(self, event, text: str) -> asyncio.Future:
+        """Редагує повідомлення з командою через планувальник (найнижчий пріоритет)
+
+        Ще не відправлене редагування того ж повідомлення замінюється новим,
+        тож проміжний прогрес можна не чекати. На чужу (вхідну) команду
+        відповідає новим повідомленням.
+        """
+        future = self.sender.submit(
+            event.chat_id,
+            (lambda: event.edit(text)) if event.out else (lambda: event.reply(text)),
+            PRIORITY_STATUS,
+            key=(event.chat_id, event.id),
+        )
+        future.add_done_callback(self._log_reply_error)
+        return future
+
+    async def reply_long(self, event, text: str):
+        """Відповідь довша за ліміт Telegram: перша частина - редагуванням, решта - новими повідомленнями"""
+        chunks = split_message(text)
+        await self.reply(event, chunks[0])
+        for chunk in chunks[1:]:
+            await self.sender.submit(
+                event.chat_id,
+                lambda chunk=chunk: self.client.send_message(event.chat_id, chunk),
+                PRIORITY_STATUS,
+            )
+
+    @staticmethod
+    def _log_reply_error(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Помилка редагування повідомлення: {future.exception()}")
+
+    def build_alert_dispatcher(self, global_settings: dict) -> AlertDispatcher:
+        """Приймачі з global_settings.alert_sinks (типово - канал notification_user_id)
+
+        Якщо політика ескалації задає escalate_to, додається приймач Telegram
+        лише для ескалацій у цей чат.
+        """
+        policy = EscalationPolicy.from_dict(global_settings.get("escalation"))
+        return AlertDispatcher.from_settings(
+            global_settings.get("alert_sinks"),
+            self.outbox.put,
+            lambda: self.notification_chat_id,
+            escalate_to=policy.escalate_to if policy.enabled else None,
+        )
+
+    def replace_alert_dispatcher(self, alerts: Optional[AlertDispatcher] = None):
+        """Перемикає розсилку на нові приймачі, старі дорозсилають чергу у фоні"""
+        old = self.alerts
+        self.alerts = alerts or self.build_alert_dispatcher(self.config["global_settings"])
+        if not old.running:
+            return
+        self.alerts.start()
+
+        async def retire():
+            try:
+                await asyncio.wait_for(old.drain(), timeout=30)
+            except asyncio.TimeoutError:
+                logger.warning("Старі приймачі сповіщень не встигли дорозіслати чергу")
+            finally:
+                await old.stop()
+
+        task = asyncio.create_task(retire())
+        self._retiring_alerts.add(task)
+        task.add_done_callback(self._retiring_alerts.discard)
+        logger.info(f"Приймачі сповіщень: {', '.join(sink.name for sink in self.alerts.sinks)}")
+
+    def notify(self, alert: Alert) -> asyncio.Future:
+        """Ставить сповіщення в черги приймачів, повертає Future[bool] доставки хоча б одним"""
+        return self.alerts.dispatch(alert)
+
     async def call_api_reboot(self, group: GroupConfig) -> bool:
         """Викликає API для перезапуску"""
         if not group.api_reboot.enabled or not group.api_reboot.url:
@@ -324,8 +970,273 @@ class TelegramMultiMonitor:
             )
             return False
 
+    def open_incident_store(self):
+        try:
+            self.incidents.open()
+        except Exception as e:
+            logger.error(f"Помилка відкриття журналу інцидентів: {e}")
+
+    def record_incident(
+        self, group: GroupConfig, started_at: float, threshold_minutes: int
+    ) -> Optional[int]:
+        """Відкриває інцидент неактивності, повертає його id"""
+        if not self.incidents.is_open:
+            return None
+        try:
+            return self.incidents.open_incident(
+                group.chat_id, group.name, started_at, threshold_minutes
+            )
+        except Exception as e:
+            logger.error(f"Помилка запису інциденту для групи '{group.name}': {e}")
+            return None
+
+    def record_alert_delivery(self, incident_id: Optional[int], chat_id: int, success: bool):
+        """Записує результат доставки сповіщення про неактивність"""
+        if not self.incidents.is_open:
+            return
+        try:
+            self.incidents.record_alert(incident_id, chat_id, success)
+        except Exception as e:
+            logger.error(f"Помилка запису доставки сповіщення для чату {chat_id}: {e}")
+
+    def record_reboot_outcome(self, group: GroupConfig, success: bool, manual: bool = False):
+        """Записує результат виклику API reboot в журнал інцидентів"""
+        if not self.incidents.is_open:
+            return
+        try:
+            self.incidents.record_reboot(
+                group.chat_id,
+                success,
+                manual=manual,
+                detail=f"{group.api_reboot.method} {group.api_reboot.url}",
+            )
+        except Exception as e:
+            logger.error(f"Помилка запису reboot для групи '{group.name}': {e}")
+
+    def resolve_incident(self, chat_id: int, resolved_at: float = None):
+        """Закриває відкритий інцидент групи після відновлення активності"""
+        self.escalations.stop(chat_id)
+        if not self.incidents.is_open:
+            return
+        try:
+            self.incidents.resolve(chat_id, resolved_at)
+        except Exception as e:
+            logger.error(f"Помилка закриття інциденту для чату {chat_id}: {e}")
+
+    def start_escalation(self, chat_id: int, incident_id: Optional[int]):
+        """Ставить нагадування та ескалацію інциденту на колесо таймерів"""
+        if self.escalations.policy.enabled:
+            self.escalations.start(chat_id, incident_id, self.clock())
+
+    def record_escalation_event(
+        self, escalation: Escalation, kind: str, success: bool = True, detail: str = None
+    ):
+        if not self.incidents.is_open:
+            return
+        try:
+            self.incidents.record_event(
+                escalation.chat_id, kind, success, detail, escalation.incident_id
+            )
+        except Exception as e:
+            logger.error(f"Помилка запису події '{kind}' для чату {escalation.chat_id}: {e}")
+
+    def acknowledge_incident(self, chat_id: int, by: str) -> bool:
+        """Підтверджує інцидент: нагадування та ескалація зупиняються до відновлення"""
+        escalation = self.escalations.stop(chat_id)
+        if escalation is None:
+            return False
+        if self.incidents.is_open:
+            # Підтвердження зберігається, тож після перезапуску нагадування не поновлюються
+            try:
+                self.incidents.acknowledge(chat_id, by, escalation.incident_id)
+            except Exception as e:
+                logger.error(f"Помилка запису підтвердження для чату {chat_id}: {e}")
+        group = self.get_registry().get(chat_id)
+        logger.info(f"Інцидент групи '{group.name if group else chat_id}' підтверджено ({by})")
+        return True
+
+    def escalation_values(self, group: GroupConfig) -> Dict:
+        last_seen = self.state.last_seen_of(group.chat_id)
+        return {
+            "minutes_inactive": int((self.clock() - last_seen) // 60),
+            "timeout": self.get_current_timeout_for_group(group),
+            "now": datetime.now(self.timezone).strftime("%d.%m.%Y %H:%M:%S"),
+        }
+
+    def send_reminder(self, group: GroupConfig, escalation: Escalation) -> asyncio.Future:
+        """Ставить у чергу нагадування про неактивну групу без підтвердження"""
+        values = self.escalation_values(group)
+        message = self.templates.render_group(
+            "inactivity_reminder",
+            group.chat_id,
+            lambda: self.group_template_fields(group),
+            {**values, "reminder": escalation.reminders},
+        )
+        delivery = self.notify(
+            Alert(
+                kind="reminder",
+                text=message,
+                chat_id=group.chat_id,
+                group_name=group.name,
+                data={
+                    "reminder": escalation.reminders,
+                    "minutes_inactive": values["minutes_inactive"],
+                },
+            )
+        )
+        reminder = escalation.reminders
+        self.when_delivered(
+            delivery,
+            lambda ok: self.record_escalation_event(escalation, "reminder", ok, f"#{reminder}"),
+        )
+        logger.info(f"Нагадування #{escalation.reminders} для групи '{group.name}'")
+        return delivery
+
+    def send_escalation(self, group: GroupConfig, escalation: Escalation) -> asyncio.Future:
+        """Ескалює непідтверджений інцидент другому отримувачу
+
+        Ескалацію отримує приймач escalate_to і лише ті приймачі, що явно
+        перелічують "escalation" у kinds; основний канал її не дублює.
+        """
+        destination = self.escalations.policy.escalate_to
+        values = self.escalation_values(group)
+        message = self.templates.render_group(
+            "inactivity_escalation",
+            group.chat_id,
+            lambda: self.group_template_fields(group),
+            {**values, "reminders": escalation.reminders},
+        )
+        delivery = self.notify(
+            Alert(
+                kind="escalation",
+                text=message,
+                chat_id=group.chat_id,
+                group_name=group.name,
+                data={"escalate_to": destination, "minutes_inactive": values["minutes_inactive"]},
+            )
+        )
+        self.when_delivered(
+            delivery,
+            lambda ok: self.record_escalation_event(
+                escalation, "escalation", ok, str(destination)
+            ),
+        )
+        logger.warning(f"Інцидент групи '{group.name}' ескальовано до {destination}")
+        return delivery
+
+    async def run_escalations(self):
+        """Фоновий цикл колеса таймерів: обробляє лише інциденти, чий час настав"""
+        while True:
+            await asyncio.sleep(self.escalations.policy.tick_seconds)
+            try:
+                registry = self.get_registry()
+                for kind, escalation in self.escalations.advance(self.clock()):
+                    chat_id = escalation.chat_id
+                    group = registry.enabled_by_chat_id.get(chat_id)
+                    # Активність знімає ескалацію сама (resolve_incident)
+                    if group is None:
+                        self.escalations.stop(chat_id)
+                        continue
+                    if kind == REMINDER:
+                        self.send_reminder(group, escalation)
+                    else:
+                        self.send_escalation(group, escalation)
+            except Exception as e:
+                logger.error(f"Помилка обробки ескалацій: {e}")
+
+    def get_last_message_time(self, chat_id: int) -> Optional[datetime]:
+        """Повертає час останнього повідомлення групи в локальній часовій зоні"""
+        last_seen = self.state.last_seen_of(chat_id)
+        if last_seen is None:
+            return None
+        return self.clock.to_local(last_seen, self.timezone)
+
+    def register_group_state(self, group: GroupConfig):
+        """Реєструє групу в сховищі стану з її денним/нічним порогами"""
+        self.state.add(
+            group.chat_id,
+            group.monitoring.day_inactive_minutes * 60,
+            group.monitoring.night_inactive_minutes * 60,
+        )
+        self.state.set_threshold(
+            group.chat_id, self.get_current_timeout_for_group(group) * 60
+        )
+        self.activity.add(group.chat_id)
+
+        adaptive = group.monitoring.adaptive
+        if adaptive is not None:
+            quantiles = self.gap_quantiles.get(group.chat_id)
+            if quantiles is None or quantiles.p != adaptive.quantile:
+                self.gap_quantiles[group.chat_id] = GapQuantiles(adaptive.quantile)
+
+    @staticmethod
+    def has_custom_threshold(group: GroupConfig) -> bool:
+        """Чи визначається поріг групи не лише денним/нічним режимом"""
+        return (
+            group.monitoring.schedule is not None
+            or group.monitoring.adaptive is not None
+        )
+
+    def arm_group_deadline(self, group: GroupConfig, current_time: datetime = None):
+        """Встановлює дедлайн неактивності групи в планувальнику"""
+        last_seen = self.state.last_seen_of(group.chat_id)
+        if last_seen is None:
+            return
+        timeout_minutes = self.get_current_timeout_for_group(group, current_time)
+        self.state.set_threshold(group.chat_id, timeout_minutes * 60)
+        deadline = last_seen + timeout_minutes * 60
+
+        # Для календарного розкладу поріг може змінитися раніше за дедлайн
+        schedule = group.monitoring.schedule
+        if schedule is not None:
+            now = current_time or datetime.now(self.timezone)
+            next_change = self.clock.from_wall(schedule.next_change(now).timestamp())
+            deadline = min(deadline, next_change)
+
+        self.scheduler.arm(group.chat_id, deadline)
+
+    def rearm_all_groups(
+        self,
+        groups_by_id: Dict[int, GroupConfig],
+        current_time: datetime,
+        period_name: str,
+    ):
+        """Переозброює дедлайни всіх груп після зміни порогів (векторно)"""
+        self.state.apply_period(self.is_night_time(current_time))
+        scheduled_groups = [
+            group for group in groups_by_id.values() if self.has_custom_threshold(group)
+        ]
+        # Календарні та адаптивні групи отримують поріг з власного розкладу
+        for group in scheduled_groups:
+            if group.chat_id in self.state:
+                self.state.set_threshold(
+                    group.chat_id,
+                    self.get_current_timeout_for_group(group, current_time) * 60,
+                )
+
+        # Скидаємо флаги груп, які за новим порогом вже не прострочені, щоб
+        # сповіщення знову спрацювало за новим порогом. Повідомлень не було,
+        # тож інцидент і його ескалація лишаються відкритими до активності
+        _, restored = self.state.evaluate(self.clock())
+        for chat_id in self.state.chat_ids_at(restored):
+            group = groups_by_id.get(chat_id)
+            logger.info(
+                f"Група '{group.name if group else chat_id}' в межах нового порогу "
+                f"({period_name}), інцидент лишається відкритим"
+            )
+        self.state.clear_flags(restored)
+
+        chat_ids, deadlines = self.state.deadlines()
+        self.scheduler.arm_many(zip(chat_ids.tolist(), deadlines.tolist()))
+        for group in scheduled_groups:
+            self.arm_group_deadline(group, current_time)
+
     async def check_inactivity(self):
-        """Перевіряє неактивність у всіх чатах з урахуванням день/ніч режимів"""
+        """Перевіряє неактивність у всіх чатах з урахуванням день/ніч режимів
+
+        Замість періодичного обходу всіх груп цикл спить до найближчого
+        дедлайну в планувальнику і перевіряє лише ті групи, чий час настав.
+        """
         enabled_groups = self.get_enabled_groups()
 
         logger.info(
@@ -336,11 +1247,13 @@ class TelegramMultiMonitor:
 
         while True:
             try:
+                # Реєстр читається щоразу, тож застосована конфігурація діє одразу
+                groups_by_id = self.get_registry().enabled_by_chat_id
                 current_time = datetime.now(self.timezone)
-                is_night = self.is_night_time(current_time)
+                is_night = self.is_night_time()
                 period_name = self.get_time_period_name()
 
-                # Логуємо зміну періоду
+                # Логуємо зміну періоду та переозброюємо дедлайни з новими порогами
                 if (
                     not hasattr(self, "_last_period_night")
                     or self._last_period_night != is_night
@@ -349,148 +1262,324 @@ class TelegramMultiMonitor:
                         f"Перехід на {period_name} режим о {current_time.strftime('%H:%M:%S')}"
                     )
                     self._last_period_night = is_night
+                    self.rearm_all_groups(groups_by_id, current_time, period_name)
 
-                for group in enabled_groups:
-                    chat_id = group.chat_id
+                now = self.clock()
+                for chat_id in self.scheduler.pop_due(now):
+                    group = groups_by_id.get(chat_id)
+                    if group is None:
+                        continue
 
                     # Перевіряємо чи є доступ до чату
-                    if not self.chat_accessible.get(chat_id, False):
+                    if not self.state.is_accessible(chat_id):
                         continue
 
-                    if chat_id not in self.last_message_time:
+                    last_seen = self.state.last_seen_of(chat_id)
+                    if last_seen is None:
                         continue
 
-                    last_time = self.last_message_time[chat_id]
-                    time_diff = current_time - last_time
+                    time_diff = timedelta(seconds=now - last_seen)
 
                     # Отримуємо поточний таймаут для цієї групи
-                    current_timeout_minutes = self.get_current_timeout_for_group(group)
+                    current_timeout_minutes = self.get_current_timeout_for_group(
+                        group, current_time
+                    )
                     timeout_threshold = timedelta(minutes=current_timeout_minutes)
 
-                    # Якщо пройшло більше встановленого часу для цієї групи
-                    if time_diff > timeout_threshold:
-                        # Відправляємо сповіщення (якщо ще не відправляли)
-                        if not self.notification_sent.get(chat_id, False):
-                            await self.send_inactivity_notification(
-                                group, time_diff, is_night, current_timeout_minutes
-                            )
-                            self.notification_sent[chat_id] = True
-
-                        # Викликаємо API reboot (якщо ще не викликали і включено)
-                        if group.api_reboot.enabled and not self.api_reboot_sent.get(
-                            chat_id, False
-                        ):
-                            if await self.call_api_reboot(group):
-                                self.api_reboot_sent[chat_id] = True
-                                await self.send_api_reboot_notification(
-                                    group, is_night, current_timeout_minutes
-                                )
-
-                    # Скидаємо флаги при поновленні активності або зміні періоду
-                    else:
-                        if self.notification_sent.get(
-                            chat_id, False
-                        ) or self.api_reboot_sent.get(chat_id, False):
-                            logger.info(
-                                f"Активність відновлена в групі '{group.name}' ({period_name})"
-                            )
-                        self.notification_sent[chat_id] = False
-                        self.api_reboot_sent[chat_id] = False
+                    # Поріг міг зрости після зміни періоду - переносимо дедлайн
+                    if time_diff <= timeout_threshold:
+                        self.arm_group_deadline(group, current_time)
+                        continue
+
+                    # Відправляємо сповіщення (якщо ще не відправляли)
+                    # Сповіщення лише ставиться в чергу - доставка йде у фоні
+                    if not self.state.is_alerted(chat_id):
+                        delivery = self.send_inactivity_notification(
+                            group, time_diff, is_night, current_timeout_minutes
+                        )
+                        self.state.set_alerted(chat_id)
+                        incident_id = self.record_incident(
+                            group, self.clock.to_wall(last_seen), current_timeout_minutes
+                        )
+                        self.start_escalation(chat_id, incident_id)
+                        self.when_delivered(
+                            delivery,
+                            lambda ok, chat_id=chat_id, incident_id=incident_id: (
+                                self.record_alert_delivery(incident_id, chat_id, ok)
+                            ),
+                        )
+
+                    # Викликаємо API reboot у фоновій задачі (якщо ще не викликали)
+                    if group.api_reboot.enabled and not self.state.is_rebooted(chat_id):
+                        self.start_reboot(group, is_night, current_timeout_minutes)
 
             except Exception as e:
                 logger.error(f"Помилка при перевірці неактивності: {e}")
 
-            # Чекаємо глобальний інтервал
+            # Чекаємо найближчий дедлайн або перемикання день/ніч
+            await self.scheduler.wait(
+                self.clock(),
+                max_delay=max(0.0, self._next_transition_ts - time_module.time()),
+            )
+
+    def start_reboot(self, group: GroupConfig, is_night: bool, current_timeout: int):
+        """Запускає API reboot групи фоновою задачею (не більше одного одночасно)"""
+        task = self._reboot_tasks.get(group.chat_id)
+        if task is not None and not task.done():
+            return
+        self._reboot_tasks[group.chat_id] = asyncio.create_task(
+            self.run_reboot(group, is_night, current_timeout)
+        )
+
+    async def run_reboot(self, group: GroupConfig, is_night: bool, current_timeout: int):
+        chat_id = group.chat_id
+        silence_started = self.state.last_seen_of(chat_id)
+        rebooted = await self.call_api_reboot(group)
+        self.record_reboot_outcome(group, rebooted)
+
+        if self.state.last_seen_of(chat_id) != silence_started:
+            # Поки йшов виклик, у групі з'явились повідомлення
+            return
+        if rebooted:
+            self.state.set_rebooted(chat_id)
+            self.send_api_reboot_notification(group, is_night, current_timeout)
+        else:
+            # Повторюємо спробу reboot через інтервал перевірки
             check_interval = self.config["global_settings"]["check_interval_seconds"]
-            await asyncio.sleep(check_interval)
+            self.scheduler.arm(chat_id, self.clock() + check_interval)
 
-    async def send_inactivity_notification(
+    def send_inactivity_notification(
         self,
         group: GroupConfig,
         time_diff: timedelta,
         is_night: bool,
         current_timeout: int,
-    ):
-        """Відправляє сповіщення про неактивність з інформацією про день/ніч"""
+    ) -> asyncio.Future:
+        """Ставить у чергу сповіщення про неактивність з інформацією про день/ніч
+
+        Повертає Future[bool] з результатом доставки.
+        """
         minutes_inactive = int(time_diff.total_seconds() // 60)
         period_icon = "🌙" if is_night else "☀️"
-        period_name = "Нічний" if is_night else "Денний"
-
-        message = (
-            f"⚠️ **УВАГА: Неактивність у групі!**\n\n"
-            f"📱 Група: {group.name}\n"
-            f"📝 Опис: {group.description}\n"
-            f"🆔 ID: `{group.chat_id}`\n"
-            f"⏰ Останнє повідомлення: {self.last_message_time[group.chat_id].strftime('%H:%M:%S')}\n"
-            f"🕐 Час неактивності: {minutes_inactive} хвилин\n"
-            f"{period_icon} Режим: {period_name}\n"
-            f"⏳ Поріг ({period_name.lower()}): {current_timeout} хвилин\n"
-            f"📊 Налаштування: День {group.monitoring.day_inactive_minutes}хв / Ніч {group.monitoring.night_inactive_minutes}хв\n"
-            f"📅 Дата: {datetime.now(self.timezone).strftime('%d.%m.%Y %H:%M:%S')}\n"
-            f"🔄 API Reboot: {'Увімкнено' if group.api_reboot.enabled else 'Вимкнено'}"
-        )
-
-        await self.send_notification(message)
-        logger.info(
-            f"Відправлено сповіщення про неактивність для групи '{group.name}' ({period_name} режим: {current_timeout} хв)"
+        period_name = self.period_name(is_night)
+
+        message = self.templates.render_group(
+            "inactivity_alert",
+            group.chat_id,
+            lambda: self.group_template_fields(group),
+            {
+                "last_seen": self.get_last_message_time(group.chat_id).strftime("%H:%M:%S"),
+                "minutes_inactive": minutes_inactive,
+                "period_icon": period_icon,
+                "period_name": period_name,
+                "period_name_lower": period_name.lower(),
+                "timeout": current_timeout,
+                "now": datetime.now(self.timezone).strftime("%d.%m.%Y %H:%M:%S"),
+            },
         )
 
-    async def send_api_reboot_notification(
+        delivery = self.notify(
+            Alert(
+                kind="inactivity",
+                text=message,
+                chat_id=group.chat_id,
+                group_name=group.name,
+                data={
+                    "minutes_inactive": minutes_inactive,
+                    "threshold_minutes": current_timeout,
+                    "night": is_night,
+                },
+            )
+        )
+        logger.info(
+            f"Сповіщення про неактивність для групи '{group.name}' поставлено в чергу "
+            f"({period_name} режим: {current_timeout} хв)"
+        )
+        self.when_delivered(
+            delivery, lambda ok: self.log_delivery(ok, "про неактивність", group.name)
+        )
+        return delivery
+
+    def period_name(self, is_night: bool) -> str:
+        return self.templates.word("night" if is_night else "day")
+
+    def group_template_fields(self, group: GroupConfig) -> Dict:
+        """Статичні поля групи для шаблонів (кешуються до зміни конфігурації)"""
+        words = self.templates.words
+        api = group.api_reboot
+        return {
+            "name": group.name,
+            "description": group.description,
+            "chat_id": group.chat_id,
+            "day_minutes": group.monitoring.day_inactive_minutes,
+            "night_minutes": group.monitoring.night_inactive_minutes,
+            "api_status": words["enabled"] if api.enabled else words["disabled"],
+            "api_icon": "🔄" if api.enabled else "❌",
+            "api_url": api.url,
+            "api_method": api.method,
+            "api_headers": list(api.headers.keys()) if api.headers else words["none"],
+            "api_answer": words["yes"] if api.enabled else words["no"],
+            "status_icon": "✅" if group.monitoring.enabled else "⏸️",
+            "monitoring": words["active"] if group.monitoring.enabled else words["paused"],
+            "state": words["no_data"] if group.monitoring.enabled else words["disabled"],
+        }
+
+    def send_api_reboot_notification(
         self, group: GroupConfig, is_night: bool, current_timeout: int
-    ):
-        """Відправляє сповіщення про виклик API reboot"""
-        period_icon = "🌙" if is_night else "☀️"
-        period_name = "Нічний" if is_night else "Денний"
+    ) -> asyncio.Future:
+        """Ставить у чергу сповіщення про виклик API reboot"""
+        period_name = self.period_name(is_night)
+        message = self.templates.render_group(
+            "reboot_alert",
+            group.chat_id,
+            lambda: self.group_template_fields(group),
+            {
+                "period_icon": "🌙" if is_night else "☀️",
+                "period_name": period_name,
+                "timeout": current_timeout,
+                "now": datetime.now(self.timezone).strftime("%H:%M:%S %d.%m.%Y"),
+            },
+        )
 
-        message = (
-            f"🔄 **API REBOOT ВИКЛИКАНО**\n\n"
-            f"📱 Група: {group.name}\n"
-            f"🆔 ID: `{group.chat_id}`\n"
-            f"{period_icon} Режим: {period_name}\n"
-            f"⏳ Поріг неактивності: {current_timeout} хвилин\n"
-            f"🌐 URL: {group.api_reboot.url}\n"
-            f"📡 Метод: {group.api_reboot.method}\n"
-            f"🔑 Headers: {list(group.api_reboot.headers.keys()) if group.api_reboot.headers else 'Немає'}\n"
-            f"⏰ Час: {datetime.now(self.timezone).strftime('%H:%M:%S %d.%m.%Y')}"
+        delivery = self.notify(
+            Alert(
+                kind="reboot",
+                text=message,
+                chat_id=group.chat_id,
+                group_name=group.name,
+                data={"threshold_minutes": current_timeout, "night": is_night},
+            )
+        )
+        logger.info(
+            f"Сповіщення про API reboot для групи '{group.name}' поставлено в чергу "
+            f"({period_name} режим)"
+        )
+        self.when_delivered(
+            delivery, lambda ok: self.log_delivery(ok, "про API reboot", group.name)
         )
+        return delivery
+
+    @staticmethod
+    def when_delivered(delivery: asyncio.Future, callback):
+        """Викликає callback(ok) після доставки; скасовану при зупинці доставку пропускає"""
+
+        def done(future: asyncio.Future):
+            if future.cancelled():
+                return
+            callback(future.exception() is None and bool(future.result()))
+
+        delivery.add_done_callback(done)
+
+    @staticmethod
+    def log_delivery(ok: bool, what: str, group_name: str):
+        """Логує фактичний результат доставки сповіщення з черги"""
+        if ok:
+            logger.info(f"Доставлено сповіщення {what} для групи '{group_name}'")
+        else:
+            logger.error(f"Не вдалося доставити сповіщення {what} для групи '{group_name}'")
+
+    def record_message(self, chat_id: int) -> Optional[GroupConfig]:
+        """Швидкий шлях обробки повідомлення: час, лічильник, дедлайн
+
+        Лише пошук у словнику, запис числового часу в масив стану та
+        переозброєння дедлайну - без datetime, strptime та логування.
+        """
+        group = self.get_registry().by_chat_id.get(chat_id)
+        slot = self.state.slot_of(chat_id)
+        if group is None or slot is None:
+            return None
+
+        if (
+            self.state.is_alerted(chat_id)
+            or self.state.is_rebooted(chat_id)
+            or self.incidents.has_open(chat_id)
+            or chat_id in self.escalations
+        ):
+            logger.info(f"Активність відновлена в групі '{group.name}'")
+            self.resolve_incident(chat_id)
+
+        # Оновлюємо час останнього повідомлення та скидаємо флаги
+        now = self.clock()
+        quantiles = self.gap_quantiles.get(chat_id)
+        if quantiles is not None:
+            # Інтервал відносимо до години тижня, в яку почалась тиша
+            previous = self.state.last_seen[slot]
+            if previous == previous:  # не NaN
+                quantiles.observe(
+                    self.local_hour_of_week(self.clock.to_wall(previous)),
+                    now - previous,
+                )
+        self.state.touch(chat_id, now)
+        self.activity.record(chat_id, time_module.time())
+        self.messages_total += 1
+
+        # Переносимо дедлайн неактивності групи
+        if not self.has_custom_threshold(group):
+            self.scheduler.arm(chat_id, now + float(self.state.threshold[slot]))
+        else:
+            self.arm_group_deadline(group)
+        return group
+
+    def activity_sparkline(self, chat_id: int, minutes: int = 60, bucket: int = 5) -> str:
+        """Спарклайн кількості повідомлень групи за останні minutes хвилин"""
+        series = self.activity.series(chat_id, time_module.time(), minutes)
+        if series is None:
+            return ""
+        counts = resample(series, bucket)
+        return f"{sparkline(counts)} {int(series.sum())} повід./{minutes} хв"
+
+    def should_log_message(self, chat_id: int) -> bool:
+        """Чи логувати повідомлення (логування вибіркове і за замовчуванням вимкнене)"""
+        sample_every = self.message_log_sample_every
+        if not sample_every or not logger.isEnabledFor(logging.INFO):
+            return False
+        return self.state.message_count_of(chat_id) % sample_every == 0
+
+    async def get_sender_name(self, event) -> str:
+        """Повертає ім'я відправника з кешу, звертаючись до API лише при промаху"""
+        sender_id = event.sender_id
+        if sender_id is None:
+            return "Невідомий"
+
+        sender_name = self.sender_cache.get(sender_id)
+        if sender_name is None:
+            # event.sender вже заповнений з сутностей апдейту, якщо вони були
+            sender = event.sender or await self.call_respecting_flood(
+                event.get_sender, f"отриманні відправника {sender_id}"
+            )
+            sender_name = SenderCache.display_name(sender)
+            self.sender_cache.put(sender_id, sender_name)
+        return sender_name
+
+    async def log_message(self, event, group: GroupConfig):
+        """Логує повідомлення з іменем відправника"""
+        sender_name = await self.get_sender_name(event)
 
-        await self.send_notification(message)
+        period_name = self.get_time_period_name()
+        current_time = datetime.now(self.timezone)
         logger.info(
-            f"Відправлено сповіщення про API reboot для групи '{group.name}' ({period_name} режим)"
+            f"Повідомлення від {sender_name} у групі '{group.name}' о {current_time.strftime('%H:%M:%S')} ({period_name})"
         )
 
     def setup_event_handlers(self):
         """Налаштовує обробники подій"""
-        enabled_groups = self.get_enabled_groups()
-        monitored_chat_ids = [group.chat_id for group in enabled_groups]
+        # InputPeer з кешу не потребує get_input_entity при побудові фільтра
+        monitored_chats = [
+            self.entity_cache.input_peer(group.chat_id) or group.chat_id
+            for group in self.get_enabled_groups()
+        ]
 
-        logger.info(f"Налаштовую обробники для {len(monitored_chat_ids)} активних груп")
+        logger.info(f"Налаштовую обробники для {len(monitored_chats)} активних груп")
 
-        @self.client.on(events.NewMessage(chats=monitored_chat_ids))
+        self.message_builder = events.NewMessage(chats=monitored_chats)
+
+        @self.client.on(self.message_builder)
         async def handle_monitored_message(event):
             """Обробляє повідомлення у відстежуваних чатах"""
             try:
-                chat_id = event.chat_id
-                current_time = datetime.now(self.timezone)
-
-                # Оновлюємо час останнього повідомлення
-                self.last_message_time[chat_id] = current_time
-
-                # Скидаємо флаги
-                self.notification_sent[chat_id] = False
-                self.api_reboot_sent[chat_id] = False
-
-                # Знаходимо групу та її налаштування
-                group = next((g for g in enabled_groups if g.chat_id == chat_id), None)
-                group_name = group.name if group else f"Group {chat_id}"
-
-                sender = await event.get_sender()
-                sender_name = getattr(sender, "first_name", "Невідомий")
-
-                period_name = self.get_time_period_name()
-                logger.info(
-                    f"Повідомлення від {sender_name} у групі '{group_name}' о {current_time.strftime('%H:%M:%S')} ({period_name})"
-                )
+                group = self.record_message(event.chat_id)
+                if group is not None and self.should_log_message(group.chat_id):
+                    await self.log_message(event, group)
 
             except Exception as e:
                 logger.error(f"Помилка при обробці повідомлення: {e}")
@@ -502,8 +1591,8 @@ class TelegramMultiMonitor:
                 text = event.text.lower().strip() if event.text else ""
 
                 if event.text == "HI":
-                    await event.edit("ПРИВІТИК!!!!")
-                elif text == "/status":
+                    await self.reply(event, "ПРИВІТИК!!!!")
+                elif text == "/status" or text.startswith("/status "):
                     await self.handle_status_command(event)
                 elif text == "/test":
                     await self.handle_test_command(event)
@@ -511,7 +1600,9 @@ class TelegramMultiMonitor:
                     await self.handle_reload_command(event)
                 elif text.startswith("/reboot"):
                     await self.handle_manual_reboot_command(event)
-                elif text == "/groups":
+                elif text == "/ack" or text.startswith("/ack "):
+                    await self.handle_ack_command(event)
+                elif text == "/groups" or text.startswith("/groups "):
                     await self.handle_groups_command(event)
                 elif text == "/time":
                     await self.handle_time_command(event)
@@ -519,280 +1610,518 @@ class TelegramMultiMonitor:
             except Exception as e:
                 logger.error(f"Помилка при обробці вихідного повідомлення: {e}")
 
+        @self.client.on(
+            events.NewMessage(incoming=True, pattern=r"(?i)^/ack(\s|$)", func=self.is_ack_chat)
+        )
+        async def handle_incoming_ack(event):
+            """/ack від отримувачів сповіщень та ескалацій"""
+            try:
+                await self.handle_ack_command(event)
+            except Exception as e:
+                logger.error(f"Помилка при обробці /ack з чату {event.chat_id}: {e}")
+
+    def is_ack_chat(self, event) -> bool:
+        """Чи надійшло повідомлення з чату сповіщень або з чату ескалації"""
+        for destination in (self.notification_chat_id, self.escalations.policy.escalate_to):
+            if destination is None:
+                continue
+            if isinstance(destination, str):
+                destination = destination.strip().strip('"').strip("'")
+                if not destination.lstrip("-").isdigit():
+                    # @username: порівнюємо з чатом, якщо Telethon уже знає його сутність
+                    username = getattr(event.chat, "username", None)
+                    if username and username.lower() == destination.lstrip("@").lower():
+                        return True
+                    continue
+                destination = int(destination)
+            if event.chat_id == destination:
+                return True
+        return False
+
     async def handle_time_command(self, event):
         """Показує поточний час та налаштування день/ніч"""
         current_time = datetime.now(self.timezone)
-        is_night = self.is_night_time(current_time)
+        is_night = self.is_night_time()
         night_hours = self.get_night_hours()
 
-        period_icon = "🌙" if is_night else "☀️"
-        period_name = "Нічний" if is_night else "Денний"
+        groups = "".join(
+            self.templates.render_group(
+                "time_group",
+                group.chat_id,
+                lambda group=group: self.group_template_fields(group),
+                {"timeout": self.get_current_timeout_for_group(group)},
+            )
+            for group in self.get_enabled_groups()
+        )
+        message = self.templates.render(
+            "time",
+            {
+                "now": current_time.strftime("%d.%m.%Y %H:%M:%S"),
+                "timezone": self.timezone,
+                "period_icon": "🌙" if is_night else "☀️",
+                "period_name": self.period_name(is_night),
+                "night_start": night_hours.start,
+                "night_end": night_hours.end,
+                "groups": groups,
+            },
+        )
+        await self.reply(event, message)
+
+    @staticmethod
+    def parse_listing_query(args: List[str]) -> ListingQuery:
+        """Розбирає аргументи /status і /groups: overdue, tag:назва, page N"""
+        query = ListingQuery()
+        args = list(args)
+        while args:
+            arg = args.pop(0).lower()
+            if arg == "overdue":
+                query.overdue = True
+            elif arg.startswith("tag:") and len(arg) > 4:
+                query.tag = arg[4:]
+            elif arg == "page" and args and args[0].isdigit():
+                query.page = max(1, int(args.pop(0)))
+            else:
+                raise ValueError(f"Невідомий аргумент: {arg}")
+        return query
 
-        message = (
-            f"🕐 **Поточний час та налаштування:**\n\n"
-            f"📅 Дата і час: {current_time.strftime('%d.%m.%Y %H:%M:%S')}\n"
-            f"🌍 Часова зона: {self.timezone}\n"
-            f"{period_icon} Поточний режим: {period_name}\n\n"
-            f"🌙 Нічні години: {night_hours.start} - {night_hours.end}\n"
-            f"☀️ Денні години: решта часу\n\n"
-            f"**Поточні таймаути для груп:**\n"
+    def is_group_overdue(self, group: GroupConfig, now: float) -> bool:
+        """Чи перевищила група поточний поріг неактивності"""
+        if not group.monitoring.enabled:
+            return False
+        last_seen = self.state.last_seen_of(group.chat_id)
+        if last_seen is None:
+            return False
+        # Та сама умова, що й у check_inactivity: строго більше за поріг
+        return now - last_seen > self.get_current_timeout_for_group(group) * 60
+
+    def select_groups(self, query: ListingQuery) -> List[GroupConfig]:
+        """Групи, що відповідають фільтру (тег береться з індексу реєстру)"""
+        registry = self.get_registry()
+        groups = registry.with_tag(query.tag) if query.tag else registry.groups
+        if query.overdue:
+            now = self.clock()
+            groups = [group for group in groups if self.is_group_overdue(group, now)]
+        return groups
+
+    def page_of(self, groups: List[GroupConfig], page: int):
+        """Повертає (зріз сторінки, номер першого елемента, сторінка, всього сторінок)"""
+        page_size = max(1, self.config["global_settings"].get("status_page_size", 20))
+        pages = max(1, math.ceil(len(groups) / page_size))
+        page = min(page, pages)
+        start = (page - 1) * page_size
+        return groups[start : start + page_size], start, page, pages
+
+    def describe_listing(
+        self, command: str, query: ListingQuery, found: int, page: int, pages: int
+    ) -> str:
+        """Рядок з фільтром, кількістю та підказкою наступної сторінки"""
+        filters = []
+        if query.overdue:
+            filters.append("overdue")
+        if query.tag:
+            filters.append(f"tag:{query.tag}")
+        return self.templates.render(
+            "listing",
+            {
+                "page": page,
+                "pages": pages,
+                "found": found,
+                "filter": self.templates.render("listing_filter", {"filters": " ".join(filters)})
+                if filters
+                else "",
+                "next": self.templates.render(
+                    "listing_next",
+                    {"command": " ".join([command, *filters, "page", str(page + 1)])},
+                )
+                if page < pages
+                else "",
+            },
         )
 
-        enabled_groups = self.get_enabled_groups()
-        for group in enabled_groups:
-            current_timeout = self.get_current_timeout_for_group(group)
-            day_timeout = group.monitoring.day_inactive_minutes
-            night_timeout = group.monitoring.night_inactive_minutes
+    def format_status_entry(self, group: GroupConfig, period_name: str, now: float) -> str:
+        """Блок /status для однієї групи"""
+        chat_id = group.chat_id
+        static = lambda: self.group_template_fields(group)  # noqa: E731
 
-            message += (
-                f"📱 {group.name}: {current_timeout} хв "
-                f"(День: {day_timeout}хв / Ніч: {night_timeout}хв)\n"
-            )
+        last_time = self.get_last_message_time(chat_id)
+        if last_time is not None and group.monitoring.enabled:
+            minutes_inactive = int((now - self.state.last_seen_of(chat_id)) // 60)
 
-        await event.edit(message)
+            # Отримуємо поточний таймаут
+            current_timeout = self.get_current_timeout_for_group(group)
 
-    async def handle_status_command(self, event):
-        """Обробляє команду /status з інформацією про день/ніч"""
-        all_groups = self.get_groups()
-        enabled_groups = self.get_enabled_groups()
-        current_time = datetime.now(self.timezone)
-        is_night = self.is_night_time(current_time)
-        period_icon = "🌙" if is_night else "☀️"
-        period_name = "Нічний" if is_night else "Денний"
+            # Визначаємо стан на основі поточного порогу
+            is_overdue = minutes_inactive >= current_timeout
+            words = self.templates.words
 
-        status_lines = [
-            f"📊 **Статус моніторингу:** {len(enabled_groups)}/{len(all_groups)} груп активні\n"
-            f"{period_icon} **Поточний режим:** {period_name}\n"
-        ]
+            reboot_status = "N/A"
+            if group.api_reboot.enabled:
+                reboot_status = (
+                    words["reboot_called"]
+                    if self.state.is_rebooted(chat_id)
+                    else words["reboot_waiting"]
+                )
 
-        for group in all_groups:
-            chat_id = group.chat_id
-            status_icon = "✅" if group.monitoring.enabled else "⏸️"
+            return self.templates.render_group(
+                "status_active",
+                chat_id,
+                static,
+                {
+                    "overdue_icon": "🔴" if is_overdue else "🟢",
+                    "last_seen": last_time.strftime("%H:%M:%S"),
+                    "minutes_inactive": minutes_inactive,
+                    "timeout": current_timeout,
+                    "period_name_lower": period_name.lower(),
+                    "sparkline": self.activity_sparkline(chat_id),
+                    "accessible": words["yes"] if self.state.is_accessible(chat_id) else words["no"],
+                    "reboot_status": reboot_status,
+                },
+            )
 
-            if chat_id in self.last_message_time and group.monitoring.enabled:
-                last_time = self.last_message_time[chat_id]
-                time_diff = current_time - last_time
-                minutes_inactive = int(time_diff.total_seconds() // 60)
+        current_timeout = (
+            self.get_current_timeout_for_group(group)
+            if group.monitoring.enabled
+            else 0
+        )
+        return self.templates.render_group(
+            "status_idle", chat_id, static, {"timeout": current_timeout}
+        )
 
-                # Отримуємо поточний таймаут
-                current_timeout = self.get_current_timeout_for_group(group)
+    async def handle_status_command(self, event):
+        """Обробляє команду /status [overdue] [tag:назва] [page N]
 
-                # Визначаємо стан на основі поточного порогу
-                is_overdue = minutes_inactive >= current_timeout
-                overdue_icon = "🔴" if is_overdue else "🟢"
+        Рендериться лише запитана сторінка; довгий результат ділиться на
+        кілька повідомлень.
+        """
+        try:
+            query = self.parse_listing_query(event.text.split()[1:])
+        except ValueError as e:
+            await self.reply(
+                event,
+                f"❌ {e}\n\nВикористання: `/status [overdue] [tag:назва] [page N]`",
+            )
+            return
 
-                reboot_status = (
-                    "🔄 Викликано"
-                    if self.api_reboot_sent.get(chat_id, False)
-                    else "⏸️ Очікує"
-                )
+        registry = self.get_registry()
+        selected = self.select_groups(query)
+        page_groups, _, page, pages = self.page_of(selected, query.page)
+        is_night = self.is_night_time()
+        period_name = self.period_name(is_night)
+        now = self.clock()
 
-                status_lines.append(
-                    f"{status_icon} **{group.name}** {overdue_icon}\n"
-                    f"   🆔 ID: `{chat_id}`\n"
-                    f"   ⏰ Останнє: {last_time.strftime('%H:%M:%S')}\n"
-                    f"   🕐 Неактивність: {minutes_inactive}/{current_timeout} хв ({period_name.lower()})\n"
-                    f"   📊 День/Ніч: {group.monitoring.day_inactive_minutes}/{group.monitoring.night_inactive_minutes} хв\n"
-                    f"   ✅ Доступ: {'Так' if self.chat_accessible.get(chat_id, False) else 'Ні'}\n"
-                    f"   🔄 API: {'Увімкнено' if group.api_reboot.enabled else 'Вимкнено'}\n"
-                    f"   📡 Статус: {reboot_status if group.api_reboot.enabled else 'N/A'}\n"
-                )
-            else:
-                current_timeout = (
-                    self.get_current_timeout_for_group(group)
-                    if group.monitoring.enabled
-                    else 0
-                )
-                status_lines.append(
-                    f"{status_icon} **{group.name}**\n"
-                    f"   🆔 ID: `{chat_id}`\n"
-                    f"   📊 День/Ніч: {group.monitoring.day_inactive_minutes}/{group.monitoring.night_inactive_minutes} хв\n"
-                    f"   ⏳ Поточний поріг: {current_timeout} хв\n"
-                    f"   📊 Статус: {'Вимкнено' if not group.monitoring.enabled else 'Немає даних'}\n"
-                )
+        status_lines = [
+            self.templates.render(
+                "status_header",
+                {
+                    "period_icon": "🌙" if is_night else "☀️",
+                    "period_name": period_name,
+                    "active": len(registry.enabled),
+                    "total": len(registry.groups),
+                    "listing": self.describe_listing(
+                        "/status", query, len(selected), page, pages
+                    ),
+                },
+            )
+        ]
+        for group in page_groups:
+            status_lines.append(self.format_status_entry(group, period_name, now))
 
-        check_interval = self.config["global_settings"]["check_interval_seconds"]
         night_hours = self.get_night_hours()
         status_lines.append(
-            f"\n🔄 Інтервал перевірки: {check_interval} секунд\n"
-            f"🌙 Нічні години: {night_hours.start} - {night_hours.end}\n"
-            f"🟢 - в межах норми, 🔴 - перевищено поріг"
+            self.templates.render(
+                "status_footer",
+                {
+                    "check_interval": self.config["global_settings"]["check_interval_seconds"],
+                    "night_start": night_hours.start,
+                    "night_end": night_hours.end,
+                    "sender": self.sender_summary(),
+                },
+            )
         )
 
-        await event.edit("\n".join(status_lines))
-
-    async def handle_groups_command(self, event):
-        """Показує список всіх груп з день/ніч налаштуваннями"""
-        all_groups = self.get_groups()
-        is_night = self.is_night_time()
-        period_icon = "🌙" if is_night else "☀️"
+        await self.reply_long(event, "\n".join(status_lines))
+
+    def sender_summary(self) -> str:
+        """Рядок з лічильниками планувальника відправок для /status"""
+        stats = self.sender.stats()
+        sent = sum(c["sent"] for c in stats["counters"].values())
+        dropped = sum(c["dropped"] for c in stats["counters"].values())
+        queued = sum(stats["queues"].values())
+        return (
+            f"📤 Відправлено: {sent}, у черзі: {queued}, відкинуто: {dropped}, "
+            f"FloodWait: {stats['flood_waits']} ({stats['flood_wait_seconds']} сек)"
+        )
 
-        groups_lines = [f"👥 **Всі групи в конфігурації:** {period_icon}\n"]
+    def format_group_entry(self, i: int, group: GroupConfig) -> str:
+        """Блок /groups для однієї групи"""
+        current_timeout = (
+            self.get_current_timeout_for_group(group)
+            if group.monitoring.enabled
+            else 0
+        )
 
-        for i, group in enumerate(all_groups, 1):
-            status = "✅ Активна" if group.monitoring.enabled else "⏸️ Вимкнена"
-            api_status = "🔄 Так" if group.api_reboot.enabled else "❌ Ні"
-            current_timeout = (
-                self.get_current_timeout_for_group(group)
-                if group.monitoring.enabled
-                else 0
+        entry = self.templates.render_group(
+            "groups_entry",
+            group.chat_id,
+            lambda: self.group_template_fields(group),
+            {"index": i, "timeout": current_timeout},
+        )
+        schedule = group.monitoring.schedule
+        if schedule is not None:
+            entry += self.templates.render(
+                "groups_schedule",
+                {"weekday": len(schedule.weekday), "weekend": len(schedule.weekend)},
             )
+        adaptive = group.monitoring.adaptive
+        quantiles = self.gap_quantiles.get(group.chat_id)
+        if adaptive is not None:
+            trained = 0
+            if quantiles is not None:
+                trained = sum(
+                    quantiles.samples(hour) >= adaptive.min_samples
+                    for hour in range(HOURS_PER_WEEK)
+                )
+            entry += self.templates.render(
+                "groups_adaptive",
+                {"quantile": adaptive.quantile, "trained": trained, "hours": HOURS_PER_WEEK},
+            )
+        if group.tags:
+            entry += self.templates.render("groups_tags", {"tags": ", ".join(group.tags)})
+        return entry
 
-            groups_lines.append(
-                f"**{i}. {group.name}**\n"
-                f"   📝 {group.description}\n"
-                f"   🆔 ID: `{group.chat_id}`\n"
-                f"   📊 Моніторинг: {status}\n"
-                f"   ☀️ День: {group.monitoring.day_inactive_minutes} хв\n"
-                f"   🌙 Ніч: {group.monitoring.night_inactive_minutes} хв\n"
-                f"   ⏳ Зараз: {current_timeout} хв\n"
-                f"   🔄 API Reboot: {api_status}\n"
+    async def handle_groups_command(self, event):
+        """Показує групи з день/ніч налаштуваннями: /groups [overdue] [tag:назва] [page N]"""
+        try:
+            query = self.parse_listing_query(event.text.split()[1:])
+        except ValueError as e:
+            await self.reply(event, self.templates.render("groups_usage", {"error": e}))
+            return
+
+        selected = self.select_groups(query)
+        page_groups, start, page, pages = self.page_of(selected, query.page)
+
+        groups_lines = [
+            self.templates.render(
+                "groups_header",
+                {
+                    "period_icon": "🌙" if self.is_night_time() else "☀️",
+                    "listing": self.describe_listing(
+                        "/groups", query, len(selected), page, pages
+                    ),
+                },
             )
+        ]
+        for i, group in enumerate(page_groups, start + 1):
+            groups_lines.append(self.format_group_entry(i, group))
 
-        await event.edit("\n".join(groups_lines))
+        await self.reply_long(event, "\n".join(groups_lines))
 
     async def handle_test_command(self, event):
         """Обробляє команду /test з інформацією про поточні таймаути"""
-        await event.edit("🔄 Перевіряю доступ до всіх груп...")
+        await self.reply(event, self.templates.render("test_started", {}))
 
         all_groups = self.get_groups()
         is_night = self.is_night_time()
         period_icon = "🌙" if is_night else "☀️"
         results = []
+        last_edit = time_module.monotonic()
+
+        async def report_progress(done: int, total: int):
+            # Оновлюємо повідомлення не частіше ніж раз на 2 секунди
+            nonlocal last_edit
+            if done < total and time_module.monotonic() - last_edit >= 2:
+                last_edit = time_module.monotonic()
+                self.reply(
+                    event, self.templates.render("test_progress", {"done": done, "total": total})
+                )
+
+        access_results = await self.validate_groups_access(
+            all_groups, report_progress, refresh=True
+        )
 
-        for group in all_groups:
-            access = await self.validate_chat_access(group)
-            access_icon = "✅" if access else "❌"
-            status_icon = "🟢" if group.monitoring.enabled else "⏸️"
-            api_icon = "🔄" if group.api_reboot.enabled else "❌"
+        for group, access in zip(all_groups, access_results):
             current_timeout = (
                 self.get_current_timeout_for_group(group)
                 if group.monitoring.enabled
                 else 0
             )
-
             results.append(
-                f"{access_icon}{status_icon} {group.name} "
-                f"({current_timeout}хв{period_icon}) {api_icon}"
+                self.templates.render(
+                    "test_line",
+                    {
+                        "access_icon": "✅" if access else "❌",
+                        "status_icon": "🟢" if group.monitoring.enabled else "⏸️",
+                        "name": group.name,
+                        "timeout": current_timeout,
+                        "period_icon": period_icon,
+                        "api_icon": "🔄" if group.api_reboot.enabled else "❌",
+                    },
+                )
             )
 
-        result_text = f"🧪 **Результати тестування:** {period_icon}\n\n" + "\n".join(
-            results
+        await self.reply(
+            event,
+            self.templates.render(
+                "test_result", {"period_icon": period_icon, "results": "\n".join(results)}
+            ),
         )
-        result_text += (
-            "\n\n**Легенда:**\n"
-            "✅❌ - доступ до чату\n"
-            "🟢⏸️ - статус моніторингу\n"
-            "🔄❌ - API reboot\n"
-            f"(Nхв{period_icon}) - поточний таймаут\n"
-            "☀️ - день, 🌙 - ніч"
-        )
-        await event.edit(result_text)
 
     async def handle_reload_command(self, event):
         """Обробляє команду /reload"""
         try:
-            await event.edit("🔄 Перезавантажую конфігурацію...")
+            await self.reply(event, "🔄 Перезавантажую конфігурацію...")
             old_groups_count = len(self.get_enabled_groups())
 
-            self.config = self.load_config("config.json")
-            self.setup_timezone()  # Оновлюємо часову зону
+            config = self.load_config(self.config_file)
+            self.validate_config(config)
+            summary = await self.apply_config(config)
             new_groups_count = len(self.get_enabled_groups())
 
-            await event.edit(
+            await self.reply(
+                event,
                 f"✅ Конфігурацію перезавантажено!\n"
                 f"📊 Активних груп: {old_groups_count} → {new_groups_count}\n"
+                f"➕ Додано: {len(summary['added'])}, ➖ видалено: {len(summary['removed'])}, "
+                f"✏️ змінено: {len(summary['changed'])} ({summary['elapsed_ms']} мс)\n"
                 f"🌍 Часова зона: {self.timezone}\n"
                 f"{self.get_time_period_name()} Поточний режим"
             )
             logger.info("Конфігурацію перезавантажено через команду")
         except Exception as e:
-            await event.edit(f"❌ Помилка перезавантаження: {str(e)}")
+            await self.reply(event, f"❌ Помилка перезавантаження: {str(e)}")
             logger.error(f"Помилка перезавантаження конфігурації: {e}")
 
+    def chat_ids_in_text(self, text: str) -> List[int]:
+        """Групи з відкритою ескалацією, згадані в тексті сповіщення (за ID або назвою)"""
+        open_ids = self.escalations.open
+        found = [
+            chat_id
+            for chat_id in dict.fromkeys(int(token) for token in re.findall(r"-?\d{5,}", text))
+            if chat_id in open_ids
+        ]
+        if found:
+            return found
+        registry = self.get_registry()
+        return [
+            chat_id
+            for chat_id in open_ids
+            if chat_id in registry.by_chat_id and registry.by_chat_id[chat_id].name in text
+        ]
+
+    async def handle_ack_command(self, event):
+        """Обробляє /ack: відповіддю на сповіщення, /ack назва_групи або /ack all"""
+        args = event.text.split()[1:]
+        if args and args[0].lower() == "all":
+            chat_ids = list(self.escalations.open)
+        elif args:
+            group = self.get_registry().find_by_name(" ".join(args))
+            chat_ids = [group.chat_id] if group else []
+        elif event.is_reply:
+            replied = await self.call_respecting_flood(
+                event.get_reply_message, "отриманні повідомлення для /ack"
+            )
+            chat_ids = self.chat_ids_in_text(replied.text or "") if replied else []
+        else:
+            await self.reply(
+                event,
+                "❌ Використання: відповідь `/ack` на сповіщення, "
+                "`/ack назва_групи` або `/ack all`",
+            )
+            return
+
+        registry = self.get_registry()
+        acknowledged = [
+            registry.get(chat_id).name if registry.get(chat_id) else str(chat_id)
+            for chat_id in chat_ids
+            if self.acknowledge_incident(chat_id, "telegram")
+        ]
+        if acknowledged:
+            await self.reply(event, "✋ Підтверджено: " + ", ".join(acknowledged))
+        else:
+            await self.reply(event, "ℹ️ Немає непідтверджених інцидентів для цих груп")
+
     async def handle_manual_reboot_command(self, event):
         """Обробляє команду /reboot [назва_групи]"""
         try:
             parts = event.text.split()
             if len(parts) < 2:
-                enabled_groups = self.get_enabled_groups()
-                group_info = []
-                for g in enabled_groups:
-                    current_timeout = self.get_current_timeout_for_group(g)
-                    period_icon = "🌙" if self.is_night_time() else "☀️"
-                    group_info.append(f"• {g.name} ({current_timeout}хв{period_icon})")
-
-                await event.edit(
-                    f"❌ Використання: `/reboot назва_групи`\n\n"
-                    f"**Доступні групи:**\n" + "\n".join(group_info)
+                await self.reply(
+                    event,
+                    self.templates.render(
+                        "reboot_usage",
+                        {"groups": self.reboot_group_lines(self.get_enabled_groups())},
+                    ),
                 )
                 return
 
             group_name = " ".join(parts[1:])
-            all_groups = self.get_groups()
-
-            target_group = None
-            for group in all_groups:
-                if group.name.lower() == group_name.lower():
-                    target_group = group
-                    break
+            target_group = self.get_registry().find_by_name(group_name)
+            values = {"name": target_group.name if target_group else group_name}
 
             if not target_group:
-                available_groups = []
-                for g in all_groups:
-                    current_timeout = self.get_current_timeout_for_group(g)
-                    period_icon = "🌙" if self.is_night_time() else "☀️"
-                    available_groups.append(
-                        f"• {g.name} ({current_timeout}хв{period_icon})"
-                    )
-
-                await event.edit(
-                    f"❌ Група '{group_name}' не знайдена.\n\n"
-                    f"**Доступні групи:**\n" + "\n".join(available_groups)
-                )
+                values["groups"] = self.reboot_group_lines(self.get_groups())
+                await self.reply(event, self.templates.render("reboot_not_found", values))
                 return
 
             if not target_group.monitoring.enabled:
-                await event.edit(
-                    f"❌ Моніторинг вимкнено для групи '{target_group.name}'"
+                await self.reply(
+                    event, self.templates.render("reboot_monitoring_disabled", values)
                 )
                 return
 
             if not target_group.api_reboot.enabled:
-                await event.edit(
-                    f"❌ API reboot вимкнено для групи '{target_group.name}'"
-                )
+                await self.reply(event, self.templates.render("reboot_api_disabled", values))
                 return
 
             current_timeout = self.get_current_timeout_for_group(target_group)
-            period_name = "нічний" if self.is_night_time() else "денний"
-
-            await event.edit(
-                f"🔄 Викликаю reboot для групи '{target_group.name}'\n"
-                f"({period_name} режим, поріг: {current_timeout} хв)..."
+            await self.reply(
+                event,
+                self.templates.render(
+                    "reboot_calling",
+                    {
+                        **values,
+                        "period_name_lower": self.period_name(self.is_night_time()).lower(),
+                        "timeout": current_timeout,
+                    },
+                ),
             )
 
-            if await self.call_api_reboot(target_group):
-                await event.edit(
-                    f"✅ Reboot успішно викликано для групи '{target_group.name}'"
-                )
-                await self.send_api_reboot_notification(
+            rebooted = await self.call_api_reboot(target_group)
+            self.record_reboot_outcome(target_group, rebooted, manual=True)
+            if rebooted:
+                await self.reply(event, self.templates.render("reboot_done", values))
+                self.send_api_reboot_notification(
                     target_group, self.is_night_time(), current_timeout
                 )
             else:
-                await event.edit(
-                    f"❌ Помилка при виклику reboot для групи '{target_group.name}'"
-                )
+                await self.reply(event, self.templates.render("reboot_failed", values))
 
         except Exception as e:
-            await event.edit(f"❌ Помилка: {str(e)}")
+            await self.reply(event, self.templates.render("reboot_error", {"error": e}))
             logger.error(f"Помилка manual reboot: {e}")
 
+    def reboot_group_lines(self, groups: List[GroupConfig]) -> str:
+        """Список груп з поточним порогом для підказок /reboot"""
+        period_icon = "🌙" if self.is_night_time() else "☀️"
+        return "\n".join(
+            self.templates.render(
+                "reboot_group_line",
+                {
+                    "name": group.name,
+                    "timeout": self.get_current_timeout_for_group(group),
+                    "period_icon": period_icon,
+                },
+            )
+            for group in groups
+        )
+
     async def start_monitoring(self):
         """Запускає моніторинг"""
         try:
             # Ініціалізуємо клієнта
             await self.initialize_client()
+            self.open_entity_cache()
+            self.open_incident_store()
 
             # Налаштовуємо канал сповіщень
             if not await self.setup_notification_channel():
@@ -807,86 +2136,361 @@ class TelegramMultiMonitor:
                 logger.error("Немає увімкнених груп для моніторингу")
                 return
 
-            accessible_groups = []
-
-            for group in enabled_groups:
-                if await self.validate_chat_access(group):
-                    accessible_groups.append(group)
-                    # Ініціалізуємо дані
-                    self.last_message_time[group.chat_id] = datetime.now(self.timezone)
-                    self.notification_sent[group.chat_id] = False
-                    self.api_reboot_sent[group.chat_id] = False
+            access_results = await self.validate_groups_access(enabled_groups)
+            accessible_groups = [
+                group
+                for group, access in zip(enabled_groups, access_results)
+                if access
+            ]
 
             if not accessible_groups:
                 logger.error("Немає доступних груп для моніторингу")
                 return
 
+            # Продовжуємо відлік неактивності з часу до перезапуску або з
+            # останнього повідомлення в історії чату
+            self.restore_state(accessible_groups)
+            if self.config["global_settings"].get("warm_start", True):
+                await self.warm_start_from_history(accessible_groups)
+
+            # Групи без відомої історії відраховуємо від моменту запуску
+            for group in accessible_groups:
+                if self.state.last_seen_of(group.chat_id) is None:
+                    self.state.set_last_seen(group.chat_id, self.clock())
+
+            # Непідтверджені інциденти, відкриті до перезапуску, знову отримують нагадування
+            for group in accessible_groups:
+                if self.state.is_alerted(group.chat_id) or self.incidents.has_open(group.chat_id):
+                    incident = (
+                        self.incidents.find_open(group.chat_id)
+                        if self.incidents.is_open
+                        else None
+                    )
+                    if incident is not None and incident["acknowledged_at"] is not None:
+                        continue
+                    self.start_escalation(group.chat_id, incident and incident["id"])
+
             # Налаштовуємо обробники подій
             self.setup_event_handlers()
+            self._sender_task = asyncio.create_task(self.sender.run())
 
             # Відправляємо стартове повідомлення
             await self.send_start_notification(accessible_groups, all_groups)
 
-            # Запускаємо перевірку неактивності
-            asyncio.create_task(self.check_inactivity())
+            # Запускаємо перевірку неактивності та збереження стану
+            self.background_tasks = [
+                asyncio.create_task(self.check_inactivity()),
+                asyncio.create_task(self.persist_state()),
+                asyncio.create_task(self.outbox.run()),
+                asyncio.create_task(self.run_escalations()),
+            ]
+            self.alerts.start()
+            global_settings = self.config["global_settings"]
+            if self.incidents.is_open:
+                self.background_tasks.append(
+                    asyncio.create_task(
+                        self.incidents.run(global_settings.get("incident_flush_seconds", 1.0))
+                    )
+                )
+            if global_settings.get("watch_config", True):
+                watcher = ConfigWatcher(
+                    self.config_file,
+                    self.reload_config_from_file,
+                    debounce=global_settings.get("config_debounce_seconds", 1.0),
+                )
+                self.background_tasks.append(asyncio.create_task(watcher.run()))
 
             logger.info("Моніторинг запущено успішно!")
             await self.client.run_until_disconnected()
 
         except Exception as e:
             logger.error(f"Критична помилка: {e}")
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self):
+        """Зупиняє фонові задачі та зберігає останній стан"""
+        # Приймачам (зокрема Telegram через чергу дайджестів) даємо дорозіслати чергу
+        try:
+            if self.alerts.running and self.client.is_connected():
+                await asyncio.wait_for(self.alerts.drain(), timeout=10)
+        except Exception as e:
+            logger.error(f"Помилка доставки сповіщень при зупинці: {e}")
+        await self.alerts.stop()
+        if self._retiring_alerts:
+            # Старі приймачі після перезавантаження конфігурації ще дорозсилають чергу
+            await asyncio.wait(list(self._retiring_alerts), timeout=10)
+            for task in list(self._retiring_alerts):
+                task.cancel()
+            await asyncio.gather(*self._retiring_alerts, return_exceptions=True)
+
+        for task in self.background_tasks:
+            task.cancel()
+        self.background_tasks = []
+        for task in self._reboot_tasks.values():
+            task.cancel()
+        self._reboot_tasks = {}
+
+        # Доставляємо сповіщення, що лишились у черзі
+        try:
+            if self._sender_task is not None and self.client.is_connected():
+                await asyncio.wait_for(self.outbox.flush(), timeout=10)
+        except Exception as e:
+            logger.error(f"Помилка доставки сповіщень при зупинці: {e}")
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            self._sender_task = None
+        self.sender.cancel_all()
+
+        try:
+            if self.journal.is_open:
+                self.flush_state()
+                self.journal.close()
+            self.entity_cache.close()
+            self.incidents.close()
+        except Exception as e:
+            logger.error(f"Помилка збереження стану при зупинці: {e}")
+
+    def restore_state(self, groups: List[GroupConfig]) -> int:
+        """Відновлює час останнього повідомлення та флаги груп з журналу"""
+        try:
+            self.journal.open()
+            saved = self.journal.load()
+        except Exception as e:
+            logger.error(f"Помилка читання журналу стану: {e}")
+            return 0
+
+        restored = 0
+        for group in groups:
+            if group.chat_id not in saved:
+                continue
+            last_seen_wall, flags = saved[group.chat_id]
+            if last_seen_wall is None:
+                continue
+            self.state.set_last_seen(group.chat_id, self.clock.from_wall(last_seen_wall))
+            self.state.set_alerted(group.chat_id, bool(flags & FLAG_ALERTED))
+            self.state.set_rebooted(group.chat_id, bool(flags & FLAG_REBOOTED))
+            restored += 1
+
+        # Навчені квантилі інтервалів адаптивних груп
+        try:
+            sketches = self.journal.load_sketches()
+        except Exception as e:
+            logger.error(f"Помилка читання квантилів з журналу: {e}")
+            sketches = {}
+        for chat_id, hours in sketches.items():
+            quantiles = self.gap_quantiles.get(chat_id)
+            if quantiles is None:
+                continue
+            for hour, data in hours.items():
+                quantiles.restore(hour, data)
+
+        logger.info(f"Стан відновлено з журналу для {restored}/{len(groups)} груп")
+        return restored
+
+    async def warm_start_from_history(self, groups: List[GroupConfig]) -> int:
+        """Бере час останнього повідомлення груп з Telegram пакетними запитами
+
+        Один GetPeerDialogsRequest повертає верхнє повідомлення до 100 чатів,
+        тож старт для сотень груп займає лише кілька запитів.
+        """
+        last_dates: Dict[int, float] = {}
+        batch_size = 100
+
+        for i in range(0, len(groups), batch_size):
+            batch = groups[i : i + batch_size]
+            try:
+                result = await self.get_peer_dialogs(batch)
+            except PeerIdInvalidError:
+                # Застарілий access_hash - беремо свіжі зі списку діалогів і повторюємо
+                try:
+                    await self.reload_entities(group.chat_id for group in batch)
+                    result = await self.get_peer_dialogs(batch)
+                except Exception as e:
+                    logger.error(f"Помилка отримання історії для теплого старту: {e}")
+                    continue
+            except Exception as e:
+                logger.error(f"Помилка отримання історії для теплого старту: {e}")
+                continue
+
+            # Відправників з відповіді одразу кладемо в кеш імен
+            self.sender_cache.put_many(result.users)
+
+            message_dates = {
+                (utils.get_peer_id(message.peer_id), message.id): message.date
+                for message in result.messages
+                if getattr(message, "date", None) is not None
+            }
+            for dialog in result.dialogs:
+                chat_id = utils.get_peer_id(dialog.peer)
+                date = message_dates.get((chat_id, dialog.top_message))
+                if date is not None:
+                    last_dates[chat_id] = date.timestamp()
+
+        self.entity_cache.flush()
+
+        seeded = 0
+        for group in groups:
+            history_ts = last_dates.get(group.chat_id)
+            if history_ts is None:
+                continue
+            # Беремо пізніший з часу в історії та відновленого з журналу
+            last_seen = self.state.last_seen_of(group.chat_id)
+            if last_seen is not None and self.clock.to_wall(last_seen) >= history_ts:
+                continue
+            self.state.set_last_seen(group.chat_id, self.clock.from_wall(history_ts))
+            seeded += 1
+
+            # Група писала під час простою: сповіщення та reboot з журналу
+            # застаріли, інакше нова тиша не дасть ні алерту, ні reboot
+            if (
+                self.state.is_alerted(group.chat_id)
+                or self.state.is_rebooted(group.chat_id)
+                or self.incidents.has_open(group.chat_id)
+            ):
+                logger.info(
+                    f"Активність у групі '{group.name}' відновилась під час простою, "
+                    "інцидент закрито"
+                )
+                self.state.set_alerted(group.chat_id, False)
+                self.state.set_rebooted(group.chat_id, False)
+                self.resolve_incident(group.chat_id, history_ts)
+
+        logger.info(
+            f"Теплий старт: час останнього повідомлення взято з історії для {seeded}/{len(groups)} груп"
+        )
+        return seeded
+
+    async def get_peer_dialogs(self, groups: List[GroupConfig]):
+        """Один GetPeerDialogsRequest для пакета груп"""
+        peers = [
+            types.InputDialogPeer(peer=await self.resolve_input_peer(group.chat_id))
+            for group in groups
+        ]
+        return await self.call_respecting_flood(
+            lambda: self.client(functions.messages.GetPeerDialogsRequest(peers=peers)),
+            "отриманні історії груп",
+        )
+
+    def collect_state_rows(self) -> List[Tuple[int, float, int]]:
+        """Знімає мітки змін зі стану груп і повертає рядки для журналу
+
+        Викликається лише з циклу подій: флаги змінюються там же, тож зняття
+        мітки не перетинається з record_message/set_flag.
+        """
+        chat_ids, last_seen, flags = self.state.take_dirty()
+        if not len(chat_ids):
+            return []
+        # Монотонні відмітки -> Unix timestamp одним векторним зсувом
+        wall_offset = self.clock.to_wall(0.0)
+        return list(
+            zip(chat_ids.tolist(), (last_seen + wall_offset).tolist(), flags.tolist())
+        )
+
+    def collect_sketch_rows(self) -> List[Tuple[int, int, List[float]]]:
+        """Знімає мітки змін з оцінювачів квантилів (лише з циклу подій)"""
+        return [
+            (chat_id, hour, data)
+            for chat_id, quantiles in self.gap_quantiles.items()
+            for hour, data in quantiles.take_dirty().items()
+        ]
+
+    def write_state(
+        self,
+        rows: List[Tuple[int, float, int]],
+        sketch_rows: List[Tuple[int, int, List[float]]],
+    ) -> int:
+        """Записує підготовлені рядки стану в журнал (можна викликати в потоці)"""
+        if not self.journal.is_open:
+            return 0
+        if sketch_rows:
+            self.journal.write_sketches(sketch_rows)
+        if rows:
+            self.journal.write(rows)
+        return len(rows)
+
+    def flush_state(self) -> int:
+        """Записує змінений з останнього збереження стан груп у журнал"""
+        if not self.journal.is_open:
+            return 0
+        return self.write_state(self.collect_state_rows(), self.collect_sketch_rows())
+
+    async def persist_state(self):
+        """Періодично пакетно зберігає стан у журнал поза шляхом обробки повідомлень"""
+        global_settings = self.config["global_settings"]
+        flush_seconds = global_settings.get("state_flush_seconds", 5)
+        compact_every = max(1, int(600 / flush_seconds))
+        flushes = 0
+
+        while True:
+            await asyncio.sleep(flush_seconds)
+            try:
+                if not self.journal.is_open:
+                    continue
+                # Стан знімаємо в циклі подій, у потік іде лише запис готових рядків
+                rows = self.collect_state_rows()
+                sketch_rows = self.collect_sketch_rows()
+                await asyncio.to_thread(self.write_state, rows, sketch_rows)
+                flushes += 1
+                if flushes % compact_every == 0:
+                    await asyncio.to_thread(self.journal.compact)
+            except Exception as e:
+                logger.error(f"Помилка збереження стану: {e}")
 
     async def send_start_notification(
         self, accessible_groups: List[GroupConfig], all_groups: List[GroupConfig]
     ):
         """Відправляє повідомлення про початок моніторингу з день/ніч інформацією"""
-        check_interval = self.config["global_settings"]["check_interval_seconds"]
-        current_time = datetime.now(self.timezone)
-        is_night = self.is_night_time(current_time)
+        is_night = self.is_night_time()
         night_hours = self.get_night_hours()
         period_icon = "🌙" if is_night else "☀️"
-        period_name = "Нічний" if is_night else "Денний"
+        period_name = self.period_name(is_night)
+
+        group_list = [
+            self.templates.render_group(
+                "start_group",
+                group.chat_id,
+                lambda group=group: self.group_template_fields(group),
+                {
+                    "period_name_lower": period_name.lower(),
+                    "timeout": self.get_current_timeout_for_group(group),
+                },
+            )
+            for group in accessible_groups
+        ]
 
-        group_list = []
-        for group in accessible_groups:
-            api_status = "🔄" if group.api_reboot.enabled else "❌"
-            current_timeout = self.get_current_timeout_for_group(group)
+        start_message = self.templates.render(
+            "start",
+            {
+                "period_icon": period_icon,
+                "period_name": period_name,
+                "active": len(accessible_groups),
+                "total": len(all_groups),
+                "disabled": len(all_groups) - len(accessible_groups),
+                "check_interval": self.config["global_settings"]["check_interval_seconds"],
+                "timezone": self.timezone,
+                "night_start": night_hours.start,
+                "night_end": night_hours.end,
+                "now": datetime.now(self.timezone).strftime("%H:%M:%S %d.%m.%Y"),
+                "groups": "\n\n".join(group_list),
+            },
+        )
+
+        await self.send_notification(start_message, PRIORITY_NORMAL)
+
+# Поточний екземпляр монітора (для API в тому ж процесі)
+current_monitor: Optional[TelegramMultiMonitor] = None
+
+
+def get_current_monitor() -> Optional[TelegramMultiMonitor]:
+    return current_monitor
 
-            group_list.append(
-                f"📱 {group.name}\n"
-                f"   🆔 `{group.chat_id}`\n"
-                f"   ☀️ День: {group.monitoring.day_inactive_minutes} хв\n"
-                f"   🌙 Ніч: {group.monitoring.night_inactive_minutes} хв\n"
-                f"   ⏳ Зараз ({period_name.lower()}): {current_timeout} хв\n"
-                f"   🔄 API: {api_status}"
-            )
-
-        disabled_count = len(all_groups) - len(accessible_groups)
-
-        start_message = (
-            f"🤖 **Мульти-груповий моніторинг запущено!** {period_icon}\n\n"
-            f"👥 Активних груп: {len(accessible_groups)}/{len(all_groups)}\n"
-            f"⏸️ Вимкнених груп: {disabled_count}\n"
-            f"🔄 Інтервал перевірки: {check_interval} сек\n"
-            f"🌍 Часова зона: {self.timezone}\n"
-            f"🌙 Нічні години: {night_hours.start} - {night_hours.end}\n"
-            f"{period_icon} Поточний режим: {period_name}\n"
-            f"🕐 Час запуску: {current_time.strftime('%H:%M:%S %d.%m.%Y')}\n\n"
-            f"**Активні групи:**\n" + "\n\n".join(group_list) + "\n\n"
-            f"**Команди:**\n"
-            f"`/status` - детальний статус\n"
-            f"`/groups` - список всіх груп\n"
-            f"`/time` - поточний час та режим\n"
-            f"`/test` - перевірка доступу\n"
-            f"`/reload` - перезавантажити конфігурацію\n"
-            f"`/reboot назва_групи` - ручний reboot"
-        )
-
-        await self.send_notification(start_message)
 
 async def main():
+    global current_monitor
     try:
         monitor = TelegramMultiMonitor("config.json")
+        current_monitor = monitor
         await monitor.start_monitoring()
     except Exception as e:
         logger.error(f"Помилка запуску: {e}")
@@ -896,6 +2500,8 @@ async def main():
         print("3. Перевірте правильність API_ID та API_HASH")
         print("4. Встановіть pytz: pip install pytz")
         sys.exit(1)
+    finally:
+        current_monitor = None
 
 
 if __name__ == "__main__":
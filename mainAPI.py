@@ -5,9 +5,12 @@ import os
 from fastapi.security import APIKeyQuery
 import psutil
 import asyncio
-from datetime import datetime
-from typing import  Dict, Any
-from main import main
+from datetime import datetime, timedelta
+from typing import  Dict, Any, Optional
+from main import main, get_current_monitor
+from activity import resample
+from incidents import IncidentStore
+from config_store import ConfigStore, check_keep_versions
 import logging
 
 app = FastAPI(title="Telegram Monitor Control Panel")
@@ -220,24 +223,73 @@ async def get_config():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Помилка читання: {str(e)}")
 
+# Історія конфігурацій: знімки за хешем вмісту замість повних копій
+_config_store: Optional[ConfigStore] = None
+
+
+def get_config_store() -> ConfigStore:
+    global _config_store
+    if _config_store is None:
+        _config_store = ConfigStore("backups/config", "config.json")
+        _config_store.import_current()
+    return _config_store
+
 @app.post("/api/config")
 async def save_config(config: Dict[str, Any]):
+    store = get_config_store()
     try:
-        if os.path.exists("config.json"):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            import shutil
-            shutil.copy("config.json", f"config_backup_{timestamp}.json")
-
-        with open("config.json", "w", encoding="utf-8") as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        keep_versions = check_keep_versions(
+            config.get("global_settings", {}).get("config_history_keep", 50)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        store.keep_versions = keep_versions
+        entry = store.commit(config)
 
         return {
             "status": "success",
             "message": f"Конфігурацію збережено: {len(config.get('groups', []))} груп",
+            "version": entry["version"],
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Помилка збереження: {str(e)}")
 
+@app.get("/api/config/history")
+async def get_config_history():
+    store = get_config_store()
+    return {"head": store.head, "versions": store.history()}
+
+@app.get("/api/config/history/{version}")
+async def get_config_version(version: int):
+    try:
+        return json.loads(get_config_store().read_text(version))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Версію {version} не знайдено")
+
+@app.get("/api/config/diff")
+async def get_config_diff(from_version: int, to_version: Optional[int] = None):
+    """Unified diff між версіями (за замовчуванням - з активною)"""
+    store = get_config_store()
+    to_version = to_version if to_version is not None else store.head
+    try:
+        diff = store.diff(from_version, to_version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Версію {e.args[0]} не знайдено")
+    return {"from_version": from_version, "to_version": to_version, "diff": diff}
+
+@app.post("/api/config/rollback/{version}")
+async def rollback_config(version: int):
+    try:
+        entry = get_config_store().rollback(version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Версію {version} не знайдено")
+    return {
+        "status": "success",
+        "message": f"Активна конфігурація - версія {version} від {entry['saved_at']}",
+        "version": version,
+    }
+
 # API для управління моніторингом - тепер всі асинхронні
 @app.post("/api/monitor/start")
 async def start_monitor():
@@ -251,10 +303,40 @@ async def stop_monitor():
 async def restart_monitor():
     return await controller.restart_monitor()
 
+@app.post("/api/monitor/reload")
+async def reload_monitor_config():
+    """Застосовує config.json до запущеного моніторингу без перепідключення"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    try:
+        config = monitor.load_config(monitor.config_file)
+        monitor.validate_config(config)
+        summary = await monitor.apply_config(config)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Помилка застосування: {str(e)}")
+    return {"success": True, **summary}
+
 @app.get("/api/monitor/status")
 async def get_monitor_status():
     return controller.get_status()
 
+@app.get("/api/monitor/telegram")
+async def get_telegram_send_stats():
+    """Лічильники планувальника відправок: черги, відправлені/відкинуті, FloodWait"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    return monitor.sender.stats()
+
+@app.get("/api/alerts/sinks")
+async def get_alert_sinks():
+    """Стан приймачів сповіщень: черги, доставлені, невдалі, відкинуті, повтори"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    return {"sinks": monitor.alerts.stats()}
+
 @app.get("/api/monitor/logs")
 async def get_logs():
     global monitor_logs
@@ -282,6 +364,130 @@ async def download_logs():
         },
     )
 
+@app.get("/api/groups/{chat_id}/activity")
+async def get_group_activity(chat_id: int, minutes: int = 1440, bucket: int = 1):
+    """Похвилинна кількість повідомлень групи з кільцевого буфера"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    if minutes <= 0 or bucket <= 0:
+        raise HTTPException(status_code=400, detail="minutes та bucket мають бути додатніми")
+
+    now = datetime.now().timestamp()
+    series = monitor.activity.series(chat_id, now, minutes)
+    if series is None:
+        raise HTTPException(status_code=404, detail=f"Група {chat_id} не відстежується")
+
+    counts = resample(series, bucket)
+    end_minute = int(now // 60) + 1
+    start_minute = end_minute - len(counts) * bucket
+    return {
+        "chat_id": chat_id,
+        "start": datetime.fromtimestamp(start_minute * 60).isoformat(),
+        "end": datetime.fromtimestamp(end_minute * 60).isoformat(),
+        "bucket_minutes": bucket,
+        "total": int(counts.sum()),
+        "counts": counts.tolist(),
+    }
+
+# Журнал інцидентів для читання, коли моніторинг не запущено
+_incident_reader: Optional[IncidentStore] = None
+
+
+def get_incident_store() -> IncidentStore:
+    """Журнал інцидентів запущеного монітора або окреме з'єднання для читання"""
+    global _incident_reader
+    monitor = get_current_monitor()
+    if monitor is not None and monitor.incidents.is_open:
+        return monitor.incidents
+
+    if _incident_reader is None:
+        try:
+            with open("config.json", "r", encoding="utf-8") as f:
+                global_settings = json.load(f).get("global_settings", {})
+        except Exception:
+            global_settings = {}
+        path = global_settings.get(
+            "incidents_file", global_settings.get("state_file", "data/monitor_state.db")
+        )
+        if not os.path.exists(path):
+            raise HTTPException(status_code=404, detail="Журнал інцидентів ще не створено")
+        _incident_reader = IncidentStore(path)
+        _incident_reader.open()
+    return _incident_reader
+
+@app.get("/api/incidents")
+async def get_incidents(
+    limit: int = 50,
+    cursor: Optional[int] = None,
+    chat_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[str] = None,
+):
+    """Інциденти від нових до старих; наступна сторінка - ?cursor=next_cursor"""
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit має бути від 1 до 500")
+    if status not in (None, "open", "resolved"):
+        raise HTTPException(status_code=400, detail="status: open або resolved")
+
+    return await get_incident_store().query(
+        limit=limit,
+        before_id=cursor,
+        chat_id=chat_id,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        status=status,
+    )
+
+@app.get("/api/incidents/stats")
+async def get_incident_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chat_id: Optional[int] = None,
+):
+    """MTTR та доступність груп за період (за замовчуванням - останні 7 днів)"""
+    until = until or datetime.now()
+    since = since or until - timedelta(days=7)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since має бути раніше за until")
+    return await get_incident_store().stats(since.timestamp(), until.timestamp(), chat_id)
+
+@app.get("/api/escalations")
+async def get_escalations():
+    """Непідтверджені інциденти: кількість нагадувань, ескалація, наступне нагадування"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    now = monitor.clock()
+    registry = monitor.get_registry()
+    escalations = []
+    for chat_id, escalation in monitor.escalations.open.items():
+        group = registry.get(chat_id)
+        next_reminder = monitor.escalations.next_step(chat_id)
+        escalations.append({
+            "chat_id": chat_id,
+            "group": group.name if group else None,
+            "incident_id": escalation.incident_id,
+            "open_minutes": round((now - escalation.opened_at) / 60, 1),
+            "reminders": escalation.reminders,
+            "escalated": escalation.escalated,
+            "next_reminder_in_seconds": (
+                round(next_reminder - now) if next_reminder is not None else None
+            ),
+        })
+    return {"escalations": escalations}
+
+@app.post("/api/incidents/{chat_id}/ack")
+async def acknowledge_incident(chat_id: int, by: str = "api"):
+    """Підтверджує інцидент групи: зупиняє нагадування та ескалацію"""
+    monitor = get_current_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Моніторинг не запущено")
+    if not monitor.acknowledge_incident(chat_id, by):
+        raise HTTPException(status_code=404, detail="Немає непідтвердженого інциденту для групи")
+    return {"success": True, "chat_id": chat_id}
+
 @app.get("/api/system/info")
 async def get_system_info():
     try:
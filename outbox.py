@@ -0,0 +1,110 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, List
+
+from elastic import logger
+from text_utils import join_within_limit
+
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+@dataclass
+class OutboxItem:
+    destination: Hashable
+    text: str
+    future: asyncio.Future = field(repr=False)
+
+
+class NotificationOutbox:
+    """Асинхронна черга сповіщень зі зведенням у дайджести
+
+    put() лише ставить повідомлення в чергу і одразу повертає Future з
+    результатом доставки, тож цикл перевірки не чекає на Telegram. Фонова
+    задача збирає повідомлення, що надійшли протягом window секунд, і
+    відправляє по одному дайджесту на отримувача, розбитому на частини до
+    4096 символів.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Hashable, str], Awaitable[bool]],
+        window: float = 2.0,
+    ):
+        self.send = send
+        self.window = window
+        self._queue: "asyncio.Queue[OutboxItem]" = asyncio.Queue()
+        self.sent_messages = 0
+        self.coalesced_items = 0
+        self.failed_items = 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, destination: Hashable, text: str) -> asyncio.Future:
+        """Ставить повідомлення в чергу, повертає Future[bool] доставки"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(OutboxItem(destination, text, future))
+        return future
+
+    def _drain_nowait(self, batch: List[OutboxItem]):
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _collect(self) -> List[OutboxItem]:
+        """Чекає перше повідомлення і збирає всі, що надійдуть протягом window"""
+        batch = [await self._queue.get()]
+        if self.window > 0:
+            await asyncio.sleep(self.window)
+        self._drain_nowait(batch)
+        return batch
+
+    @staticmethod
+    def build_digest(texts: List[str]) -> List[str]:
+        """Зводить повідомлення в дайджест, розбитий по межах повідомлень"""
+        if len(texts) == 1:
+            return join_within_limit(texts, DIGEST_SEPARATOR)
+        header = f"📦 **Зведення сповіщень: {len(texts)}**"
+        return join_within_limit([header, *texts], DIGEST_SEPARATOR)
+
+    async def deliver(self, batch: List[OutboxItem]):
+        by_destination: Dict[Hashable, List[OutboxItem]] = OrderedDict()
+        for item in batch:
+            by_destination.setdefault(item.destination, []).append(item)
+
+        for destination, items in by_destination.items():
+            ok = True
+            for message in self.build_digest([item.text for item in items]):
+                if await self.send(destination, message):
+                    self.sent_messages += 1
+                else:
+                    ok = False
+            if len(items) > 1:
+                self.coalesced_items += len(items)
+            if not ok:
+                self.failed_items += len(items)
+            for item in items:
+                if not item.future.done():
+                    item.future.set_result(ok)
+
+    async def run(self):
+        """Фоновий цикл доставки"""
+        while True:
+            batch = await self._collect()
+            try:
+                await self.deliver(batch)
+            except Exception as e:
+                logger.error(f"Помилка доставки сповіщень: {e}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_result(False)
+
+    async def flush(self):
+        """Відправляє все, що лишилось у черзі (при зупинці)"""
+        batch: List[OutboxItem] = []
+        self._drain_nowait(batch)
+        if batch:
+            await self.deliver(batch)
@@ -0,0 +1,148 @@
+import math
+from typing import Dict, List, Optional
+
+HOURS_PER_WEEK = 7 * 24
+# 1970-01-01 - четвер: зсув, щоб година тижня рахувалась від понеділка 00:00
+EPOCH_WEEK_OFFSET_HOURS = 3 * 24
+
+
+def hour_of_week(local_timestamp: float) -> int:
+    """Година тижня (0 - понеділок 00:00) для локального часу в секундах від епохи"""
+    return (int(local_timestamp // 3600) + EPOCH_WEEK_OFFSET_HOURS) % HOURS_PER_WEEK
+
+
+class P2Quantile:
+    """Потокова оцінка квантиля алгоритмом P² (Jain & Chlamtac)
+
+    Зберігає лише п'ять маркерів незалежно від кількості спостережень,
+    оновлення - O(1) без збереження вибірки.
+    """
+
+    __slots__ = ("p", "count", "heights", "positions", "desired")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+
+    def add(self, x: float):
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Знаходимо комірку k, в яку потрапило значення
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        p = self.p
+        desired = self.desired
+        desired[1] += p / 2
+        desired[2] += p
+        desired[3] += (1 + p) / 2
+        desired[4] += 1
+
+        # Коригуємо проміжні маркери
+        for i in (1, 2, 3):
+            d = desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (
+                d <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def value(self) -> Optional[float]:
+        """Поточна оцінка квантиля (None без спостережень)"""
+        if not self.heights:
+            return None
+        if self.count <= 5:
+            index = min(len(self.heights) - 1, math.ceil(self.p * len(self.heights)) - 1)
+            return self.heights[max(0, index)]
+        return self.heights[2]
+
+    def to_list(self) -> list:
+        return [self.count, *self.heights, *self.positions, *self.desired]
+
+    @classmethod
+    def from_list(cls, p: float, data: list) -> "P2Quantile":
+        sketch = cls(p)
+        sketch.count = int(data[0])
+        size = min(sketch.count, 5)
+        sketch.heights = [float(x) for x in data[1 : 1 + size]]
+        if len(data) >= 1 + size + 10:
+            rest = data[1 + size :]
+            sketch.positions = [int(x) for x in rest[:5]]
+            sketch.desired = [float(x) for x in rest[5:10]]
+        return sketch
+
+
+class GapQuantiles:
+    """Квантилі інтервалів між повідомленнями групи окремо для кожної години тижня
+
+    До 168 оцінювачів P² на групу створюються ліниво, тож пам'ять обмежена
+    і не залежить від кількості повідомлень.
+    """
+
+    __slots__ = ("p", "sketches", "dirty")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.sketches: Dict[int, P2Quantile] = {}
+        self.dirty = set()
+
+    def observe(self, hour: int, gap_seconds: float):
+        sketch = self.sketches.get(hour)
+        if sketch is None:
+            sketch = self.sketches[hour] = P2Quantile(self.p)
+        sketch.add(gap_seconds)
+        self.dirty.add(hour)
+
+    def samples(self, hour: int) -> int:
+        sketch = self.sketches.get(hour)
+        return 0 if sketch is None else sketch.count
+
+    def quantile(self, hour: int, min_samples: int) -> Optional[float]:
+        """Квантиль інтервалів для години або None, якщо спостережень замало"""
+        sketch = self.sketches.get(hour)
+        if sketch is None or sketch.count < min_samples:
+            return None
+        return sketch.value()
+
+    def restore(self, hour: int, data: list):
+        self.sketches[hour] = P2Quantile.from_list(self.p, data)
+
+    def take_dirty(self) -> Dict[int, list]:
+        """Повертає змінені оцінювачі (година -> стан) та знімає мітку"""
+        dirty = {hour: self.sketches[hour].to_list() for hour in self.dirty}
+        self.dirty = set()
+        return dirty
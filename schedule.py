@@ -0,0 +1,183 @@
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def parse_time_of_day(value: str) -> int:
+    """Перетворює рядок "HH:MM" у кількість секунд від початку доби"""
+    try:
+        hours, minutes = (int(part) for part in value.split(":"))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Невірний формат часу '{value}', очікується HH:MM")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Невірний час '{value}'")
+    return hours * 3600 + minutes * 60
+
+
+def seconds_of_day(dt: datetime) -> float:
+    """Повертає кількість секунд від початку доби для datetime"""
+    return dt.hour * 3600 + dt.minute * 60 + dt.second + dt.microsecond / 1_000_000
+
+
+def localize(tz, naive: datetime) -> datetime:
+    """Прив'язує наївний локальний час до часової зони (pytz або zoneinfo)"""
+    if hasattr(tz, "localize"):
+        return tz.normalize(tz.localize(naive))
+    return naive.replace(tzinfo=tz)
+
+
+class DayNightSchedule:
+    """Скомпільований розклад день/ніч з таблицею переходів у межах доби
+
+    Рядки night_hours розбираються один раз при створенні, далі визначення
+    періоду - це bisect по відсортованих межах без жодного strptime.
+    """
+
+    def __init__(self, start: str, end: str):
+        self.start = start
+        self.end = end
+        start_seconds = parse_time_of_day(start)
+        end_seconds = parse_time_of_day(end)
+
+        # Межі періодів: з секунди _bounds[i] діє режим _night[i]
+        if start_seconds == end_seconds:
+            self._bounds = [0]
+            self._night = [False]
+        elif start_seconds > end_seconds:
+            # Нічний період переходить через північ (наприклад, 22:00-08:00)
+            self._bounds = [0, end_seconds, start_seconds]
+            self._night = [True, False, True]
+        else:
+            # Нічний період в межах одного дня (наприклад, 01:00-05:00)
+            self._bounds = [0, start_seconds, end_seconds]
+            self._night = [False, True, False]
+
+    def is_night_at(self, seconds: float) -> bool:
+        """Перевіряє чи є нічним час доби, заданий у секундах"""
+        return self._night[bisect_right(self._bounds, seconds) - 1]
+
+    def is_night(self, dt: datetime) -> bool:
+        """Перевіряє чи є нічним локальний час dt"""
+        return self.is_night_at(seconds_of_day(dt))
+
+    def next_transition(self, dt: datetime) -> datetime:
+        """Повертає момент наступного перемикання день/ніч після dt"""
+        current = self.is_night(dt)
+        index = bisect_right(self._bounds, seconds_of_day(dt))
+        day_start = dt.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+        # Перебираємо межі сьогодні та завтра до першої зміни режиму
+        for day in range(3):
+            bounds = zip(self._bounds[index:], self._night[index:])
+            for bound, night in bounds:
+                if night != current:
+                    naive = day_start + timedelta(days=day, seconds=bound)
+                    return localize(dt.tzinfo, naive) if dt.tzinfo else naive
+            index = 0
+
+        # Режим ніколи не змінюється - перевіряємо знову через добу
+        return dt + timedelta(days=1)
+
+
+class IntervalIndex:
+    """Відсортований індекс вікон доби з порогами неактивності
+
+    Пошук порогу для моменту часу - bisect по початках вікон, тобто O(log k)
+    для k вікон у профілі.
+    """
+
+    def __init__(self, windows: List[Dict]):
+        intervals = []
+        for window in windows:
+            start = parse_time_of_day(window["start"])
+            end = parse_time_of_day(window["end"])
+            minutes = int(window["inactive_minutes"])
+            if minutes <= 0:
+                raise ValueError(f"Поріг вікна {window} має бути додатнім")
+            if start < end:
+                intervals.append((start, end, minutes))
+            else:
+                # Вікно переходить через північ - ділимо на дві частини доби
+                intervals.append((start, SECONDS_PER_DAY, minutes))
+                if end > 0:
+                    intervals.append((0, end, minutes))
+
+        intervals.sort()
+        for previous, current in zip(intervals, intervals[1:]):
+            if current[0] < previous[1]:
+                raise ValueError("Вікна розкладу не повинні перетинатися")
+
+        self._starts = [start for start, _, _ in intervals]
+        self._ends = [end for _, end, _ in intervals]
+        self._minutes = [minutes for _, _, minutes in intervals]
+        self._boundaries = sorted(set(self._starts) | set(self._ends))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, seconds: float) -> Optional[int]:
+        """Повертає поріг вікна, що містить момент доби, або None"""
+        index = bisect_right(self._starts, seconds) - 1
+        if index >= 0 and seconds < self._ends[index]:
+            return self._minutes[index]
+        return None
+
+    def next_boundary(self, seconds: float) -> Optional[int]:
+        """Повертає найближчу межу вікна після моменту доби"""
+        index = bisect_right(self._boundaries, seconds)
+        if index < len(self._boundaries):
+            return self._boundaries[index]
+        return None
+
+
+class GroupSchedule:
+    """Календарний розклад порогів неактивності групи
+
+    Профілі "weekday" / "weekend" / "holiday" містять вікна доби з власними
+    порогами; поза вікнами діють звичайні денний/нічний пороги групи.
+    Дати з "holidays" використовують профіль "holiday" (або "weekend",
+    якщо окремий профіль не задано).
+    """
+
+    def __init__(
+        self,
+        weekday: List[Dict],
+        weekend: Optional[List[Dict]] = None,
+        holiday: Optional[List[Dict]] = None,
+        holidays: Optional[List[str]] = None,
+    ):
+        self.weekday = IntervalIndex(weekday)
+        self.weekend = IntervalIndex(weekend) if weekend is not None else self.weekday
+        self.holiday = IntervalIndex(holiday) if holiday is not None else self.weekend
+        self.holidays = {date.fromisoformat(day) for day in holidays or []}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GroupSchedule":
+        return cls(
+            weekday=data.get("weekday", []),
+            weekend=data.get("weekend"),
+            holiday=data.get("holiday"),
+            holidays=data.get("holidays"),
+        )
+
+    def profile_for(self, day: date) -> IntervalIndex:
+        """Повертає профіль вікон для календарного дня"""
+        if day in self.holidays:
+            return self.holiday
+        return self.weekend if day.weekday() >= 5 else self.weekday
+
+    def threshold_at(self, dt: datetime) -> Optional[int]:
+        """Повертає поріг (хв) для локального часу dt або None поза вікнами"""
+        return self.profile_for(dt.date()).lookup(seconds_of_day(dt))
+
+    def next_change(self, dt: datetime) -> datetime:
+        """Повертає момент наступної зміни порогу за розкладом після dt"""
+        boundary = self.profile_for(dt.date()).next_boundary(seconds_of_day(dt))
+        day_start = dt.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        if boundary is None:
+            # Наступного дня може діяти інший профіль - перевіряємо опівночі
+            boundary = SECONDS_PER_DAY
+        naive = day_start + timedelta(seconds=boundary)
+        return localize(dt.tzinfo, naive) if dt.tzinfo else naive
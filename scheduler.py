@@ -0,0 +1,122 @@
+import asyncio
+import heapq
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class DeadlineScheduler:
+    """Черга дедлайнів груп на основі купи (heapq)
+
+    Для кожного ключа зберігається актуальний дедлайн у словнику, а в купі
+    лежить не більше одного "живого" запису на ключ. Пізніші дедлайни (нове
+    повідомлення в групі) лише оновлюють словник за O(1) - запис у купі
+    переозброюється за O(log n), коли спливе його старий час.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, Hashable]] = []
+        # Актуальний дедлайн для кожного ключа
+        self._deadlines: Dict[Hashable, float] = {}
+        # Дедлайн запису, який зараз лежить у купі для ключа
+        self._queued: Dict[Hashable, float] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Повертає актуальний дедлайн ключа"""
+        return self._deadlines.get(key)
+
+    def arm(self, key: Hashable, deadline: float):
+        """Встановлює (або переносить) дедлайн для ключа"""
+        self._deadlines[key] = deadline
+        queued = self._queued.get(key)
+        if queued is not None and queued <= deadline:
+            # Старий запис спрацює раніше і переозброїться сам
+            return
+
+        self._queued[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        self._maybe_compact()
+        if self._heap[0][0] >= deadline:
+            # Новий дедлайн найближчий - будимо цикл очікування
+            self._wakeup.set()
+
+    def arm_many(self, items: Iterable[Tuple[Hashable, float]]):
+        """Масово встановлює дедлайни і перебудовує купу за O(n)"""
+        self._deadlines.update(items)
+        self._queued = dict(self._deadlines)
+        self._heap = [(deadline, key) for key, deadline in self._queued.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Знімає дедлайн для ключа"""
+        self._deadlines.pop(key, None)
+
+    def wake(self):
+        """Будить цикл очікування, щоб той перерахував затримку"""
+        self._wakeup.set()
+
+    def clear(self):
+        self._heap.clear()
+        self._deadlines.clear()
+        self._queued.clear()
+        self._wakeup.set()
+
+    def next_deadline(self) -> Optional[float]:
+        """Повертає найближчий актуальний дедлайн"""
+        while self._heap:
+            deadline, key = self._heap[0]
+            if self._queued.get(key) != deadline:
+                heapq.heappop(self._heap)
+                continue
+            current = self._deadlines.get(key)
+            if current is None:
+                heapq.heappop(self._heap)
+                del self._queued[key]
+                continue
+            if current != deadline:
+                # Дедлайн було перенесено - переозброюємо запис
+                heapq.heapreplace(self._heap, (current, key))
+                self._queued[key] = current
+                continue
+            return deadline
+        return None
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """Знімає з черги всі ключі, дедлайн яких настав"""
+        due = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                break
+            _, key = heapq.heappop(self._heap)
+            del self._queued[key]
+            del self._deadlines[key]
+            due.append(key)
+        return due
+
+    async def wait(self, now: float, max_delay: Optional[float] = None):
+        """Чекає до найближчого дедлайну або до переозброєння черги"""
+        self._wakeup.clear()
+        deadline = self.next_deadline()
+        delay = None if deadline is None else max(0.0, deadline - now)
+        if max_delay is not None:
+            delay = max_delay if delay is None else min(delay, max_delay)
+        if delay == 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _maybe_compact(self):
+        """Перебудовує купу, якщо в ній накопичилось забагато застарілих записів"""
+        if len(self._heap) <= 2 * len(self._queued) + 64:
+            return
+        self._heap = [(deadline, key) for key, deadline in self._queued.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,243 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+from telethon.errors import FloodWaitError
+
+from elastic import logger
+
+# Пріоритетні смуги: менше значення обслуговується раніше
+PRIORITY_ALERT = 0  # Сповіщення про неактивність та reboot
+PRIORITY_NORMAL = 1  # Інші повідомлення (стартове сповіщення)
+PRIORITY_STATUS = 2  # Редагування відповідей на команди
+PRIORITY_NAMES = {PRIORITY_ALERT: "alert", PRIORITY_NORMAL: "normal", PRIORITY_STATUS: "status"}
+
+
+class TokenBucket:
+    """Класичне відро токенів: rate токенів за секунду, не більше capacity"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Скільки чекати до появи токена (0 - токен є)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass
+class SendJob:
+    destination: Hashable
+    priority: int
+    call: Callable[[], Awaitable]
+    future: asyncio.Future = field(repr=False)
+    key: Optional[Hashable] = None  # Пізніша задача з тим самим ключем замінює цю
+
+
+class SendScheduler:
+    """Центральний планувальник відправок і редагувань повідомлень Telegram
+
+    Кожна відправка бере токен з глобального відра та з відра отримувача.
+    Черги розділено на пріоритетні смуги: сповіщення завжди обслуговуються
+    раніше за редагування статусу. FloodWaitError паркує отримувача рівно на
+    вказаний Telegram час, а задача повертається в голову своєї черги.
+    Редагування одного повідомлення з ключем key замінюють попередні ще не
+    відправлені редагування.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 25.0,
+        global_burst: float = 25.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        max_queue: int = 500,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_queue = max_queue
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._parked_until: Dict[Hashable, float] = {}
+        self._lanes: Dict[int, Deque[SendJob]] = {
+            priority: deque() for priority in PRIORITY_NAMES
+        }
+        self._pending_keys: Dict[Hashable, SendJob] = {}
+        self._wakeup = asyncio.Event()
+        self.counters = {
+            name: {"sent": 0, "failed": 0, "dropped": 0, "superseded": 0}
+            for name in PRIORITY_NAMES.values()
+        }
+        self.flood_waits = 0
+        self.flood_wait_seconds = 0
+
+    def queue_sizes(self) -> Dict[str, int]:
+        return {PRIORITY_NAMES[p]: len(lane) for p, lane in self._lanes.items()}
+
+    def stats(self) -> Dict:
+        return {
+            "queues": self.queue_sizes(),
+            "counters": self.counters,
+            "flood_waits": self.flood_waits,
+            "flood_wait_seconds": self.flood_wait_seconds,
+            "parked": {
+                str(destination): round(until - time.monotonic(), 1)
+                for destination, until in self._parked_until.items()
+                if until > time.monotonic()
+            },
+        }
+
+    def submit(
+        self,
+        destination: Hashable,
+        call: Callable[[], Awaitable],
+        priority: int = PRIORITY_NORMAL,
+        key: Optional[Hashable] = None,
+    ) -> asyncio.Future:
+        """Ставить виклик у чергу; Future отримає результат виклику
+
+        Future задачі, витісненої новішою з тим самим key, отримує None.
+        При переповненні черги відкидається найновіша задача з найнижчим
+        пріоритетом, нижчим за пріоритет нової (інакше - сама нова задача).
+        """
+        future = asyncio.get_running_loop().create_future()
+        job = SendJob(destination, priority, call, future, key)
+
+        if key is not None:
+            previous = self._pending_keys.get(key)
+            if previous is not None and not previous.future.done():
+                self._lanes[previous.priority].remove(previous)
+                previous.future.set_result(None)
+                self.counters[PRIORITY_NAMES[previous.priority]]["superseded"] += 1
+            self._pending_keys[key] = job
+
+        if sum(len(lane) for lane in self._lanes.values()) >= self.max_queue:
+            victim_priority = max(self._lanes, key=lambda p: (bool(self._lanes[p]), p))
+            if victim_priority > priority and self._lanes[victim_priority]:
+                self._drop(self._lanes[victim_priority].pop())
+            else:
+                self._drop(job)
+                return future
+
+        self._lanes[priority].append(job)
+        self._wakeup.set()
+        return future
+
+    def _drop(self, job: SendJob):
+        self.counters[PRIORITY_NAMES[job.priority]]["dropped"] += 1
+        if job.key is not None and self._pending_keys.get(job.key) is job:
+            del self._pending_keys[job.key]
+        if not job.future.done():
+            job.future.set_result(None)
+        logger.warning(
+            f"Відправку в {job.destination} відкинуто: черга переповнена "
+            f"({PRIORITY_NAMES[job.priority]})"
+        )
+
+    def _bucket(self, destination: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(destination)
+        if bucket is None:
+            bucket = self._buckets[destination] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _next_job(self, now: float):
+        """Повертає (задача, 0) готову до відправки або (None, скільки чекати)"""
+        global_wait = self.global_bucket.wait_time(now)
+        if global_wait > 0:
+            return None, global_wait
+
+        wait: Optional[float] = None
+        blocked: set = set()
+        for priority in sorted(self._lanes):
+            for job in self._lanes[priority]:
+                if job.destination in blocked:
+                    continue
+                delay = max(
+                    self._parked_until.get(job.destination, 0.0) - now,
+                    self._bucket(job.destination).wait_time(now),
+                )
+                if delay <= 0:
+                    return job, 0.0
+                # Порядок у межах отримувача зберігається
+                blocked.add(job.destination)
+                wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    async def _execute(self, job: SendJob):
+        name = PRIORITY_NAMES[job.priority]
+        try:
+            result = await job.call()
+        except FloodWaitError as e:
+            # Паркуємо отримувача на вказаний час і повторюємо задачу першою
+            self.flood_waits += 1
+            self.flood_wait_seconds += e.seconds
+            self._parked_until[job.destination] = time.monotonic() + e.seconds
+            if job.key is not None and job.key in self._pending_keys:
+                # Поки чекали, з'явилось новіше редагування - це вже не потрібне
+                self.counters[name]["superseded"] += 1
+                job.future.set_result(None)
+            else:
+                if job.key is not None:
+                    self._pending_keys[job.key] = job
+                self._lanes[job.priority].appendleft(job)
+            logger.warning(f"FloodWait {e.seconds} сек для {job.destination} ({name})")
+            return
+        except Exception as e:
+            self.counters[name]["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        self.counters[name]["sent"] += 1
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def _release_key(self, job: SendJob):
+        if job.key is not None and self._pending_keys.get(job.key) is job:
+            del self._pending_keys[job.key]
+
+    async def run(self):
+        """Фоновий цикл: відправляє задачі в межах лімітів"""
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            job, wait = self._next_job(now)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._lanes[job.priority].remove(job)
+            # Задачу вже відправляємо - новіші з тим самим ключем йдуть після неї
+            self._release_key(job)
+            self.global_bucket.take(now)
+            self._bucket(job.destination).take(now)
+            await self._execute(job)
+
+    def cancel_all(self):
+        """Скасовує задачі в черзі (при зупинці)"""
+        for lane in self._lanes.values():
+            while lane:
+                job = lane.popleft()
+                if not job.future.done():
+                    job.future.cancel()
+        self._pending_keys.clear()
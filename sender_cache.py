@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+
+class SenderCache:
+    """Обмежений LRU-кеш імен відправників з TTL (sender_id -> ім'я)"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def display_name(entity) -> str:
+        """Повертає ім'я користувача або назву чату/каналу"""
+        return (
+            getattr(entity, "first_name", None)
+            or getattr(entity, "title", None)
+            or "Невідомий"
+        )
+
+    def get(self, sender_id: int) -> Optional[str]:
+        item = self._items.get(sender_id)
+        if item is None:
+            self.misses += 1
+            return None
+
+        name, expires_at = item
+        if expires_at < time.monotonic():
+            del self._items[sender_id]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(sender_id)
+        self.hits += 1
+        return name
+
+    def put(self, sender_id: int, name: str):
+        self._items[sender_id] = (name, time.monotonic() + self.ttl_seconds)
+        self._items.move_to_end(sender_id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def put_entity(self, entity):
+        """Кешує ім'я сутності Telethon (User/Chat/Channel)"""
+        entity_id = getattr(entity, "id", None)
+        if entity_id is not None:
+            self.put(entity_id, self.display_name(entity))
+
+    def put_many(self, entities: Iterable):
+        """Масово заповнює кеш сутностями (наприклад, users з відповіді API)"""
+        for entity in entities:
+            self.put_entity(entity)
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Біти поля flags
+FLAG_ACTIVE = 1  # Слот зайнятий групою
+FLAG_ACCESSIBLE = 2  # Доступ до чату підтверджено
+FLAG_ALERTED = 4  # Сповіщення про неактивність відправлено
+FLAG_REBOOTED = 8  # API reboot викликано
+FLAG_DIRTY = 16  # Стан змінено після останнього збереження в журнал
+
+# Флаги, які зберігаються між перезапусками
+PERSISTENT_FLAGS = FLAG_ALERTED | FLAG_REBOOTED
+
+
+class GroupStateStore:
+    """Стан моніторингу груп у суцільних масивах NumPy, індексованих слотом
+
+    Кожна група отримує постійний слот (chat_id -> slot). Час останнього
+    повідомлення (float64), пороги (uint32, сек) та упаковані флаги (uint8)
+    лежать у паралельних масивах, тож перевірка всіх груп - кілька
+    векторних операцій, а на групу припадає ~33 байти плюс запис індексу.
+    """
+
+    _arrays = (
+        ("chat_ids", np.int64, 0),
+        # Монотонна відмітка MonotonicClock (time.monotonic), сек - не Unix
+        # timestamp: у журнал і для показу переводиться через clock.to_wall
+        ("last_seen", np.float64, np.nan),
+        ("threshold", np.uint32, 0),  # Поточний поріг, сек
+        ("day_threshold", np.uint32, 0),
+        ("night_threshold", np.uint32, 0),
+        ("flags", np.uint8, 0),
+        ("message_count", np.uint32, 0),  # Повідомлень з моменту реєстрації
+    )
+
+    def __init__(self, capacity: int = 64):
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # Кількість використаних слотів (включно зі звільненими)
+        for name, dtype, fill in self._arrays:
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+    def _grow(self):
+        """Подвоює ємність масивів"""
+        for name, dtype, fill in self._arrays:
+            old = getattr(self, name)
+            new = np.full(len(old) * 2, fill, dtype=dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._slots
+
+    @property
+    def capacity(self) -> int:
+        return len(self.chat_ids)
+
+    def nbytes(self) -> int:
+        """Розмір масивів стану в байтах (без індексу chat_id -> slot)"""
+        return sum(getattr(self, name).nbytes for name, _, _ in self._arrays)
+
+    def slot_of(self, chat_id: int) -> Optional[int]:
+        return self._slots.get(chat_id)
+
+    def add(self, chat_id: int, day_seconds: float, night_seconds: float) -> int:
+        """Реєструє групу (або оновлює пороги існуючої) і повертає її слот"""
+        slot = self._slots.get(chat_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._size == self.capacity:
+                    self._grow()
+                slot = self._size
+                self._size += 1
+            self._slots[chat_id] = slot
+            self.chat_ids[slot] = chat_id
+            self.last_seen[slot] = np.nan
+            self.flags[slot] = FLAG_ACTIVE
+            self.message_count[slot] = 0
+
+        self.day_threshold[slot] = day_seconds
+        self.night_threshold[slot] = night_seconds
+        return slot
+
+    def remove(self, chat_id: int):
+        """Звільняє слот групи"""
+        slot = self._slots.pop(chat_id, None)
+        if slot is None:
+            return
+        self.flags[slot] = 0
+        self.last_seen[slot] = np.nan
+        self._free.append(slot)
+
+    def touch(self, chat_id: int, timestamp: float):
+        """Фіксує нове повідомлення та скидає флаги сповіщення/reboot"""
+        slot = self._slots[chat_id]
+        self.last_seen[slot] = timestamp
+        self.flags[slot] = (self.flags[slot] & (~PERSISTENT_FLAGS & 0xFF)) | FLAG_DIRTY
+        self.message_count[slot] += 1
+
+    def set_last_seen(self, chat_id: int, timestamp: float):
+        """Встановлює базовий час останньої активності без підрахунку повідомлення"""
+        slot = self._slots[chat_id]
+        self.last_seen[slot] = timestamp
+        self.flags[slot] |= FLAG_DIRTY
+
+    def message_count_of(self, chat_id: int) -> int:
+        slot = self._slots.get(chat_id)
+        return 0 if slot is None else int(self.message_count[slot])
+
+    def last_seen_of(self, chat_id: int) -> Optional[float]:
+        slot = self._slots.get(chat_id)
+        if slot is None or np.isnan(self.last_seen[slot]):
+            return None
+        return float(self.last_seen[slot])
+
+    def set_threshold(self, chat_id: int, seconds: float):
+        self.threshold[self._slots[chat_id]] = seconds
+
+    def has_flag(self, chat_id: int, flag: int) -> bool:
+        slot = self._slots.get(chat_id)
+        return slot is not None and bool(self.flags[slot] & flag)
+
+    def set_flag(self, chat_id: int, flag: int, value: bool = True):
+        slot = self._slots[chat_id]
+        if value:
+            self.flags[slot] |= flag
+        else:
+            self.flags[slot] &= ~flag & 0xFF
+        if flag & PERSISTENT_FLAGS:
+            self.flags[slot] |= FLAG_DIRTY
+
+    def is_accessible(self, chat_id: int) -> bool:
+        return self.has_flag(chat_id, FLAG_ACCESSIBLE)
+
+    def set_accessible(self, chat_id: int, value: bool = True):
+        self.set_flag(chat_id, FLAG_ACCESSIBLE, value)
+
+    def is_alerted(self, chat_id: int) -> bool:
+        return self.has_flag(chat_id, FLAG_ALERTED)
+
+    def set_alerted(self, chat_id: int, value: bool = True):
+        self.set_flag(chat_id, FLAG_ALERTED, value)
+
+    def is_rebooted(self, chat_id: int) -> bool:
+        return self.has_flag(chat_id, FLAG_REBOOTED)
+
+    def set_rebooted(self, chat_id: int, value: bool = True):
+        self.set_flag(chat_id, FLAG_REBOOTED, value)
+
+    def apply_period(self, is_night: bool):
+        """Перемикає поточні пороги всіх груп на денні або нічні"""
+        n = self._size
+        source = self.night_threshold if is_night else self.day_threshold
+        self.threshold[:n] = source[:n]
+
+    def _tracked(self) -> np.ndarray:
+        """Маска активних груп з відомим часом останнього повідомлення"""
+        n = self._size
+        return ((self.flags[:n] & FLAG_ACTIVE) != 0) & ~np.isnan(self.last_seen[:n])
+
+    def evaluate(self, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Векторна перевірка всіх груп
+
+        Повертає масиви слотів: прострочені групи та групи, де активність
+        відновилась (є флаги сповіщення/reboot, але поріг не перевищено).
+        """
+        n = self._size
+        tracked = self._tracked()
+        overdue = tracked & (now - self.last_seen[:n] > self.threshold[:n])
+        flagged = (self.flags[:n] & PERSISTENT_FLAGS) != 0
+        restored = tracked & ~overdue & flagged
+        return np.flatnonzero(overdue), np.flatnonzero(restored)
+
+    def clear_flags(self, slots: np.ndarray):
+        self.flags[slots] &= ~PERSISTENT_FLAGS & 0xFF
+        self.flags[slots] |= FLAG_DIRTY
+
+    def take_dirty(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Повертає змінені з останнього збереження групи та знімає з них мітку
+
+        Результат: chat_id, час останнього повідомлення, флаги для збереження.
+        """
+        n = self._size
+        dirty = np.flatnonzero(
+            ((self.flags[:n] & FLAG_DIRTY) != 0) & ~np.isnan(self.last_seen[:n])
+        )
+        self.flags[dirty] &= ~FLAG_DIRTY & 0xFF
+        return (
+            self.chat_ids[dirty],
+            self.last_seen[dirty],
+            self.flags[dirty] & PERSISTENT_FLAGS,
+        )
+
+    def deadlines(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Повертає chat_id та дедлайни всіх груп з відомим часом повідомлення"""
+        tracked = np.flatnonzero(self._tracked())
+        return (
+            self.chat_ids[tracked],
+            self.last_seen[tracked] + self.threshold[tracked],
+        )
+
+    def chat_ids_at(self, slots: Iterable[int]) -> list:
+        return self.chat_ids[np.asarray(slots, dtype=np.intp)].tolist()
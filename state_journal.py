@@ -0,0 +1,104 @@
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+from elastic import logger
+
+
+class StateJournal:
+    """Локальний журнал стану моніторингу на SQLite
+
+    Зберігає для кожної групи настінний час останнього повідомлення та
+    флаги сповіщення/reboot, щоб після перезапуску не давати мертвому агенту
+    новий повний таймаут. SQLite працює в режимі WAL: пакетні записи лише
+    дописуються в журнал, а періодичний checkpoint його ущільнює.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_state (
+                chat_id INTEGER PRIMARY KEY,
+                last_seen REAL,
+                flags INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS gap_sketches (
+                chat_id INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (chat_id, hour)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load(self) -> Dict[int, Tuple[float, int]]:
+        """Повертає збережений стан: chat_id -> (Unix timestamp, флаги)"""
+        rows = self._conn.execute(
+            "SELECT chat_id, last_seen, flags FROM group_state"
+        ).fetchall()
+        return {chat_id: (last_seen, flags) for chat_id, last_seen, flags in rows}
+
+    def write(self, rows: Iterable[Tuple[int, float, int]]):
+        """Пакетно записує стан груп (chat_id, Unix timestamp, флаги)"""
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO group_state (chat_id, last_seen, flags)
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    flags = excluded.flags
+                """,
+                rows,
+            )
+
+    def load_sketches(self) -> Dict[int, Dict[int, List[float]]]:
+        """Повертає стан оцінювачів квантилів: chat_id -> година тижня -> маркери"""
+        sketches: Dict[int, Dict[int, List[float]]] = {}
+        rows = self._conn.execute("SELECT chat_id, hour, state FROM gap_sketches")
+        for chat_id, hour, state in rows:
+            sketches.setdefault(chat_id, {})[hour] = json.loads(state)
+        return sketches
+
+    def write_sketches(self, rows: Iterable[Tuple[int, int, List[float]]]):
+        """Пакетно записує оцінювачі квантилів (chat_id, година тижня, маркери)"""
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO gap_sketches (chat_id, hour, state) VALUES (?, ?, ?)
+                ON CONFLICT(chat_id, hour) DO UPDATE SET state = excluded.state
+                """,
+                ((chat_id, hour, json.dumps(state)) for chat_id, hour, state in rows),
+            )
+
+    def compact(self):
+        """Переносить WAL у основний файл і обрізає журнал"""
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.warning(f"Не вдалося ущільнити журнал стану: {e}")
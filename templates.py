@@ -0,0 +1,572 @@
+import string
+from typing import Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+_FORMATTER = string.Formatter()
+
+
+class TemplateError(ValueError):
+    """Помилка в тексті шаблону (синтаксис або невідоме поле)"""
+
+
+class CompiledTemplate:
+    """Шаблон, розібраний один раз у послідовність (літерал, поле, формат)
+
+    Рендеринг - лише підстановка значень і один join, без повторного
+    розбору тексту. partial() підставляє відомі поля заздалегідь і склеює
+    сусідні літерали, тож для статичних частин лишається один рядок.
+    """
+
+    __slots__ = ("parts", "fields")
+
+    def __init__(self, parts: Tuple[Tuple[str, Optional[str], str], ...]):
+        self.parts = parts
+        self.fields = frozenset(field for _, field, _ in parts if field is not None)
+
+    @classmethod
+    def compile(cls, text: str, allowed: Optional[Iterable[str]] = None) -> "CompiledTemplate":
+        allowed = None if allowed is None else set(allowed)
+        parts = []
+        try:
+            parsed = list(_FORMATTER.parse(text))
+        except ValueError as e:
+            raise TemplateError(str(e))
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                if not field.isidentifier():
+                    raise TemplateError(f"некоректне поле {{{field}}}")
+                if conversion:
+                    raise TemplateError(f"перетворення !{conversion} не підтримується")
+                if allowed is not None and field not in allowed:
+                    raise TemplateError(f"невідоме поле {{{field}}}")
+            parts.append((literal, field, spec or ""))
+        return cls(cls._merge(parts))
+
+    @staticmethod
+    def _merge(parts) -> tuple:
+        """Склеює сусідні літерали (після підстановки полів у partial)"""
+        merged = []
+        pending = ""
+        for literal, field, spec in parts:
+            pending += literal
+            if field is not None:
+                merged.append((pending, field, spec))
+                pending = ""
+        if pending or not merged:
+            merged.append((pending, None, ""))
+        return tuple(merged)
+
+    def partial(self, values: Mapping) -> "CompiledTemplate":
+        """Новий шаблон з уже підставленими полями з values"""
+        parts = []
+        for literal, field, spec in self.parts:
+            if field is not None and field in values:
+                parts.append((literal + format(values[field], spec), None, ""))
+            else:
+                parts.append((literal, field, spec))
+        return CompiledTemplate(self._merge(parts))
+
+    def render(self, values: Mapping) -> str:
+        out = []
+        append = out.append
+        for literal, field, spec in self.parts:
+            append(literal)
+            if field is not None:
+                value = values[field]
+                append(format(value, spec) if spec else str(value))
+        return "".join(out)
+
+
+# Поля, доступні в шаблонах повідомлень
+TEMPLATE_FIELDS = {
+    "inactivity_alert": (
+        "name", "description", "chat_id", "day_minutes", "night_minutes", "api_status",
+        "last_seen", "minutes_inactive", "period_icon", "period_name", "period_name_lower",
+        "timeout", "now",
+    ),
+    "inactivity_reminder": (
+        "name", "description", "chat_id", "minutes_inactive", "timeout", "reminder", "now",
+    ),
+    "inactivity_escalation": (
+        "name", "description", "chat_id", "minutes_inactive", "timeout", "reminders", "now",
+    ),
+    "reboot_alert": (
+        "name", "chat_id", "api_url", "api_method", "api_headers",
+        "period_icon", "period_name", "timeout", "now",
+    ),
+    "start": (
+        "period_icon", "period_name", "active", "total", "disabled", "check_interval",
+        "timezone", "night_start", "night_end", "now", "groups",
+    ),
+    "start_group": (
+        "name", "chat_id", "day_minutes", "night_minutes", "api_icon",
+        "period_name_lower", "timeout",
+    ),
+    "status_header": ("period_icon", "period_name", "active", "total", "listing"),
+    "status_active": (
+        "status_icon", "name", "chat_id", "day_minutes", "night_minutes", "api_status",
+        "overdue_icon", "last_seen", "minutes_inactive", "timeout", "period_name_lower",
+        "sparkline", "accessible", "reboot_status",
+    ),
+    "status_idle": (
+        "status_icon", "name", "chat_id", "day_minutes", "night_minutes", "timeout", "state",
+    ),
+    "status_footer": ("check_interval", "night_start", "night_end", "sender"),
+    "listing": ("page", "pages", "found", "filter", "next"),
+    "listing_filter": ("filters",),
+    "listing_next": ("command",),
+    "time": (
+        "now", "timezone", "period_icon", "period_name", "night_start", "night_end", "groups",
+    ),
+    "time_group": ("name", "timeout", "day_minutes", "night_minutes"),
+    "groups_usage": ("error",),
+    "groups_header": ("period_icon", "listing"),
+    "groups_entry": (
+        "index", "name", "description", "chat_id", "status_icon", "monitoring",
+        "day_minutes", "night_minutes", "timeout", "api_icon", "api_answer",
+    ),
+    "groups_schedule": ("weekday", "weekend"),
+    "groups_adaptive": ("quantile", "trained", "hours"),
+    "groups_tags": ("tags",),
+    "test_started": (),
+    "test_progress": ("done", "total"),
+    "test_line": ("access_icon", "status_icon", "name", "timeout", "period_icon", "api_icon"),
+    "test_result": ("period_icon", "results"),
+    "reboot_group_line": ("name", "timeout", "period_icon"),
+    "reboot_usage": ("groups",),
+    "reboot_not_found": ("name", "groups"),
+    "reboot_monitoring_disabled": ("name",),
+    "reboot_api_disabled": ("name",),
+    "reboot_calling": ("name", "period_name_lower", "timeout"),
+    "reboot_done": ("name",),
+    "reboot_failed": ("name",),
+    "reboot_error": ("error",),
+}
+
+LOCALES: Dict[str, Dict[str, Dict[str, str]]] = {
+    "uk": {
+        "templates": {
+            "inactivity_alert": (
+                "⚠️ **УВАГА: Неактивність у групі!**\n\n"
+                "📱 Група: {name}\n"
+                "📝 Опис: {description}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "⏰ Останнє повідомлення: {last_seen}\n"
+                "🕐 Час неактивності: {minutes_inactive} хвилин\n"
+                "{period_icon} Режим: {period_name}\n"
+                "⏳ Поріг ({period_name_lower}): {timeout} хвилин\n"
+                "📊 Налаштування: День {day_minutes}хв / Ніч {night_minutes}хв\n"
+                "📅 Дата: {now}\n"
+                "🔄 API Reboot: {api_status}"
+            ),
+            "inactivity_reminder": (
+                "🔁 **Нагадування #{reminder}: група досі неактивна**\n\n"
+                "📱 Група: {name}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "🕐 Час неактивності: {minutes_inactive} хвилин (поріг {timeout})\n"
+                "📅 Дата: {now}\n"
+                "✋ Щоб зупинити нагадування, дайте відповідь `/ack` на це повідомлення"
+            ),
+            "inactivity_escalation": (
+                "🚨 **ЕСКАЛАЦІЯ: інцидент не підтверджено**\n\n"
+                "📱 Група: {name}\n"
+                "📝 Опис: {description}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "🕐 Час неактивності: {minutes_inactive} хвилин (поріг {timeout})\n"
+                "🔁 Нагадувань без відповіді: {reminders}\n"
+                "📅 Дата: {now}\n"
+                "✋ Підтвердити: відповідь `/ack` на це повідомлення"
+            ),
+            "reboot_alert": (
+                "🔄 **API REBOOT ВИКЛИКАНО**\n\n"
+                "📱 Група: {name}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "{period_icon} Режим: {period_name}\n"
+                "⏳ Поріг неактивності: {timeout} хвилин\n"
+                "🌐 URL: {api_url}\n"
+                "📡 Метод: {api_method}\n"
+                "🔑 Headers: {api_headers}\n"
+                "⏰ Час: {now}"
+            ),
+            "start": (
+                "🤖 **Мульти-груповий моніторинг запущено!** {period_icon}\n\n"
+                "👥 Активних груп: {active}/{total}\n"
+                "⏸️ Вимкнених груп: {disabled}\n"
+                "🔄 Інтервал перевірки: {check_interval} сек\n"
+                "🌍 Часова зона: {timezone}\n"
+                "🌙 Нічні години: {night_start} - {night_end}\n"
+                "{period_icon} Поточний режим: {period_name}\n"
+                "🕐 Час запуску: {now}\n\n"
+                "**Активні групи:**\n{groups}\n\n"
+                "**Команди:**\n"
+                "`/status` - детальний статус\n"
+                "`/groups` - список всіх груп\n"
+                "`/time` - поточний час та режим\n"
+                "`/test` - перевірка доступу\n"
+                "`/reload` - перезавантажити конфігурацію\n"
+                "`/reboot назва_групи` - ручний reboot\n"
+                "`/ack` - підтвердити інцидент (відповіддю на сповіщення)"
+            ),
+            "start_group": (
+                "📱 {name}\n"
+                "   🆔 `{chat_id}`\n"
+                "   ☀️ День: {day_minutes} хв\n"
+                "   🌙 Ніч: {night_minutes} хв\n"
+                "   ⏳ Зараз ({period_name_lower}): {timeout} хв\n"
+                "   🔄 API: {api_icon}"
+            ),
+            "status_header": (
+                "📊 **Статус моніторингу:** {active}/{total} груп активні\n"
+                "{period_icon} **Поточний режим:** {period_name}\n"
+                "{listing}\n"
+            ),
+            "status_active": (
+                "{status_icon} **{name}** {overdue_icon}\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   ⏰ Останнє: {last_seen}\n"
+                "   🕐 Неактивність: {minutes_inactive}/{timeout} хв ({period_name_lower})\n"
+                "   📈 Активність: {sparkline}\n"
+                "   📊 День/Ніч: {day_minutes}/{night_minutes} хв\n"
+                "   ✅ Доступ: {accessible}\n"
+                "   🔄 API: {api_status}\n"
+                "   📡 Статус: {reboot_status}\n"
+            ),
+            "status_idle": (
+                "{status_icon} **{name}**\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   📊 День/Ніч: {day_minutes}/{night_minutes} хв\n"
+                "   ⏳ Поточний поріг: {timeout} хв\n"
+                "   📊 Статус: {state}\n"
+            ),
+            "status_footer": (
+                "\n🔄 Інтервал перевірки: {check_interval} секунд\n"
+                "🌙 Нічні години: {night_start} - {night_end}\n"
+                "{sender}\n"
+                "🟢 - в межах норми, 🔴 - перевищено поріг"
+            ),
+            "listing": "📄 Сторінка {page}/{pages}, знайдено груп: {found}{filter}{next}",
+            "listing_filter": " (фільтр: {filters})",
+            "listing_next": "\n➡️ Далі: `{command}`",
+            "time": (
+                "🕐 **Поточний час та налаштування:**\n\n"
+                "📅 Дата і час: {now}\n"
+                "🌍 Часова зона: {timezone}\n"
+                "{period_icon} Поточний режим: {period_name}\n\n"
+                "🌙 Нічні години: {night_start} - {night_end}\n"
+                "☀️ Денні години: решта часу\n\n"
+                "**Поточні таймаути для груп:**\n{groups}"
+            ),
+            "time_group": (
+                "📱 {name}: {timeout} хв (День: {day_minutes}хв / Ніч: {night_minutes}хв)\n"
+            ),
+            "groups_usage": (
+                "❌ {error}\n\nВикористання: `/groups [overdue] [tag:назва] [page N]`"
+            ),
+            "groups_header": "👥 **Всі групи в конфігурації:** {period_icon}\n{listing}\n",
+            "groups_entry": (
+                "**{index}. {name}**\n"
+                "   📝 {description}\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   📊 Моніторинг: {status_icon} {monitoring}\n"
+                "   ☀️ День: {day_minutes} хв\n"
+                "   🌙 Ніч: {night_minutes} хв\n"
+                "   ⏳ Зараз: {timeout} хв\n"
+                "   🔄 API Reboot: {api_icon} {api_answer}\n"
+            ),
+            "groups_schedule": "   📅 Розклад: {weekday} вікон у будні, {weekend} у вихідні\n",
+            "groups_adaptive": (
+                "   🧠 Адаптивний поріг: квантиль {quantile}, "
+                "навчено {trained}/{hours} год тижня\n"
+            ),
+            "groups_tags": "   🏷️ Теги: {tags}\n",
+            "test_started": "🔄 Перевіряю доступ до всіх груп...",
+            "test_progress": "🔄 Перевіряю доступ до груп: {done}/{total}...",
+            "test_line": (
+                "{access_icon}{status_icon} {name} ({timeout}хв{period_icon}) {api_icon}"
+            ),
+            "test_result": (
+                "🧪 **Результати тестування:** {period_icon}\n\n"
+                "{results}\n\n"
+                "**Легенда:**\n"
+                "✅❌ - доступ до чату\n"
+                "🟢⏸️ - статус моніторингу\n"
+                "🔄❌ - API reboot\n"
+                "(Nхв{period_icon}) - поточний таймаут\n"
+                "☀️ - день, 🌙 - ніч"
+            ),
+            "reboot_group_line": "• {name} ({timeout}хв{period_icon})",
+            "reboot_usage": (
+                "❌ Використання: `/reboot назва_групи`\n\n**Доступні групи:**\n{groups}"
+            ),
+            "reboot_not_found": (
+                "❌ Група '{name}' не знайдена.\n\n**Доступні групи:**\n{groups}"
+            ),
+            "reboot_monitoring_disabled": "❌ Моніторинг вимкнено для групи '{name}'",
+            "reboot_api_disabled": "❌ API reboot вимкнено для групи '{name}'",
+            "reboot_calling": (
+                "🔄 Викликаю reboot для групи '{name}'\n"
+                "({period_name_lower} режим, поріг: {timeout} хв)..."
+            ),
+            "reboot_done": "✅ Reboot успішно викликано для групи '{name}'",
+            "reboot_failed": "❌ Помилка при виклику reboot для групи '{name}'",
+            "reboot_error": "❌ Помилка: {error}",
+        },
+        "words": {
+            "day": "Денний",
+            "night": "Нічний",
+            "enabled": "Увімкнено",
+            "disabled": "Вимкнено",
+            "active": "Активна",
+            "paused": "Вимкнена",
+            "yes": "Так",
+            "no": "Ні",
+            "none": "Немає",
+            "no_data": "Немає даних",
+            "reboot_called": "🔄 Викликано",
+            "reboot_waiting": "⏸️ Очікує",
+        },
+    },
+    "en": {
+        "templates": {
+            "inactivity_alert": (
+                "⚠️ **WARNING: group is inactive!**\n\n"
+                "📱 Group: {name}\n"
+                "📝 Description: {description}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "⏰ Last message: {last_seen}\n"
+                "🕐 Inactive for: {minutes_inactive} minutes\n"
+                "{period_icon} Mode: {period_name}\n"
+                "⏳ Threshold ({period_name_lower}): {timeout} minutes\n"
+                "📊 Settings: Day {day_minutes}m / Night {night_minutes}m\n"
+                "📅 Date: {now}\n"
+                "🔄 API Reboot: {api_status}"
+            ),
+            "inactivity_reminder": (
+                "🔁 **Reminder #{reminder}: group is still inactive**\n\n"
+                "📱 Group: {name}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "🕐 Inactive for: {minutes_inactive} minutes (threshold {timeout})\n"
+                "📅 Date: {now}\n"
+                "✋ Reply `/ack` to this message to stop reminders"
+            ),
+            "inactivity_escalation": (
+                "🚨 **ESCALATION: incident not acknowledged**\n\n"
+                "📱 Group: {name}\n"
+                "📝 Description: {description}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "🕐 Inactive for: {minutes_inactive} minutes (threshold {timeout})\n"
+                "🔁 Unanswered reminders: {reminders}\n"
+                "📅 Date: {now}\n"
+                "✋ Acknowledge: reply `/ack` to this message"
+            ),
+            "reboot_alert": (
+                "🔄 **API REBOOT CALLED**\n\n"
+                "📱 Group: {name}\n"
+                "🆔 ID: `{chat_id}`\n"
+                "{period_icon} Mode: {period_name}\n"
+                "⏳ Inactivity threshold: {timeout} minutes\n"
+                "🌐 URL: {api_url}\n"
+                "📡 Method: {api_method}\n"
+                "🔑 Headers: {api_headers}\n"
+                "⏰ Time: {now}"
+            ),
+            "start": (
+                "🤖 **Multi-group monitoring started!** {period_icon}\n\n"
+                "👥 Active groups: {active}/{total}\n"
+                "⏸️ Disabled groups: {disabled}\n"
+                "🔄 Check interval: {check_interval} s\n"
+                "🌍 Time zone: {timezone}\n"
+                "🌙 Night hours: {night_start} - {night_end}\n"
+                "{period_icon} Current mode: {period_name}\n"
+                "🕐 Started at: {now}\n\n"
+                "**Active groups:**\n{groups}\n\n"
+                "**Commands:**\n"
+                "`/status` - detailed status\n"
+                "`/groups` - all groups\n"
+                "`/time` - current time and mode\n"
+                "`/test` - access check\n"
+                "`/reload` - reload configuration\n"
+                "`/reboot group_name` - manual reboot\n"
+                "`/ack` - acknowledge an incident (as a reply to the alert)"
+            ),
+            "start_group": (
+                "📱 {name}\n"
+                "   🆔 `{chat_id}`\n"
+                "   ☀️ Day: {day_minutes} min\n"
+                "   🌙 Night: {night_minutes} min\n"
+                "   ⏳ Now ({period_name_lower}): {timeout} min\n"
+                "   🔄 API: {api_icon}"
+            ),
+            "status_header": (
+                "📊 **Monitoring status:** {active}/{total} groups active\n"
+                "{period_icon} **Current mode:** {period_name}\n"
+                "{listing}\n"
+            ),
+            "status_active": (
+                "{status_icon} **{name}** {overdue_icon}\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   ⏰ Last: {last_seen}\n"
+                "   🕐 Inactive: {minutes_inactive}/{timeout} min ({period_name_lower})\n"
+                "   📈 Activity: {sparkline}\n"
+                "   📊 Day/Night: {day_minutes}/{night_minutes} min\n"
+                "   ✅ Access: {accessible}\n"
+                "   🔄 API: {api_status}\n"
+                "   📡 State: {reboot_status}\n"
+            ),
+            "status_idle": (
+                "{status_icon} **{name}**\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   📊 Day/Night: {day_minutes}/{night_minutes} min\n"
+                "   ⏳ Current threshold: {timeout} min\n"
+                "   📊 State: {state}\n"
+            ),
+            "status_footer": (
+                "\n🔄 Check interval: {check_interval} seconds\n"
+                "🌙 Night hours: {night_start} - {night_end}\n"
+                "{sender}\n"
+                "🟢 - within threshold, 🔴 - threshold exceeded"
+            ),
+            "listing": "📄 Page {page}/{pages}, groups found: {found}{filter}{next}",
+            "listing_filter": " (filter: {filters})",
+            "listing_next": "\n➡️ Next: `{command}`",
+            "time": (
+                "🕐 **Current time and settings:**\n\n"
+                "📅 Date and time: {now}\n"
+                "🌍 Time zone: {timezone}\n"
+                "{period_icon} Current mode: {period_name}\n\n"
+                "🌙 Night hours: {night_start} - {night_end}\n"
+                "☀️ Day hours: the rest of the time\n\n"
+                "**Current group timeouts:**\n{groups}"
+            ),
+            "time_group": (
+                "📱 {name}: {timeout} min (Day: {day_minutes}m / Night: {night_minutes}m)\n"
+            ),
+            "groups_usage": "❌ {error}\n\nUsage: `/groups [overdue] [tag:name] [page N]`",
+            "groups_header": "👥 **All configured groups:** {period_icon}\n{listing}\n",
+            "groups_entry": (
+                "**{index}. {name}**\n"
+                "   📝 {description}\n"
+                "   🆔 ID: `{chat_id}`\n"
+                "   📊 Monitoring: {status_icon} {monitoring}\n"
+                "   ☀️ Day: {day_minutes} min\n"
+                "   🌙 Night: {night_minutes} min\n"
+                "   ⏳ Now: {timeout} min\n"
+                "   🔄 API Reboot: {api_icon} {api_answer}\n"
+            ),
+            "groups_schedule": "   📅 Schedule: {weekday} weekday windows, {weekend} weekend\n",
+            "groups_adaptive": (
+                "   🧠 Adaptive threshold: quantile {quantile}, "
+                "trained {trained}/{hours} hours of the week\n"
+            ),
+            "groups_tags": "   🏷️ Tags: {tags}\n",
+            "test_started": "🔄 Checking access to all groups...",
+            "test_progress": "🔄 Checking access to groups: {done}/{total}...",
+            "test_line": (
+                "{access_icon}{status_icon} {name} ({timeout}m{period_icon}) {api_icon}"
+            ),
+            "test_result": (
+                "🧪 **Test results:** {period_icon}\n\n"
+                "{results}\n\n"
+                "**Legend:**\n"
+                "✅❌ - chat access\n"
+                "🟢⏸️ - monitoring state\n"
+                "🔄❌ - API reboot\n"
+                "(Nm{period_icon}) - current timeout\n"
+                "☀️ - day, 🌙 - night"
+            ),
+            "reboot_group_line": "• {name} ({timeout}m{period_icon})",
+            "reboot_usage": "❌ Usage: `/reboot group_name`\n\n**Available groups:**\n{groups}",
+            "reboot_not_found": (
+                "❌ Group '{name}' not found.\n\n**Available groups:**\n{groups}"
+            ),
+            "reboot_monitoring_disabled": "❌ Monitoring is disabled for group '{name}'",
+            "reboot_api_disabled": "❌ API reboot is disabled for group '{name}'",
+            "reboot_calling": (
+                "🔄 Calling reboot for group '{name}'\n"
+                "({period_name_lower} mode, threshold: {timeout} min)..."
+            ),
+            "reboot_done": "✅ Reboot called successfully for group '{name}'",
+            "reboot_failed": "❌ Reboot call failed for group '{name}'",
+            "reboot_error": "❌ Error: {error}",
+        },
+        "words": {
+            "day": "Day",
+            "night": "Night",
+            "enabled": "Enabled",
+            "disabled": "Disabled",
+            "active": "Active",
+            "paused": "Disabled",
+            "yes": "Yes",
+            "no": "No",
+            "none": "None",
+            "no_data": "No data",
+            "reboot_called": "🔄 Called",
+            "reboot_waiting": "⏸️ Waiting",
+        },
+    },
+}
+
+
+class TemplateRenderer:
+    """Скомпільовані шаблони однієї локалі та кеш статичних фрагментів груп
+
+    Шаблони компілюються один раз при завантаженні конфігурації. Для
+    шаблонів з полями групи (назва, опис, пороги) render_group кешує
+    частково підставлений шаблон на (шаблон, chat_id), тож при відправці
+    підставляються лише динамічні поля. Кеш групи скидається invalidate()
+    при зміні її конфігурації.
+    """
+
+    def __init__(self, locale: str = "uk", overrides: Optional[Mapping[str, str]] = None):
+        if locale not in LOCALES:
+            raise TemplateError(f"невідома локаль '{locale}'")
+        self.locale = locale
+        source = dict(LOCALES[locale]["templates"])
+        for name, text in (overrides or {}).items():
+            if name not in TEMPLATE_FIELDS:
+                raise TemplateError(f"невідомий шаблон '{name}'")
+            source[name] = text
+        self.templates: Dict[str, CompiledTemplate] = {}
+        for name, text in source.items():
+            try:
+                self.templates[name] = CompiledTemplate.compile(text, TEMPLATE_FIELDS[name])
+            except TemplateError as e:
+                raise TemplateError(f"шаблон '{name}': {e}")
+        self.words = LOCALES[locale]["words"]
+        self._group_cache: Dict[Tuple[str, Hashable], CompiledTemplate] = {}
+
+    @classmethod
+    def from_settings(cls, global_settings: Mapping) -> "TemplateRenderer":
+        return cls(global_settings.get("locale", "uk"), global_settings.get("templates"))
+
+    def word(self, key: str) -> str:
+        return self.words[key]
+
+    def render(self, name: str, values: Mapping) -> str:
+        return self.templates[name].render(values)
+
+    def render_group(
+        self,
+        name: str,
+        group_key: Hashable,
+        static_values: Callable[[], Mapping],
+        values: Mapping,
+    ) -> str:
+        """Рендерить шаблон групи: статичні поля беруться з кешу фрагментів"""
+        key = (name, group_key)
+        template = self._group_cache.get(key)
+        if template is None:
+            template = self._group_cache[key] = self.templates[name].partial(static_values())
+        return template.render(values)
+
+    def invalidate(self, group_keys: Optional[Iterable[Hashable]] = None):
+        """Скидає кеш фрагментів вказаних груп (усіх, якщо None)"""
+        if group_keys is None:
+            self._group_cache.clear()
+            return
+        group_keys = set(group_keys)
+        for key in [key for key in self._group_cache if key[1] in group_keys]:
+            del self._group_cache[key]
+
+    @property
+    def cached_fragments(self) -> int:
+        return len(self._group_cache)
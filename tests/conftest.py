@@ -0,0 +1,80 @@
+"""Спільні фікстури тестів: конфігурація у тимчасовому каталозі та монітор без клієнта"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elastic import es_handler, logger  # noqa: E402
+from main import TelegramMultiMonitor  # noqa: E402
+
+# Не відправляємо логи тестів в Elasticsearch
+logger.removeHandler(es_handler)
+
+
+def group_data(chat_id: int, **extra) -> dict:
+    """Сира конфігурація однієї групи"""
+    data = {
+        "chat_id": chat_id,
+        "name": f"Group {chat_id}",
+        "description": "",
+        "monitoring": {
+            "enabled": True,
+            "day_inactive_minutes": 60,
+            "night_inactive_minutes": 90,
+        },
+        "api_reboot": {"enabled": False},
+    }
+    data.update(extra)
+    return data
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Будує сиру конфігурацію, стан та інциденти якої лежать у tmp_path"""
+
+    def build(groups) -> dict:
+        return {
+            "telegram": {"api_id": 0, "api_hash": "", "session_string": "test"},
+            "global_settings": {
+                "check_interval_seconds": 60,
+                "notification_user_id": "me",
+                "timezone": "Europe/Kiev",
+                "night_hours": {"start": "22:00", "end": "08:00"},
+                "state_file": str(tmp_path / "state.db"),
+            },
+            "groups": groups,
+        }
+
+    return build
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    """Записує конфігурацію у файл і повертає шлях до нього"""
+
+    def write(config: dict) -> str:
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def make_monitor(write_config):
+    """Створює монітор з конфігурації і закриває його сховища після тесту"""
+    monitors = []
+
+    def build(config: dict) -> TelegramMultiMonitor:
+        monitor = TelegramMultiMonitor(write_config(config))
+        monitors.append(monitor)
+        return monitor
+
+    yield build
+    for monitor in monitors:
+        monitor.journal.close()
+        monitor.entity_cache.close()
+        monitor.incidents.close()
@@ -0,0 +1,43 @@
+"""Доступ до чатів: група, що знову доступна, повертається під моніторинг"""
+import asyncio
+from types import SimpleNamespace
+
+from conftest import group_data
+
+CHAT_ID = -1001234567890
+
+
+def test_restored_access_rearms_deadline(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(CHAT_ID)]))
+    group = monitor.get_enabled_groups()[0]
+    monitor.register_group_state(group)
+    monitor.state.set_last_seen(CHAT_ID, monitor.clock())
+
+    async def lost(chat_id):
+        raise ConnectionError("немає доступу")
+
+    async def found(chat_id):
+        return SimpleNamespace(title="Group")
+
+    monitor.get_entity_respecting_flood = lost
+    assert not asyncio.run(monitor.validate_chat_access(group, refresh=True))
+    # check_inactivity знімає недоступну групу з планувальника
+    monitor.scheduler.cancel(CHAT_ID)
+
+    monitor.get_entity_respecting_flood = found
+    assert asyncio.run(monitor.validate_chat_access(group, refresh=True))
+    assert CHAT_ID in monitor.scheduler
+    assert monitor.state.is_accessible(CHAT_ID)
+
+
+def test_overdue_matches_inactivity_loop(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(CHAT_ID)]))
+    group = monitor.get_enabled_groups()[0]
+    monitor.register_group_state(group)
+    now = monitor.clock()
+    threshold = monitor.get_current_timeout_for_group(group) * 60
+
+    monitor.state.set_last_seen(CHAT_ID, now - threshold)
+    assert not monitor.is_group_overdue(group, now)
+    monitor.state.set_last_seen(CHAT_ID, now - threshold - 1)
+    assert monitor.is_group_overdue(group, now)
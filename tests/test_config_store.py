@@ -0,0 +1,27 @@
+"""Історія конфігурації: обмеження кількості версій"""
+import pytest
+
+from config_store import ConfigStore
+
+
+def make_store(tmp_path, keep_versions) -> ConfigStore:
+    return ConfigStore(
+        str(tmp_path / "history"), str(tmp_path / "config.json"), keep_versions
+    )
+
+
+def test_retention_keeps_new_head(tmp_path):
+    store = make_store(tmp_path, 1)
+    store.commit({"groups": [], "n": 1})
+    store.rollback(1)
+    entry = store.commit({"groups": [], "n": 2})
+
+    assert store.head == entry["version"]
+    assert [v["version"] for v in store.versions] == [entry["version"]]
+    assert '"n": 2' in store.read_text(store.head)
+
+
+@pytest.mark.parametrize("keep_versions", [0, -1, "5", 2.5, True, None])
+def test_invalid_keep_versions_rejected(tmp_path, keep_versions):
+    with pytest.raises(ValueError):
+        make_store(tmp_path, keep_versions)
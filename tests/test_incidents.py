@@ -0,0 +1,39 @@
+"""Журнал інцидентів: запис через чергу та читання поза циклом подій"""
+import asyncio
+import threading
+import time
+
+from incidents import IncidentStore
+
+
+def test_query_and_stats_run_off_the_event_loop(tmp_path, monkeypatch):
+    store = IncidentStore(str(tmp_path / "incidents.db"))
+    store.open()
+    try:
+        started = time.time() - 600
+        store.open_incident(-1001, "Group", started, 5, notified=True)
+        store.resolve(-1001)
+        store.write(store.take_pending())
+
+        threads = []
+        original = store._query
+
+        def tracked_query(*args):
+            threads.append(threading.current_thread())
+            return original(*args)
+
+        monkeypatch.setattr(store, "_query", tracked_query)
+
+        async def read():
+            page = await store.query(chat_id=-1001)
+            stats = await store.stats(started - 60, time.time() + 60)
+            return page, stats
+
+        page, stats = asyncio.run(read())
+        assert threads and threads[0] is not threading.main_thread()
+        assert [incident["chat_id"] for incident in page["incidents"]] == [-1001]
+        assert page["incidents"][0]["events"][0]["kind"] == "alert"
+        assert stats["incidents"] == 1
+        assert stats["groups"][0]["resolved"] == 1
+    finally:
+        store.close()
@@ -0,0 +1,36 @@
+"""Теги груп: перевірка на кожному шляху завантаження конфігурації"""
+import asyncio
+
+import pytest
+
+from conftest import group_data
+from main import TelegramMultiMonitor
+
+
+def test_string_tags_become_one_tag(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(-1001, tags="prod")]))
+    assert monitor.get_groups()[0].tags == ["prod"]
+
+
+def test_startup_rejects_mixed_type_tags(make_config, write_config):
+    path = write_config(make_config([group_data(-1001, tags=["ok", 5])]))
+    with pytest.raises(ValueError, match="непорожніми рядками"):
+        TelegramMultiMonitor(path)
+
+
+def test_apply_config_rejects_mixed_type_tags(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(-1001, tags=["ok"])]))
+    bad = make_config([group_data(-1001, tags=["ok", 5])])
+
+    with pytest.raises(ValueError, match="непорожніми рядками"):
+        asyncio.run(monitor.apply_config(bad))
+
+    # Конфігурація лишається попередньою, а реєстр будується без помилок
+    assert monitor.config_version == 0
+    assert monitor.get_registry().groups[0].tags == ["ok"]
+
+
+def test_validate_config_rejects_empty_tag(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(-1001)]))
+    with pytest.raises(ValueError, match="непорожніми рядками"):
+        monitor.validate_config(make_config([group_data(-1001, tags=["ok", ""])]))
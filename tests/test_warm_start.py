@@ -0,0 +1,71 @@
+"""Теплий старт: час останнього повідомлення з історії проти журналу стану"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from telethon import types
+
+from conftest import group_data
+from state import FLAG_ALERTED, FLAG_REBOOTED
+
+CHAT_ID = -1001234567890
+
+
+def history_result(chat_id: int, last_message_ts: float):
+    """Відповідь GetPeerDialogsRequest з одним діалогом та його верхнім повідомленням"""
+    peer = types.PeerChannel(channel_id=int(str(chat_id)[4:]))
+    return SimpleNamespace(
+        users=[],
+        dialogs=[SimpleNamespace(peer=peer, top_message=7)],
+        messages=[
+            SimpleNamespace(
+                peer_id=peer,
+                id=7,
+                date=datetime.fromtimestamp(last_message_ts, tz=timezone.utc),
+            )
+        ],
+    )
+
+
+def start_with_journal(monitor, journal_ts: float, history_ts: float):
+    """Журнал пам'ятає сповіщення й reboot, а історія каже, коли група писала"""
+    group = monitor.get_enabled_groups()[0]
+    monitor.register_group_state(group)
+    monitor.open_incident_store()
+    monitor.incidents.open_incident(CHAT_ID, group.name, journal_ts, 60, notified=True)
+
+    monitor.journal.open()
+    monitor.journal.write([(CHAT_ID, journal_ts, FLAG_ALERTED | FLAG_REBOOTED)])
+    monitor.restore_state([group])
+
+    async def get_peer_dialogs(groups):
+        return history_result(CHAT_ID, history_ts)
+
+    monitor.get_peer_dialogs = get_peer_dialogs
+    return asyncio.run(monitor.warm_start_from_history([group]))
+
+
+def test_newer_history_clears_alert_and_resolves_incident(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(CHAT_ID)]))
+    now = time.time()
+
+    seeded = start_with_journal(monitor, journal_ts=now - 7200, history_ts=now - 600)
+
+    assert seeded == 1
+    assert abs(monitor.clock.to_wall(monitor.state.last_seen_of(CHAT_ID)) - (now - 600)) < 1
+    assert not monitor.state.is_alerted(CHAT_ID)
+    assert not monitor.state.is_rebooted(CHAT_ID)
+    assert not monitor.incidents.has_open(CHAT_ID)
+
+
+def test_older_history_keeps_journal_state(make_config, make_monitor):
+    monitor = make_monitor(make_config([group_data(CHAT_ID)]))
+    now = time.time()
+
+    seeded = start_with_journal(monitor, journal_ts=now - 600, history_ts=now - 7200)
+
+    assert seeded == 0
+    assert monitor.state.is_alerted(CHAT_ID)
+    assert monitor.state.is_rebooted(CHAT_ID)
+    assert monitor.incidents.has_open(CHAT_ID)
@@ -0,0 +1,50 @@
+from typing import List
+
+# Максимальна довжина текстового повідомлення Telegram
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Ділить текст на частини не довші за limit
+
+    Розрізає по межах рядків; лише рядок, довший за limit, ріжеться
+    посередині.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    chunks: List[str] = []
+    current = ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def join_within_limit(parts: List[str], separator: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Склеює частини в повідомлення до limit символів, не розриваючи частину"""
+    messages: List[str] = []
+    current = ""
+    for part in parts:
+        for piece in split_message(part, limit):
+            candidate = f"{current}{separator}{piece}" if current else piece
+            if len(candidate) > limit:
+                messages.append(current)
+                current = piece
+            else:
+                current = candidate
+    if current:
+        messages.append(current)
+    return messages
@@ -0,0 +1,62 @@
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TimerWheel:
+    """Хешоване колесо таймерів з кроком tick секунд
+
+    Таймер кладеться в комірку (номер тіку % slots) за O(1), скасування -
+    O(1). advance() проходить лише комірки тіків, що минули з попереднього
+    виклику, і забирає з них таймери, чий тік настав; таймери на кілька
+    обертів уперед лишаються в комірці до свого оберту. Точність - один тік.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, now: float = 0.0):
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}  # ключ -> номер тіку спрацювання
+        self._current = int(now // tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """Час спрацювання таймера (з точністю до тіку)"""
+        tick_no = self._where.get(key)
+        return None if tick_no is None else tick_no * self.tick
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Ставить (або переносить) таймер ключа на момент deadline"""
+        self.cancel(key)
+        tick_no = max(math.ceil(deadline / self.tick), self._current + 1)
+        self._slots[tick_no % len(self._slots)][key] = tick_no
+        self._where[key] = tick_no
+
+    def cancel(self, key: Hashable) -> bool:
+        tick_no = self._where.pop(key, None)
+        if tick_no is None:
+            return False
+        del self._slots[tick_no % len(self._slots)][key]
+        return True
+
+    def advance(self, now: float) -> List[Tuple[Hashable, float]]:
+        """Повертає (ключ, дедлайн) таймерів, що спрацювали до now, у порядку часу"""
+        target = int(now // self.tick)
+        if target <= self._current:
+            return []
+        # Після довгої паузи достатньо одного проходу по всіх комірках
+        steps = min(target - self._current, len(self._slots))
+        expired = []
+        for offset in range(1, steps + 1):
+            slot = self._slots[(self._current + offset) % len(self._slots)]
+            due = [key for key, tick_no in slot.items() if tick_no <= target]
+            for key in due:
+                tick_no = slot.pop(key)
+                del self._where[key]
+                expired.append((tick_no, key))
+        self._current = target
+        expired.sort(key=lambda item: item[0])
+        return [(key, tick_no * self.tick) for tick_no, key in expired]